@@ -0,0 +1,4005 @@
+import logging
+import os
+import sys
+import shutil
+import numpy as np
+from numpy import linalg
+import skimage
+from skimage import io, color, morphology, filters, transform, measure, exposure, restoration, feature, draw
+from skimage.morphology import disk
+from skimage.util import dtype
+import scipy as sp
+from scipy import ndimage, stats, spatial, cluster, sparse
+from scipy.sparse import csgraph
+import itertools
+import heapq
+import pandas as pd
+import networkx as nx
+from packaging.version import Version
+import math
+import shapely
+from shapely import geometry, prepared
+import pickle
+import hashlib
+import json
+import tempfile
+import tifffile
+import concurrent.futures
+import threading
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+import sklearn
+from sklearn import decomposition
+import read_roi
+import matplotlib
+from matplotlib.legend_handler import HandlerPatch
+import matplotlib.pyplot as plt
+plt.rcParams.update({'figure.max_open_warning': 0})
+
+# create circles for legend in visual output
+class HandlerEllipse(HandlerPatch):
+    def create_artists(self, legend, orig_handle,
+                       xdescent, ydescent, width, height, fontsize, trans):
+        center = 0.5 * width - 0.5 * xdescent, 0.5 * height - 0.5 * ydescent
+        p = matplotlib.patches.Ellipse(xy=center, width=width*0.5, height=width*0.5)
+        self.update_prop(p, orig_handle, legend)
+        p.set_transform(trans)
+        return [p]
+
+class Preprocessor:
+
+    def __init__(self, filename, cleanEdges, changeRescaling, cleanNoise, plotIntermediate, outputFolder, tileSize=None, numberOfWorkers=1, lowMemory=False, fastFilter=False, stageCache=None, page=None, priorFrame=None):
+        self.filename = filename
+        self.page = page
+        self.pathToFolder = outputFolder
+
+        # parameters
+        self.cleanEdges = cleanEdges
+        self.changeRescaling = changeRescaling
+        self.cleanNoise = cleanNoise
+        self.plotIntermediate = plotIntermediate
+        self.tileSize = tileSize
+        self.numberOfWorkers = int(numberOfWorkers)
+        self.lowMemory = lowMemory
+        self.fastFilter = fastFilter
+        self.stageCache = stageCache
+
+        # frames of a time-lapse reuse the detection decisions of the previous frame and its branchless skeleton as prior
+        self.reuseDecisions = priorFrame is not None
+        self.priorSkeleton = None
+        if self.reuseDecisions:
+            self.cleanEdges, self.cleanNoise, self.changeRescaling = priorFrame.cleanEdges, priorFrame.cleanNoise, priorFrame.changeRescaling
+            show_Message("...The detection decisions of the previous frame are reused.")
+            self.priorSkeleton = priorFrame.branchlessSkeleton
+        self.stageKeys = self.create_stage_keys()
+
+        # pre-processing pipeline, stages found in the stage cache are loaded instead of computed
+        self.rawImage = None
+        self.cleanImage, backgroundImage, zeroPixelImage, self.cleanEdges, self.cleanNoise, self.changeRescaling = self.run_stage('edges', self.clean_image)
+        if self.lowMemory:
+            # bytes that the default mode keeps in addition, they are logged after the pre-processing
+            self.savedBytes = 0 if self.rawImage is None else self.rawImage.nbytes
+            self.savedBytes += sum(mask.saved_bytes() for mask in [backgroundImage, zeroPixelImage] if mask is not None)
+            self.rawImage = None
+            self.backgroundImage, self.zeroPixelImage = backgroundImage, zeroPixelImage
+        else:
+            self.backgroundImage, self.zeroPixelImage = [None if mask is None else mask.unpack() for mask in [backgroundImage, zeroPixelImage]]
+        self.skeletonAnalysis, self.binaryImage = self.run_stage('skeleton', self.skeletonize_image, self.cleanImage)
+        self.skeletonImage, self.branchlessSkeleton = self.skeletonAnalysis.skeletonImage, self.skeletonAnalysis.branchlessSkeleton
+        self.skeletonAnalysis.save(self.pathToFolder + '/skeletonAnalysis.npz')
+        self.labeledImage, self.labels = self.run_stage('labels', sp.ndimage.label, ~self.branchlessSkeleton)
+        self.plot_labeled_image(self.labeledImage, self.labels)
+
+        if self.plotIntermediate == 1:
+            skimage.io.imsave(self.pathToFolder + '/binaryImage.png', skimage.img_as_uint(self.binaryImage))
+            skimage.io.imsave(self.pathToFolder + '/cleanedImage.png', skimage.img_as_uint(self.cleanImage))
+            skimage.io.imsave(self.pathToFolder + '/skeletonImage.png', skimage.img_as_uint(self.skeletonImage))
+            skimage.io.imsave(self.pathToFolder + '/branchlessSkeleton.png', skimage.img_as_uint(self.branchlessSkeleton))
+        if self.lowMemory:
+            self.savedBytes += self.cleanImage.nbytes
+            self.cleanImage, self.binaryImage = None, PackedMask(self.binaryImage)
+            self.savedBytes += self.binaryImage.saved_bytes()
+            show_Message("...Low memory mode keeps " + str(self.savedBytes) + " bytes less after the pre-processing.")
+
+    ### FUNCTIONS ###
+    def create_stage_keys(self):
+        """
+        create the stage cache keys of the pre-processing stages from the image file and the parameters each stage depends on
+        """
+        if self.stageCache is None:
+            return({})
+        stageKeys = {}
+        # the image is not cached itself, it is read from its file again
+        stageKeys['edges'] = self.stageCache.key('edges', self.stageCache.file_key(self.filename), self.page, self.lowMemory, self.cleanEdges, self.cleanNoise, self.changeRescaling, self.reuseDecisions)
+        # tiled filtering is bit-identical to the filter of the whole image, the tile size is not part of the key
+        priorKey = None if self.priorSkeleton is None else self.stageCache.array_key('prior', self.priorSkeleton)
+        stageKeys['skeleton'] = self.stageCache.key('skeleton', stageKeys['edges'], self.fastFilter, self.lowMemory, priorKey)
+        stageKeys['labels'] = self.stageCache.key('labels', stageKeys['skeleton'])
+        return(stageKeys)
+
+    def run_stage(self, stage, function, *arguments):
+        """
+        load the result of a pre-processing stage from the stage cache or compute it and add it to the cache
+        """
+        if self.stageCache is None:
+            return(function(*arguments))
+        result = self.stageCache.get(self.stageKeys[stage])
+        if result is None:
+            result = function(*arguments)
+            self.stageCache.put(self.stageKeys[stage], result)
+        else:
+            show_Message("...Loaded " + stage + " stage from the cache.")
+        return(result)
+
+    def clean_image(self):
+        """
+        import the image, detect artificial edges, noise and white pixels and remove the artificial edges
+        """
+        self.rawImage = self.import_image(self.filename)
+        if self.reuseDecisions:
+            backgroundImage = None
+            zeroPixelImage = self.find_zero_pixels(self.rawImage) if self.cleanEdges == 1 else None
+        else:
+            backgroundImage = self.detect_edges(self.rawImage)
+            self.detect_noisy_image(backgroundImage)
+            zeroPixelImage = self.detect_white_pixels(self.rawImage)
+        cleanImage = self.remove_artificial_edges(zeroPixelImage)
+        # the detected parameters are returned with the cleaned image, so the stage cache restores them too
+        return(cleanImage, None if backgroundImage is None else PackedMask(backgroundImage), None if zeroPixelImage is None else PackedMask(zeroPixelImage), self.cleanEdges, self.cleanNoise, self.changeRescaling)
+
+    def import_image(self, filename):
+        """
+        import image from filename and convert to 8-bit 2D image
+        """
+        show_Message("...Load image and convert to grayscale")
+        fileType = filename.split('.')[-1]
+        rawImage = None
+        if fileType in ['tif', 'TIF', 'tiff', 'TIFF']:
+            # only the given page of multi-page TIFF files is read and uncompressed TIFF files are memory-mapped in low memory mode
+            if self.lowMemory:
+                try:
+                    rawImage = tifffile.memmap(filename, page=self.page, mode='r')
+                except ValueError:
+                    rawImage = None
+            if rawImage is None and self.page is not None:
+                rawImage = tifffile.imread(filename, key=self.page)
+            elif rawImage is None:
+                rawImage = skimage.io.imread(filename, plugin='tifffile')
+        else:
+            rawImage = skimage.io.imread(filename)
+        if len(rawImage.shape) > 2 and rawImage.shape[2] > 2:
+            rawImage = skimage.color.rgb2gray(self.float_image(rawImage))
+        if rawImage.dtype != 'uint8':
+            rawImage = skimage.util.img_as_ubyte(skimage.exposure.rescale_intensity(rawImage))
+        return(rawImage)
+
+    def float_image(self, image):
+        """
+        convert image to 32-bit floats in low memory mode, otherwise the filters convert it to 64-bit floats
+        """
+        if self.lowMemory:
+            return(skimage.img_as_float32(image))
+        return(image)
+
+    def detect_edges(self, rawImage):
+        """
+        use Sobel filter and probabilistic Hough lines to detect artificial edges from image stitching
+        """
+        backgroundImage = rawImage > 25
+        backgroundImage = skimage.morphology.remove_small_objects(backgroundImage, 500)
+        backgroundImage = skimage.morphology.remove_small_holes(backgroundImage, 500)
+        # large images are searched around the lines of a downsampled image first
+        if max(backgroundImage.shape) > 2 * houghImageSize:
+            houghLines = detect_lines_coarse_to_fine(backgroundImage, threshold=50, lineLength=100, maximumSize=houghImageSize)
+        else:
+            sobelImage = skimage.filters.sobel(backgroundImage)
+            houghLines = skimage.transform.probabilistic_hough_line(sobelImage, threshold=50, line_length=100, line_gap=0)
+        if len(houghLines) != 0:
+            self.cleanEdges = 1
+            show_Message("...Artificial edges were detected in the image and will be removed.")
+        return(backgroundImage)
+
+    def detect_noisy_image(self, backgroundImage):
+        """
+        calculate noise of image by calculating the ratio of background pixels and image resize
+        """
+        noiseGrade = np.sum(backgroundImage) / backgroundImage.size
+        if noiseGrade > 0.7:
+            self.cleanNoise = 1
+            show_Message("...The image is very noisy and will be cleaned.")
+
+    def detect_white_pixels(self, rawImage):
+        """
+        calculate the ratio of 0-pixels in the image to infer if intensity rescaling is neccessary
+        """
+        zeroPixelImage = self.find_zero_pixels(rawImage)
+        zeroPixelRatio = np.sum(zeroPixelImage) / zeroPixelImage.size
+        if zeroPixelRatio > 0.6:
+            self.changeRescaling = 1
+            show_Message("...The image rescaling was changed.")
+        return(zeroPixelImage)
+
+    def find_zero_pixels(self, rawImage):
+        """
+        find the areas of 0-pixels in the image
+        """
+        zeroPixelImage = rawImage == 0
+        zeroPixelImage = skimage.morphology.remove_small_objects(zeroPixelImage, 500)
+        return(zeroPixelImage)
+
+    def remove_artificial_edges(self, zeroPixelImage):
+        """
+        remove artificial edges from the image
+        """
+        if self.cleanEdges == 1:
+            cleanImage = self.rawImage.copy()
+            zeroPixelLabelImage, zeroPixelLabels = sp.ndimage.label(zeroPixelImage)
+            zeroPixelBorders = keep_labels_on_border(zeroPixelLabelImage)
+            zeroPixelBordersLabelImage, _ = sp.ndimage.label(zeroPixelBorders)
+            zeroPixelBordersRP = skimage.measure.regionprops(zeroPixelBordersLabelImage)
+            edgeContours = self.detect_edge_contours(zeroPixelBordersRP, zeroPixelBordersLabelImage)
+            for idx in range(len(edgeContours)):
+                contourRescaled = self.rescale_contour_to_original(edgeContours[idx])
+                cleanImage = self.remove_pixels_in_periphery(contourRescaled, cleanImage)
+        else:
+            cleanImage = self.rawImage.copy()
+        return(cleanImage)
+
+    def detect_edge_contours(self, regionProps, labeledImage):
+        """
+        find the contour of all artificial edges
+        """
+        edgeContourList = []
+        labelGeometry = LabelGeometry(labeledImage)
+        for idx in range(len(regionProps)):
+            if regionProps[idx].euler_number == 1:
+                imageLabel, offset = labelGeometry.crop(idx + 1, pad=1)
+                edgeContour = find_edge_contour(imageLabel) + offset
+                edgeContourList.append(edgeContour)
+        return(edgeContourList)
+
+    def rescale_contour_to_original(self, contour):
+        """
+        rescale contours back to original image shape
+        """
+        contourRescaled = contour-2
+        insideImage = (contourRescaled[:, 0] > 1) & (contourRescaled[:, 0] < self.rawImage.shape[0]-1) & (contourRescaled[:, 1] > 1) & (contourRescaled[:, 1] < self.rawImage.shape[1]-1)
+        return(contourRescaled[insideImage])
+
+    def remove_pixels_in_periphery(self, contourRescaled, cleanImage):
+        """
+        remove pixels in periphery of contour
+        """
+        xLen, yLen = cleanImage.shape[0] - 1, cleanImage.shape[1] - 1
+        orientations = contour_orientations(cleanImage, contourRescaled)
+        # the first two orientations of a pixel are measured and the last of them defines the periphery of an edge pixel
+        orientationRanks = np.cumsum(orientations, axis=1)
+        measuredOrientations = orientations & (orientationRanks <= 2)
+        peripheryOrientations = orientations & (orientationRanks == np.minimum(orientationRanks[:, -1:], 2))
+        correctedPixels = measure_intensity_along_contour(cleanImage, contourRescaled, measuredOrientations)
+        listOfCorrectedPixelsSorted = np.unique(contourRescaled[correctedPixels], axis=0)
+        correctEdges = self.calculate_consecutive_difference(listOfCorrectedPixelsSorted)
+        edgePixels = [listOfCorrectedPixelsSorted[int(start):int(end)] for start, end in correctEdges]
+        edgePixels = np.concatenate(edgePixels) if len(edgePixels) > 0 else np.zeros((0, 2), dtype=int)
+
+        # edge pixels are cleaned in the direction of their orientation, all other pixels with an orientation in a square around them
+        orientedPixels = np.any(orientations, axis=1)
+        isEdgePixel = np.isin(contourRescaled[:, 0] * cleanImage.shape[1] + contourRescaled[:, 1], edgePixels[:, 0] * cleanImage.shape[1] + edgePixels[:, 1])
+        edgePeripheries = self.define_pixel_periphery(contourRescaled[isEdgePixel], peripheryOffsets[np.argmax(peripheryOrientations[isEdgePixel], axis=1)], xLen, yLen)
+        otherPeripheries = self.define_pixel_periphery(contourRescaled[orientedPixels & ~isEdgePixel], np.array([-5, 6, -5, 6]), xLen, yLen)
+        remove_pixels_in_boxes(cleanImage, np.concatenate([edgePeripheries, otherPeripheries]))
+
+        cleanImage[:10, :] = 0
+        cleanImage[-9:, :] = 0
+        cleanImage[:, :10] = 0
+        cleanImage[:, -9:] = 0
+        return(cleanImage)
+
+    def calculate_consecutive_difference(self, sequence):
+        """
+        calculate difference for all consecutive point coordinates in an array and return a range of at least 50 continous, consecutive points (artificial edge)
+        """
+        correctEdges = []
+        consecutiveDifference = np.diff(sequence, axis=0)
+        differenceDistances = np.sqrt((consecutiveDifference ** 2).sum(axis=1))
+        groupedDifferences = np.array(list([value, len(list(counts))] for value, counts in itertools.groupby(differenceDistances)))
+        consecutiveEdges = np.where(groupedDifferences[:,1] > 50)
+        for idx in consecutiveEdges[0]:
+            correctEdges.append([np.sum(groupedDifferences[:idx,1]),np.sum(groupedDifferences[:idx+1,1])])
+        return(correctEdges)
+
+    def define_pixel_periphery(self, coordinates, offsets, xLen, yLen):
+        """
+        find the boxes (xmin, xmax, ymin, ymax) of the pixel peripheries to be cleaned from the offsets of the boxes to the pixels
+        """
+        peripheries = np.repeat(coordinates, 2, axis=1) + offsets
+        peripheries[:, :2] = np.clip(peripheries[:, :2], 0, xLen)
+        peripheries[:, 2:] = np.clip(peripheries[:, 2:], 0, yLen)
+        return(peripheries)
+
+    def skeletonize_image(self, cleanImage):
+        """
+        skeletonize cleaned image according to whether the images is noisy or not
+        """
+        show_Message("...Image is skeletonized.")
+        if self.cleanNoise == 0:
+            skeletonAnalysis, binaryImage = self.create_skeletonized_image(cleanImage)
+        else:
+            skeletonAnalysis, binaryImage = self.remove_noise_from_image(cleanImage)
+        return(skeletonAnalysis, binaryImage)
+
+    def create_skeletonized_image(self, cleanImage):
+        """
+        create the rescaled, filtered, binarized and skeletonized image
+        """
+        if self.changeRescaling == 0:
+            pLower, pUpper = np.percentile(cleanImage, (2, 98))
+        else:
+            pLower, pUpper = np.percentile(cleanImage, (2, 90))
+        rescaledImage = skimage.exposure.rescale_intensity(cleanImage, (pLower, pUpper))
+        if self.tileSize is not None:
+            tubeImage = tube_filter_in_tiles(rescaledImage, 3, 3, self.tileSize, self.numberOfWorkers, self.fastFilter)
+        elif self.fastFilter:
+            tubeImage = fused_tube_filter(rescaledImage, 3, 3, dtype=np.uint8 if self.lowMemory else 'int')
+        else:
+            gaussianImage = skimage.filters.gaussian(self.float_image(rescaledImage), sigma=3)
+            del rescaledImage
+            tubeImage = tube_filter(gaussianImage, sigma=3, dtype=np.uint8 if self.lowMemory else 'int')
+            del gaussianImage
+        binaryImage = self.binarize_image(tubeImage)
+        smallObjects = skimage.morphology.remove_small_objects(binaryImage, 500)
+        smallHoles = skimage.morphology.remove_small_holes(smallObjects, 200)
+        skeletonImage = skimage.morphology.skeletonize(smallHoles)
+        correctedSkeletonImage = self.correct_gaps(skeletonImage)
+        skeletonAnalysis = SkeletonAnalysis(correctedSkeletonImage)
+        return(skeletonAnalysis, binaryImage)
+
+    def correct_gaps(self, skeletonImage):
+        """
+        close gaps of the skeleton along the skeleton of the previous frame first and then by the angles of the endpoints
+        """
+        if self.priorSkeleton is not None and self.priorSkeleton.shape != skeletonImage.shape:
+            show_Message("...The previous frame has a different size, its skeleton is not used as prior.")
+        elif self.priorSkeleton is not None:
+            skeletonImage, bridgedGaps = bridge_gaps_with_prior(skeletonImage, self.priorSkeleton)
+            show_Message("..." + str(bridgedGaps) + " gaps were closed along the skeleton of the previous frame.")
+        return(correct_gaps_in_skeleton(skeletonImage))
+
+    def binarize_image(self, tubeImage):
+        """
+        binarize image with mean of Otsu threshold and intensity histogram
+        """
+        show_Message("...Image is binarized.")
+        counts, bins = np.histogram(tubeImage.flatten(), 256, range=(0, 256))
+        thresholdHist = np.where(counts == np.max(counts))[0][0]
+        thresholdOtsu = skimage.filters.threshold_otsu(tubeImage)
+        thresholdImage = np.mean([thresholdHist, thresholdOtsu])
+        binaryImage = tubeImage > thresholdImage
+        return(binaryImage)
+
+    def remove_noise_from_image(self, cleanImage):
+        """
+        remove noise from image and then skeletonize
+        """
+        denoisedImage = skimage.restoration.denoise_tv_chambolle(self.float_image(cleanImage))
+        tophatImage = skimage.morphology.white_tophat(denoisedImage, selem=disk(3))
+        adapthistImage = skimage.exposure.equalize_adapthist(tophatImage, clip_limit=0.1)
+        otsuImage = skimage.filters.threshold_otsu(adapthistImage)
+        binaryImage = adapthistImage > otsuImage
+        smallObjects = skimage.morphology.remove_small_objects(binaryImage, 200)
+        intermediateSkeletonImage = skimage.morphology.skeletonize(smallObjects)
+        continueNoiseCleaning = self.evaluate_skeleton(intermediateSkeletonImage)
+        if continueNoiseCleaning == True:
+            correctedSkeletonImage = self.correct_gaps(intermediateSkeletonImage)
+            skeletonAnalysis = SkeletonAnalysis(correctedSkeletonImage)
+        else:
+            skeletonAnalysis, binaryImage = self.create_skeletonized_image(cleanImage)
+        return(skeletonAnalysis, binaryImage)
+
+    def evaluate_skeleton(self, skeletonImage):
+        """
+        evaluate if denoised image renders usable skeleton
+        """
+        usableSkeleton = True
+        labeledSkeleton, labels = sp.ndimage.label(skeletonImage, np.ones((3,3)))
+        if labels > 5:
+            usableSkeleton = False
+        return(usableSkeleton)
+
+    def plot_labeled_image(self, labeledImage, labels):
+        """
+        plot the labeled image with labels
+        """
+        textPositions = []
+        textString = []
+        labelGeometry = LabelGeometry(labeledImage)
+        for idx in range(2, labels + 1):
+            cmx, cmy = labelGeometry.centroid(idx)
+            textPositions.append([cmx, cmy])
+            textString.append(str(idx-1))
+        labelThreshold = int(80*labels/100)
+
+        fig, axs = plt.subplots(1, 1, figsize=(10, 10))
+        plt.imshow(labeledImage, cmap='viridis')
+        axs.axes.get_yaxis().set_visible(False)
+        axs.axes.get_xaxis().set_visible(False)
+        for idx in range(len(textString)):
+            if int(textString[idx]) >= labelThreshold:
+                plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='black')
+            else:
+                plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='white')
+        fig.savefig(self.pathToFolder + '/LabeledPavementCells.png', bbox_inches='tight', dpi=300)
+
+class VisGraph:
+
+    def __init__(self, filename, preprocessedImage, plotIntermediate, resolution, outputFolder, plotLobeOutput, roiInput, roiFileList, fileList, visibilityBackend='vectorized', pixelDistances=None, numberOfWorkers=1, stageCache=None, priorGraph=None, keepCellOutput=False):
+        self.filename = filename
+        self.outputFolder = outputFolder
+        self.plotIntermediate = plotIntermediate
+        self.resolution = float(resolution)
+        self.plotLobeOutput = plotLobeOutput
+        self.roiInput = roiInput
+        self.roiFileList = roiFileList
+        self.fileList = fileList
+        self.visibilityBackend = visibilityBackend
+        self.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+        self.pixelDistance = None
+        self.contourCache = {}
+        self.graphCache = {}
+        self.cellMatches = {}
+        self.reusedOutput = {}
+        # the table rows and graphs of every cell are kept for the next frame of a time-lapse
+        self.cellOutput = {} if keepCellOutput else None
+        self.numberOfWorkers = int(numberOfWorkers)
+        self.collectedOutput = None
+        self.stageCache = stageCache
+        self.skeletonKey = None
+
+        self.prepare_output_folder()
+        if self.roiInput == False:
+            if preprocessedImage != None:
+                self.skeletonAnalysis = preprocessedImage.skeletonAnalysis
+                self.skeletonImage = preprocessedImage.skeletonImage
+                self.branchlessSkeleton = preprocessedImage.branchlessSkeleton
+                self.labeledImage = preprocessedImage.labeledImage
+                self.labels = preprocessedImage.labels
+            else:
+                try:
+                    self.skeletonAnalysis = self.load_skeleton_analysis()
+                    self.skeletonImage = self.skeletonAnalysis.skeletonImage
+                    self.branchlessSkeleton = self.skeletonAnalysis.branchlessSkeleton
+                    self.labeledImage, self.labels = sp.ndimage.label(~self.branchlessSkeleton)
+                except FileNotFoundError:
+                    show_Warning("No pre-processed files were found for the selected image.")
+
+            self.shapeResultsTable = pd.DataFrame(columns=['CellNumber', 'VisGraphNodes', 'VisGraphEdges', 'Lobes', 'Necks', 'Junctions', 'JunctionLobes', 'Completeness', 'Circularity', 'Area [µm2]', 'Perimeter [µm]'])
+            self.lobeParameters = pd.DataFrame(columns=['CellLabel', 'NodeLabelLobe', 'PositionLobeX', 'PositionLobeY', 'NodeLabelNeck1', 'NodeLabelNeck2', 'LobeLength [µm]', 'NeckWidth [µm]', 'ProtrusionDepth [px]', 'ProtrusionWidth [px]'])
+
+            if self.stageCache is not None:
+                self.skeletonKey = self.stageCache.array_key('skeleton', self.skeletonAnalysis.skeletonImage, self.skeletonAnalysis.branchlessSkeleton)
+                self.contourCache = self.stageCache.get(self.stageCache.key('contours', self.skeletonKey)) or {}
+            self.junctions = self.load_threeway_junctions(self.skeletonAnalysis, self.labeledImage)
+            np.save(self.outputFolder + '/TriCellularJunctionPositions.npy', self.junctions)
+            self.junctionMap = map_junctions_to_labels(self.junctions, self.labeledImage)
+            self.labelGeometry = LabelGeometry(self.labeledImage)
+            if priorGraph is not None:
+                self.cellMatches = self.reuse_unchanged_cells(priorGraph)
+        else:
+            self.shapeResultsTable = pd.DataFrame(columns=['CellNumber', 'VisGraphNodes', 'VisGraphEdges', 'Lobes', 'Necks', 'Completeness', 'Perimeter [µm]'])
+            self.lobeParameters = pd.DataFrame(columns=['CellLabel', 'NodeLabelLobe', 'PositionLobeX', 'PositionLobeY', 'NodeLabelNeck1', 'NodeLabelNeck2', 'LobeLength [µm]', 'NeckWidth [µm]'])
+
+        if pixelDistances is None:
+            self.create_graphs_and_tables()
+        else:
+            self.sweep_pixel_distances(pixelDistances)
+        report_visibility_counters(self.visibilityCounters)
+        show_Message("\nGraVis is done!")
+
+    def prepare_output_folder(self):
+        """
+        create the output folder and remove results of previous runs
+        """
+        if not os.path.exists(self.outputFolder):
+            os.makedirs(self.outputFolder)
+        if os.path.isfile(self.outputFolder + '/visibilityGraphs.gpickle'):
+            os.remove(self.outputFolder + '/visibilityGraphs.gpickle')
+        if os.path.isfile(self.outputFolder + '/cellContours.gpickle'):
+            os.remove(self.outputFolder + '/cellContours.gpickle')
+        if os.path.isfile(self.outputFolder + '/ShapeResultsTable.csv'):
+            os.remove(self.outputFolder + '/ShapeResultsTable.csv')
+        if os.path.isfile(self.outputFolder + '/LobeParameters.csv'):
+            os.remove(self.outputFolder + '/LobeParameters.csv')
+        if self.roiInput == False:
+            if self.plotLobeOutput == 1:
+                if not os.path.exists(self.outputFolder + '/ResultsLobePositions'):
+                    try:
+                        os.makedirs(self.outputFolder + '/ResultsLobePositions')
+                    except OSError:
+                        show_Warning("Creation of the results directory for graphical lobe positions failed.")
+
+    def load_skeleton_analysis(self):
+        """
+        load the skeleton analysis of the pre-processing or compute it from the saved skeleton images of older runs
+        """
+        if os.path.isfile(self.outputFolder + '/skeletonAnalysis.npz'):
+            return(SkeletonAnalysis.load(self.outputFolder + '/skeletonAnalysis.npz'))
+        skeletonImage = skimage.io.imread(self.outputFolder + '/skeletonImage.png') > 0
+        branchlessSkeleton = skimage.io.imread(self.outputFolder + '/branchlessSkeleton.png') > 0
+        return(SkeletonAnalysis(skeletonImage, branchlessSkeleton))
+
+    def create_graphs_and_tables(self):
+        """
+        create the visibility graphs of all cells or ROIs and summarize their results in tables
+        """
+        # graphs found in the stage cache are only summarized
+        cachedGraphs = self.load_cached_graphs()
+        if cachedGraphs is not None:
+            self.visibilityGraphs, self.cellContours = cachedGraphs
+            for label in range(1, self.labels):
+                self.append_to_pickle(self.cellContours[label], 'cellContours.gpickle')
+            self.add_data_to_table(self.visibilityGraphs, self.cellContours, self.labeledImage, self.labels, self.junctions, self.resolution)
+        elif self.roiInput == False and self.numberOfWorkers > 1:
+            self.visibilityGraphs, self.cellContours = self.visibility_graphs_in_parallel(self.labeledImage, self.labels, self.resolution)
+            self.save_cached_graphs()
+        elif self.roiInput == False:
+            self.visibilityGraphs, self.cellContours = self.visibility_graphs(self.labeledImage, self.labels, self.resolution)
+            self.save_cached_graphs()
+            self.add_data_to_table(self.visibilityGraphs, self.cellContours, self.labeledImage, self.labels, self.junctions, self.resolution)
+        else:
+            if self.roiFileList == False:
+                self.keyName, self.cellContour = self.read_roi_file(self.filename)
+                show_Message("...Create visibility graph for " + self.keyName)
+                self.visibilityGraph = self.create_visibility_graph_roi(self.cellContour, self.resolution)
+                self.save_contour_and_graph_roi(self.visibilityGraph, self.cellContour, self.outputFolder)
+                self.add_data_to_table_roi(self.visibilityGraph, self.cellContour, self.keyName, self.resolution)
+            else:
+                for index, file in enumerate(self.fileList):
+                    check_cancelled()
+                    self.keyName, self.cellContour = self.read_roi_file(file)
+                    show_Message("...Create visibility graph " + str(index + 1) + " of " + str(len(self.fileList)))
+                    self.visibilityGraph = self.create_visibility_graph_roi(self.cellContour, self.resolution)
+                    self.save_contour_and_graph_roi(self.visibilityGraph, self.cellContour, self.outputFolder)
+                    self.add_data_to_table_roi(self.visibilityGraph, self.cellContour, self.keyName, self.resolution)
+
+    def reuse_unchanged_cells(self, priorGraph):
+        """
+        match the cells to the cells of the previous frame and reuse the contours, graphs and table rows of unchanged cells
+        """
+        if priorGraph.labeledImage.shape != self.labeledImage.shape:
+            show_Message("...The previous frame has a different size, its cells are not tracked.")
+            return({})
+        cellMatches = match_labels(self.labeledImage, priorGraph.labeledImage)
+        if priorGraph.resolution == self.resolution and priorGraph.pixelDistance == self.pixelDistance:
+            for label, (priorLabel, unchanged) in cellMatches.items():
+                if unchanged and priorLabel in priorGraph.contourCache:
+                    self.contourCache[label] = priorGraph.contourCache[priorLabel]
+                    self.graphCache[label] = (priorGraph.visibilityGraphs[priorLabel - 1], priorGraph.cellContours[priorLabel - 1])
+                    if priorGraph.cellOutput is not None and priorLabel in priorGraph.cellOutput:
+                        if match_junctions(self.get_junctions_of_cell(label), priorGraph.get_junctions_of_cell(priorLabel)):
+                            self.reusedOutput[label] = (priorGraph.outputFolder, priorLabel, priorGraph.cellOutput[priorLabel])
+        show_Message("..." + str(len(cellMatches)) + " cells were matched to the previous frame, " + str(len(self.graphCache)) + " of them are unchanged and the results of " + str(len(self.reusedOutput)) + " cells are reused.")
+        return(cellMatches)
+
+    def graph_key(self):
+        """
+        return the stage cache key of the visibility graphs, which depend on the skeleton and the node distance
+        """
+        pixelDistance = calculate_pixel_distance(self.resolution) if self.pixelDistance is None else self.pixelDistance
+        return(self.stageCache.key('graphs', self.skeletonKey, pixelDistance))
+
+    def load_cached_graphs(self):
+        """
+        return the visibility graphs and cell contours of all cells from the stage cache or None if they were not cached
+        """
+        if self.skeletonKey is None:
+            return(None)
+        cachedGraphs = self.stageCache.get(self.graph_key())
+        if cachedGraphs is not None:
+            show_Message("...Loaded visibility graphs from the cache.")
+        return(cachedGraphs)
+
+    def save_cached_graphs(self):
+        """
+        add the visibility graphs, cell contours and ordered contours of all cells to the stage cache
+        """
+        if self.skeletonKey is None:
+            return
+        self.stageCache.put(self.graph_key(), (self.visibilityGraphs, self.cellContours))
+        if self.stageCache.key('contours', self.skeletonKey) not in self.stageCache:
+            self.stageCache.put(self.stageCache.key('contours', self.skeletonKey), self.contourCache)
+
+    def sweep_pixel_distances(self, pixelDistances):
+        """
+        create visibility graphs and result tables for several node distances, cell contours are extracted only once
+        """
+        outputFolder = self.outputFolder
+        for pixelDistance in pixelDistances:
+            show_Message("...Node distance of " + str(pixelDistance) + " px:")
+            self.pixelDistance = int(pixelDistance)
+            self.outputFolder = outputFolder + '/PixelDistance_' + str(self.pixelDistance)
+            self.prepare_output_folder()
+            self.create_graphs_and_tables()
+        self.outputFolder = outputFolder
+        self.pixelDistance = None
+
+    def read_roi_file(self, filename):
+        """
+        read roi file and return corresponding x/y coordinates
+        """
+        fileType = filename.split('/')[-1].split('.')[-1]
+        if fileType == 'roi' or fileType == 'ROI':
+            keyName = filename.split('/')[-1].split('.')[0]
+            roiFile = read_roi.read_roi_file(filename)
+            xCoordinates = roiFile[keyName]['x']
+            yCoordinates = roiFile[keyName]['y']
+            cellContour = np.array(list(zip(xCoordinates, yCoordinates)))
+            return(keyName, cellContour)
+        else:
+            show_Warning("The folder you chose, inludes ROI files and other file types. Please remove files which are not ROI files for the analysis.")
+
+    def save_contour_and_graph_roi(self, visGraph, cellContour, outputFolder):
+        """
+        save the visibility graph and cell contour extracted from ROI file
+        """
+        cellContoursPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
+        pickle.dump(cellContour, cellContoursPickle)
+        cellContoursPickle.close()
+        visGraphsPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
+        pickle.dump(visGraph, visGraphsPickle)
+        visGraphsPickle.close()
+
+    def load_threeway_junctions(self, skeletonAnalysis, labeledImage):
+        """
+        load the threeway junctions of the skeleton from the stage cache or detect them and add them to the cache
+        """
+        if self.skeletonKey is None:
+            return(self.detect_threeway_junctions(skeletonAnalysis, labeledImage))
+        junctionKey = self.stageCache.key('junctions', self.skeletonKey)
+        finalListJunctions = self.stageCache.get(junctionKey)
+        if finalListJunctions is None:
+            finalListJunctions = self.detect_threeway_junctions(skeletonAnalysis, labeledImage)
+            self.stageCache.put(junctionKey, finalListJunctions)
+        else:
+            show_Message("...Loaded tri-cellular junctions from the cache.")
+            if self.plotIntermediate == 1:
+                self.plot_cell_junctions(finalListJunctions, skeletonAnalysis.branchlessSkeleton)
+        return(finalListJunctions)
+
+    def detect_threeway_junctions(self, skeletonAnalysis, labeledImage):
+        """
+        detect threeway junctions of cells in skeletonized image
+        """
+        show_Message("...Detect tri-cellular junctions.")
+        finalListJunctions = []
+        branchlessSkeleton = skeletonAnalysis.branchlessSkeleton
+        labeledTrackedImage = create_labeled_and_tracked_image(skeletonAnalysis.skeletonImage, labeledImage, skeletonAnalysis.trackedBranches)
+        allJunctionsList = skeletonAnalysis.crossings
+        lenX, lenY = branchlessSkeleton.shape
+        for xPos, yPos in allJunctionsList:
+            if branchlessSkeleton[xPos, yPos] == 1:
+                window, winBounds = create_window(labeledTrackedImage, xPos, yPos, 1, 2, 1, 2)
+                tracked = np.transpose(np.where(window == 2))
+                if len(tracked) == 0:
+                    finalListJunctions.append([xPos, yPos])
+                else:
+                    newWindow, _ = create_window(labeledTrackedImage, tracked[0][0]+winBounds[0], tracked[0][1]+winBounds[2], 1, 2, 1, 2)
+                    if np.sum(newWindow == 0) != 0 and np.sum(newWindow == 0) >= np.sum(newWindow >= 3):
+                        finalListJunctions.append([xPos, yPos])
+
+        if self.plotIntermediate == 1:
+            self.plot_cell_junctions(finalListJunctions, branchlessSkeleton)
+        return(finalListJunctions)
+
+    def plot_cell_junctions(self, finalListJunctions, branchlessSkeleton):
+        """
+        plot the threeway junctions on the branchless skeleton
+        """
+        graph = nx.Graph()
+        for idx, (x,y) in enumerate(finalListJunctions):
+            graph.add_node(idx, pos=(y, x))
+        posGraph = nx.get_node_attributes(graph, 'pos')
+
+        fig,axs = plt.subplots(1, 1, figsize=(10, 10))
+        plt.imshow(branchlessSkeleton, cmap='gray')
+        nodes=nx.draw_networkx_nodes(graph, posGraph, with_labels=False, node_color='red', node_size=30)
+        nodes.set_edgecolor('None')
+        axs.axes.get_yaxis().set_visible(False)
+        axs.axes.get_xaxis().set_visible(False)
+        fig.savefig(self.outputFolder + '/JunctionsOnSkeleton.png', bbox_inches='tight', dpi=300)
+
+    def visibility_graphs(self, labeledImage, labels, resolution):
+        """
+        create a visibility graph for all cells
+        """
+        show_Message("...Create visibility graphs:")
+        visGraphsAll = {}
+        cellContoursAll = {}
+        for label in range(2, labels+1):
+            check_cancelled()
+            show_Message("......Graph " + str(label-1) + ' of ' + str(labels-1))
+            if label in self.graphCache:
+                visGraphsAll[label-1], cellContour = self.graphCache[label]
+            else:
+                visGraphsAll[label-1], cellContour = self.create_visibility_graph(labeledImage, label, resolution)
+            cellContoursAll[label-1] = cellContour
+            self.append_to_pickle(cellContour, 'cellContours.gpickle')
+        return(visGraphsAll, cellContoursAll)
+
+    def visibility_graphs_in_parallel(self, labeledImage, labels, resolution):
+        """
+        create the visibility graphs and table rows of all cells in a process pool sharing the labeled image
+        """
+        show_Message("...Create visibility graphs with " + str(self.numberOfWorkers) + " processes:")
+        visGraphsAll = {}
+        cellContoursAll = {}
+        settings = {'outputFolder': self.outputFolder, 'resolution': resolution, 'plotLobeOutput': self.plotLobeOutput,
+                    'visibilityBackend': self.visibilityBackend, 'pixelDistance': self.pixelDistance, 'shapeResultsTable': self.shapeResultsTable, 'lobeParameters': self.lobeParameters}
+        # every task carries only the junctions of its own cell instead of all junctions of the image
+        tasks = [(label, self.contourCache.get(label), self.graphCache.get(label), self.get_junctions_of_cell(label)) for label in range(2, labels+1) if label not in self.reusedOutput]
+        sharedImage = shared_memory.SharedMemory(create=True, size=max(labeledImage.nbytes, 1))
+        try:
+            np.ndarray(labeledImage.shape, dtype=labeledImage.dtype, buffer=sharedImage.buf)[...] = labeledImage
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.numberOfWorkers, mp_context=processContext, initializer=initialize_cell_worker,
+                                                        initargs=(sharedImage.name, labeledImage.shape, labeledImage.dtype.str, settings)) as executor:
+                results = executor.map(create_cell_results, tasks)
+                for label in range(2, labels+1):
+                    if is_cancelled():
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        check_cancelled()
+                    show_Message("......Graph " + str(label-1) + ' of ' + str(labels-1))
+                    if label in self.reusedOutput:
+                        visGraphsAll[label-1], cellContoursAll[label-1] = self.graphCache[label]
+                        self.append_to_pickle(cellContoursAll[label-1], 'cellContours.gpickle')
+                        self.write_reused_cell_output(label)
+                        continue
+                    visGraph, cellContour, orderedContour, contourOutput, tableOutput, visibilityCounters = next(results)
+                    visGraphsAll[label-1] = visGraph
+                    cellContoursAll[label-1] = cellContour
+                    self.contourCache[label] = orderedContour
+                    self.write_collected_output(contourOutput)
+                    self.write_collected_output(tableOutput)
+                    if self.cellOutput is not None:
+                        self.cellOutput[label] = tableOutput
+                    for counter in visibilityCounters:
+                        self.visibilityCounters[counter] += visibilityCounters[counter]
+        finally:
+            sharedImage.close()
+            sharedImage.unlink()
+        return(visGraphsAll, cellContoursAll)
+
+    def create_visibility_graph(self, labeledImage, label, resolution):
+        """
+        create compact visibility graph from cell contour
+        """
+        visGraph = CompactVisGraph.from_visible_pairs({}, [])
+        pixelDistance = calculate_pixel_distance(resolution) if self.pixelDistance is None else self.pixelDistance
+        if label not in self.contourCache:
+            self.contourCache[label] = self.extract_cell_contour(label, labeledImage)[1]
+        cellContourOrdered = self.contourCache[label]
+        if len(cellContourOrdered) != 0:
+            pixelsOnContour = interpolate_contour_pixels(cellContourOrdered, pixelDistance)
+            if len(pixelsOnContour) >= 4:
+                visiblePairs = find_visible_pairs(pixelsOnContour, self.visibilityBackend, self.visibilityCounters)
+                visGraph = CompactVisGraph.from_visible_pairs(pixelsOnContour, visiblePairs)
+            else:
+                cellContourOrdered = []
+        return(visGraph, cellContourOrdered)
+
+    def create_visibility_graph_roi(self, cellContour, resolution):
+        """
+        create visibilit graph from cell contour
+        """
+        visGraph = nx.Graph()
+        pixelDistance = calculate_pixel_distance(resolution) if self.pixelDistance is None else self.pixelDistance
+        if pixelDistance != 0:
+            pixelsOnContour = interpolate_contour_pixels(cellContour, pixelDistance)
+            if len(pixelsOnContour) >= 4:
+                for key in pixelsOnContour:
+                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
+                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
+            else:
+                show_Message("The contour you provided did not render enough nodes for the resulting visibility graph. Please change the resolution or provide a contour with more coordinates.")
+        else:
+            show_Message("The calculated optimal pixel distance equals zero with the resolution you provided. Please change the resolution.")
+        return(visGraph)
+
+    def extract_cell_contour(self, label, labeledImage):
+        """
+        extract the contour of a specified cell, the contour image is cropped to the bounding box of the cell
+        """
+        cellImage, offset = self.labelGeometry.crop(label, pad=2)
+        contourImage = invert(cellImage)
+        cellContour = find_contour_of_object(cellImage)
+        if len(cellContour) == 0:
+            return(contourImage, [])
+        if (0 not in cellContour + offset) and (labeledImage.shape[0] not in cellContour[:, 0] + offset[0]) and (labeledImage.shape[1] not in cellContour[:, 1] + offset[1]):
+            cellContourOrdered = marching_squares(cellContour, cellImage)
+            for xPos, yPos in cellContourOrdered:
+                contourImage[xPos, yPos] = 1
+            if len(cellContourOrdered) != 0:
+                cellContourOrdered = cellContourOrdered + offset
+        else:
+            cellContourOrdered = []
+            for xPos, yPos in cellContour:
+                contourImage[xPos, yPos] = 1
+        return(contourImage, cellContourOrdered)
+
+    def add_edges_to_visGraph(self, pixelsOnContour, visGraph):
+        """
+        add edge to visGraph if the edge between two nodes lies inside the cell (concave)
+        """
+        visGraph = add_visibility_edges(pixelsOnContour, visGraph, self.visibilityBackend, self.visibilityCounters)
+        return(visGraph)
+
+    def add_data_to_table(self, visGraphsAll, cellContoursAll, labeledImage, labels, junctions, resolution):
+        """
+        summarize all results in a table, the rows of unchanged cells are reused
+        """
+        for label in range(1, labels):
+            if label + 1 in self.reusedOutput:
+                self.write_reused_cell_output(label + 1)
+            elif self.cellOutput is None:
+                self.add_cell_data_to_table(label, visGraphsAll[label], cellContoursAll[label], labeledImage, resolution)
+            else:
+                self.collectedOutput = []
+                self.add_cell_data_to_table(label, visGraphsAll[label], cellContoursAll[label], labeledImage, resolution)
+                self.cellOutput[label + 1], self.collectedOutput = self.collectedOutput, None
+                self.write_collected_output(self.cellOutput[label + 1])
+
+    def write_reused_cell_output(self, label):
+        """
+        write the table rows, visibility graph and lobe plot of a cell from the previous frame
+        """
+        priorFolder, priorLabel, priorOutput = self.reusedOutput[label]
+        cellOutput = []
+        for fileType, fileName, data in priorOutput:
+            if fileType == 'csv':
+                # the cell covers the same pixels and junctions, so only the cell number of its rows changes, in place so the columns keep their types
+                data = data.copy()
+                data.loc[:, 'CellNumber' if fileName == 'ShapeResultsTable.csv' else 'CellLabel'] = label - 1
+            cellOutput.append((fileType, fileName, data))
+        self.write_collected_output(cellOutput)
+        if self.cellOutput is not None:
+            self.cellOutput[label] = cellOutput
+        if self.plotLobeOutput == 1:
+            self.reuse_visual_output(label, priorFolder, priorLabel, priorOutput)
+
+    def reuse_visual_output(self, label, priorFolder, priorLabel, priorOutput):
+        """
+        copy or redraw the lobe plot of a reused cell
+        """
+        plotName = '/Cell' + str(label - 1) + '_detectedFeatures.png'
+        plotFolder = '/ResultsLobePositions' if os.path.exists(self.outputFolder + '/ResultsLobePositions') else ''
+        priorPlotFolder = '/ResultsLobePositions' if os.path.exists(priorFolder + '/ResultsLobePositions') else ''
+        if label == priorLabel and os.path.isfile(priorFolder + priorPlotFolder + plotName):
+            shutil.copyfile(priorFolder + priorPlotFolder + plotName, self.outputFolder + plotFolder + plotName)
+            return
+        visGraph = pickle.loads([data for fileType, fileName, data in priorOutput if fileName == 'visibilityGraphs.gpickle'][0])
+        if visGraph.number_of_nodes() != 0:
+            lobeNeckNone = nx.get_node_attributes(visGraph, 'LobeNeckNone')
+            lobes = [node for node in visGraph.nodes if lobeNeckNone[node] == 'Lobe']
+            necks = [node for node in visGraph.nodes if lobeNeckNone[node] == 'Neck']
+            cellContour = self.graphCache[label][1]
+            self.create_visual_output(label - 1, visGraph, cellContour, self.find_number_of_cell_junctions(cellContour, label), lobes, necks, nx.get_node_attributes(visGraph, 'pos'))
+
+    def add_cell_data_to_table(self, label, visGraph, cellContour, labeledImage, resolution):
+        """
+        summarize the results of a single cell in a table
+        """
+        cellArea = self.labelGeometry.area(label + 1)
+        perimeter = len(cellContour) * resolution
+        if visGraph.number_of_nodes() != 0:
+            cellJunctions = self.find_number_of_cell_junctions(cellContour, label + 1)
+            lobes, necks = self.count_lobes_and_necks(visGraph)
+            # the networkx graph is built once per cell for the pickle and the lobe and neck measurements
+            visGraph = self.add_lobe_and_neck_property(visGraph, necks, lobes).to_networkx()
+            self.append_to_pickle(visGraph, 'visibilityGraphs.gpickle')
+            correlatedJunctions = self.correlate_junctions_and_lobes(visGraph, lobes, necks, cellJunctions)
+            self.calculate_lobe_and_neck_properties(label, visGraph, cellContour, cellJunctions, lobes,
+            necks, correlatedJunctions, resolution)
+            sigma = self.compute_graph_complexity(visGraph)
+            area = cellArea * (resolution ** 2)
+            circularity = 4 * np.pi * area / perimeter ** 2
+            dataAppend = [label, visGraph.number_of_nodes(), visGraph.number_of_edges(), len(lobes), len(necks), len(cellJunctions), len(correlatedJunctions), sigma, circularity, area, perimeter]
+        else:
+            self.append_to_pickle(visGraph.to_networkx(), 'visibilityGraphs.gpickle')
+            dataAppend = [label, 0, 0, 0, 0, 0, 0, 0, 0, 0, perimeter]
+        self.shapeResultsTable.loc[0] = dataAppend
+        self.append_to_csv(self.shapeResultsTable, 'ShapeResultsTable.csv')
+
+    def append_to_csv(self, table, fileName):
+        """
+        append the current row of a result table to a csv file, rows of process pool workers are collected instead
+        """
+        if self.collectedOutput is not None:
+            self.collectedOutput.append(('csv', fileName, table.copy()))
+        elif not os.path.isfile(self.outputFolder + '/' + fileName):
+            table.to_csv(self.outputFolder + '/' + fileName, mode='a', index=False, sep=';', decimal=',')
+        else:
+            table.to_csv(self.outputFolder + '/' + fileName, mode='a', index=False, header=False, sep=';', decimal=',')
+
+    def append_to_pickle(self, data, fileName):
+        """
+        append an object to a pickle file, objects of process pool workers are collected instead
+        """
+        if self.collectedOutput is not None:
+            # objects are pickled in the worker, so the files do not depend on the transfer between processes
+            self.collectedOutput.append(('pickle', fileName, pickle.dumps(data)))
+        else:
+            self.append_pickled_data(pickle.dumps(data), fileName)
+
+    def append_pickled_data(self, pickledData, fileName):
+        """
+        append an already pickled object to a pickle file
+        """
+        dataPickle = open(self.outputFolder + '/' + fileName, 'ab')
+        dataPickle.write(pickledData)
+        dataPickle.close()
+
+    def write_collected_output(self, collectedOutput):
+        """
+        write the rows and objects collected by a process pool worker in their original order
+        """
+        for fileType, fileName, data in collectedOutput:
+            if fileType == 'csv':
+                self.append_to_csv(data, fileName)
+            else:
+                self.append_pickled_data(data, fileName)
+
+    def add_data_to_table_roi(self, visGraph, cellContour, label, resolution):
+        """
+        summarize all results in a table
+        """
+        if visGraph.number_of_nodes() != 0:
+            lobes, necks = self.count_lobes_and_necks(visGraph)
+            self.calculate_lobe_and_neck_properties_roi(label, visGraph, cellContour, lobes,
+            necks, resolution)
+            sigma = self.compute_graph_complexity(visGraph)
+            dataAppend = [label, visGraph.number_of_nodes(), visGraph.number_of_edges(), len(lobes), len(necks), sigma, len(cellContour) * resolution]
+        else:
+            dataAppend = [label, 0, 0, 0, 0, 0, len(cellContour) * resolution]
+        self.shapeResultsTable.loc[0] = dataAppend
+        self.append_to_csv(self.shapeResultsTable, 'ShapeResultsTable.csv')
+
+    def add_lobe_and_neck_property(self, graph, neckIndices, lobeIndices):
+        """
+        add node property describing if a node was identified as lobe or neck
+        """
+        if isinstance(graph, CompactVisGraph):
+            graph.set_lobes_and_necks(lobeIndices, neckIndices)
+            return(graph)
+        neckLobeProperty = {}
+        for nodeName in list(graph.nodes):
+            if nodeName in lobeIndices:
+                neckLobeProperty[nodeName] = "Lobe"
+            elif nodeName in neckIndices:
+                neckLobeProperty[nodeName] = "Neck"
+            else:
+                neckLobeProperty[nodeName] = "None"
+        nx.set_node_attributes(graph, neckLobeProperty, name="LobeNeckNone")
+        return(graph)
+
+    def get_junctions_of_cell(self, label):
+        """
+        return the tri-cellular junctions in the neighbourhood of a cell from the junction map of the image
+        """
+        return([self.junctions[index] for index in self.junctionMap.get(label, [])])
+
+    def find_number_of_cell_junctions(self, cellContour, label=None):
+        """
+        find all junctions on a cell contour, allowing for small derivations
+        """
+        cellJunctions = []
+        contourIndex = CoordinateIndex(cellContour)
+        # only junctions next to the cell are tested if its label is given
+        junctions = self.junctions if label is None else self.get_junctions_of_cell(label)
+        for junction in junctions:
+            foundPositions = contourIndex.find(junction, [0,1,-1], 'coordinates')
+            if len(foundPositions) != 0:
+                cellJunctions.append(junction)
+        return(cellJunctions)
+
+    def count_lobes_and_necks(self, visGraph):
+        """
+        count the number of lobes and necks according to closeness centrality of visibility graph nodes
+        """
+        if isinstance(visGraph, CompactVisGraph):
+            closenessCentralityArray = visGraph.closeness_centrality()
+        else:
+            closenessCentrality = nx.closeness_centrality(visGraph, distance='length')
+            closenessCentralityArray = np.asarray(list(closenessCentrality.values()))
+        lobes, necks = find_local_extrema(closenessCentralityArray)
+        return(lobes, necks)
+
+    def correlate_junctions_and_lobes(self, visGraph, lobes, necks, cellJunctions):
+        """
+        correlate detected lobes and necks with detected tri-cellular junctions
+        """
+        nodePositions = nx.get_node_attributes(visGraph, 'pos')
+        detectedJunctions = []
+        positions = np.asarray([nodePositions[idx] for idx in itertools.chain(lobes, necks)])
+        if len(positions) != 0:
+            positionIndex = CoordinateIndex(positions)
+            nodeIndex = CoordinateIndex(list(nodePositions.values()), list(nodePositions.keys()))
+            for index in range(len(cellJunctions)):
+                foundPositions = positionIndex.find(cellJunctions[index], [0, 1, -1, 2, -2, 3, -3], 'coordinates')
+                if len(foundPositions) != 0:
+                    xShift, yShift = foundPositions[0][0], foundPositions[0][1]
+                    junction = (cellJunctions[index][0] + xShift, cellJunctions[index][1] + yShift)
+                    key = nodeIndex.get(junction)
+                    detectedJunctions.append(key)
+        return(detectedJunctions)
+
+    def calculate_lobe_and_neck_properties(self, key, visGraph, cellContour, cellJunctions, lobes, necks, correlatedJunctions, resolution):
+        """
+        calculate the neck width and lobe length for a selected pavement cell and create a graphic output for lobe and neck positions
+        """
+        pos = nx.get_node_attributes(visGraph, 'pos')
+        protrusionDepthOfCell, protrusionWidthOfCell = self.calculate_protrusion_depth_and_width(key, visGraph, cellContour, cellJunctions)
+        for index in range(len(necks)):
+            if index == len(necks) - 1:
+                neck1, neck2 = necks[index], necks[0]
+                nodes = np.append(np.arange(neck1, visGraph.number_of_nodes(), 1), np.arange(0, neck2, 1))
+                lobe = self.find_lobe_between_necks(lobes, nodes)
+            else:
+                neck1, neck2 = necks[index], necks[index + 1]
+                nodes = np.arange(neck1, neck2 + 1, 1)
+                lobe = self.find_lobe_between_necks(lobes, nodes)
+            neckwidth = euclidean(pos[neck1], pos[neck2])
+            protrusionDepth = protrusionDepthOfCell[index]
+            protrusionWidth = protrusionWidthOfCell[index]
+            if len(lobe) == 0:
+                dataLobes = [key, 'no lobe found', None, None, neck1, neck2, None, neckwidth * resolution, protrusionDepth, protrusionWidth]
+            elif len(lobe) > 2:
+                for matchedLobe in lobe:
+                    lobelength = self.calculate_lobe_length(neck1, neck2, matchedLobe, pos)
+                    dataLobes = [key, matchedLobe, pos[matchedLobe][0], pos[matchedLobe][1], neck1, neck2, lobelength * resolution, neckwidth * resolution, protrusionDepth, protrusionWidth]
+            else:
+                lobelength = self.calculate_lobe_length(neck1, neck2, lobe[0], pos)
+                dataLobes = [key, lobe[0], pos[lobe[0]][0], pos[lobe[0]][1], neck1, neck2, lobelength * resolution, neckwidth * resolution, protrusionDepth, protrusionWidth]
+            self.lobeParameters.loc[0] = dataLobes
+            self.append_to_csv(self.lobeParameters, 'LobeParameters.csv')
+        if self.plotLobeOutput == 1:
+            self.create_visual_output(key, visGraph, cellContour, cellJunctions, lobes, necks, pos)
+
+    def calculate_lobe_and_neck_properties_roi(self, key, visGraph, cellContour, lobes, necks, resolution):
+        """
+        calculate the neck width and lobe length for a selected pavement cell and create a graphic output for lobe and neck positions
+        """
+        pos = nx.get_node_attributes(visGraph, 'pos')
+        for index in range(len(necks)):
+            if index == len(necks) - 1:
+                neck1, neck2 = necks[index], necks[0]
+                nodes = np.append(np.arange(neck1, visGraph.number_of_nodes(), 1), np.arange(0, neck2, 1))
+                lobe = self.find_lobe_between_necks(lobes, nodes)
+            else:
+                neck1, neck2 = necks[index], necks[index + 1]
+                nodes = np.arange(neck1, neck2 + 1, 1)
+                lobe = self.find_lobe_between_necks(lobes, nodes)
+            neckwidth = euclidean(pos[neck1], pos[neck2])
+            if len(lobe) == 0:
+                dataLobes = [key, 'no lobe found', None, None, neck1, neck2, None, neckwidth * resolution]
+            elif len(lobe) > 2:
+                for matchedLobe in lobe:
+                    lobelength = self.calculate_lobe_length(neck1, neck2, matchedLobe, pos)
+                    dataLobes = [key, matchedLobe, pos[matchedLobe][0], pos[matchedLobe][1], neck1, neck2, lobelength * resolution, neckwidth * resolution]
+            else:
+                lobelength = self.calculate_lobe_length(neck1, neck2, lobe[0], pos)
+                dataLobes = [key, lobe[0], pos[lobe[0]][0], pos[lobe[0]][1], neck1, neck2, lobelength * resolution, neckwidth * resolution]
+            self.lobeParameters.loc[0] = dataLobes
+            self.append_to_csv(self.lobeParameters, 'LobeParameters.csv')
+        if self.plotLobeOutput == 1:
+            self.create_visual_output_roi(key, visGraph, cellContour, lobes, necks, pos)
+
+    def calculate_protrusion_depth_and_width(self, key, visGraph, cellContour, cellJunctions):
+        """
+        calculate the protrusion depth and width of cells
+        """
+        extractionDictForTriWayJunction = {"cellLabel": key, "labeledImage": self.labeledImage, "labelGeometry": self.labelGeometry, "junctionsOfCell": self.get_junctions_of_cell(key + 1)}
+        protrusionCalculator = CellProtrusionPropertyCalculator(visGraph, cellJunctions, cellContour, extractionDictForTriWayJunction)
+        protrusionDepthOfCell = protrusionCalculator.GetProtrusionDepths()
+        protrusionWidthOfCell = protrusionCalculator.GetProtrusionWidthAtHalfHeight()
+        return(protrusionDepthOfCell, protrusionWidthOfCell)
+
+    def find_lobe_between_necks(self, lobes, nodes):
+        """
+        find the adjacent necks of a lobe
+        """
+        matchedLobe = []
+        for lobe in lobes:
+            if lobe in nodes:
+                matchedLobe.append(lobe)
+        return(matchedLobe)
+
+    def calculate_lobe_length(self, neck1, neck2, lobe1, pos):
+        """
+        calculate the length of a lobe based on its adjacent necks
+        """
+        pos1, pos2, posL = pos[neck1], pos[neck2], pos[lobe1]
+        if pos2[0] - pos1[0] == 0:
+            basePointX = pos1[0]
+            basePointY = posL[1]
+        elif pos2[1] - pos1[1] == 0:
+            basePointX = pos1[1]
+            basePointY = posL[0]
+        else:
+            slopeBase = (pos2[1] - pos1[1]) / (pos2[0] - pos1[0])
+            interceptBase = pos1[1] - slopeBase * pos1[0]
+            slopeLobe = -1 / slopeBase
+            interceptLobe = posL[1] - slopeLobe * posL[0]
+            basePointX = (interceptLobe - interceptBase) / (slopeBase - slopeLobe)
+            basePointY = slopeBase * basePointX + interceptBase
+        lobeLength = euclidean(posL, (basePointX, basePointY))
+        return(lobeLength)
+
+    def create_visual_output(self, key, visGraph, contour, junctions, lobes, necks, pos):
+        """
+        create a visual output for the positions of detected lobes, necks and tri-cellular junctions
+        """
+        xmin, xmax, ymin, ymax = np.min(contour[:, 0]), np.max(contour[:, 0]), np.min(contour[:, 1]), np.max(contour[:, 1])
+        xminB, yminB = bounds(xmin, 0, xmin - 10), bounds(ymin, 0, ymin - 10)
+        contourImage = np.zeros(((xmax + 10) - xminB, (ymax + 10) - yminB))
+        for x, y in contour:
+            contourImage[x - xminB, y - yminB] = 1
+
+        legend_elements = [matplotlib.patches.Circle(([0], [0]), radius=5, ec='gray', fc='None', lw=2, label='Junction'),
+                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#56b4e9', fc='None', lw=2, label='Lobe'),
+                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#e69f00', fc='None', lw=2, label='Neck')]
+
+        fig, ax = plt.subplots(1, 1)
+        plt.imshow(contourImage, cmap='gray_r', interpolation='None')
+        ax.tick_params(axis='both', which='both', top='off', right='off')
+        ax.set_xlabel('Pixel')
+        ax.set_ylabel('Pixel')
+        ax.set_title('Cell ' + str(key))
+        for junc in junctions:
+            circ = plt.Circle((junc[1] - yminB, junc[0] - xminB), radius=5, ec='gray', fc='None', lw=2)
+            ax.add_patch(circ)
+        for neck in necks:
+            posNeck = pos[neck]
+            circ = plt.Circle((posNeck[1] - yminB, posNeck[0] - xminB), radius=3, ec='#e69f00', fc='None', lw=2)
+            ax.add_patch(circ)
+            ax.text(posNeck[1] - yminB + 4, posNeck[0] - xminB + 3, neck, color='#af7900', fontsize=7)
+        for lobe in lobes:
+            posLobe = pos[lobe]
+            circ = plt.Circle((posLobe[1] - yminB, posLobe[0] - xminB), radius=3, ec='#56b4e9', fc='None', lw=2)
+            ax.add_patch(circ)
+            ax.text(posLobe[1] - yminB + 4, posLobe[0] - xminB + 3, lobe, color='#136492', fontsize=7)
+        ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.4), fancybox=False, shadow=False, ncol=3, fontsize=7, handler_map={matplotlib.patches.Circle: HandlerEllipse()})
+        if os.path.exists(self.outputFolder + '/ResultsLobePositions'):
+            fig.savefig(self.outputFolder + '/ResultsLobePositions/Cell' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
+        else:
+            fig.savefig(self.outputFolder + '/Cell' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
+
+    def create_visual_output_roi(self, key, visGraph, contour, lobes, necks, pos):
+        """
+        create a visual output for the positions of detected lobes, necks and tri-cellular junctions
+        """
+        xmin, xmax, ymin, ymax = np.min(contour[:, 0]), np.max(contour[:, 0]), np.min(contour[:, 1]), np.max(contour[:, 1])
+        xminB, yminB = bounds(xmin, 0, xmin - 10), bounds(ymin, 0, ymin - 10)
+        contourImage = np.zeros(((xmax + 10) - xminB, (ymax + 10) - yminB))
+        for x, y in contour:
+            contourImage[x - xminB, y - yminB] = 1
+
+        legend_elements = [matplotlib.patches.Circle(([0], [0]), radius=3, ec='#56b4e9', fc='None', lw=2, label='Lobe'),
+                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#e69f00', fc='None', lw=2, label='Neck')]
+
+        fig, ax = plt.subplots(1, 1)
+        plt.imshow(contourImage, cmap='gray_r', interpolation='None')
+        ax.tick_params(axis='both', which='both', top='off', right='off')
+        ax.set_xlabel('Pixel')
+        ax.set_ylabel('Pixel')
+        ax.set_title('Cell ' + str(key))
+        for neck in necks:
+            posNeck = pos[neck]
+            circ = plt.Circle((posNeck[1] - yminB, posNeck[0] - xminB), radius=3, ec='#e69f00', fc='None', lw=2)
+            ax.add_patch(circ)
+            ax.text(posNeck[1] - yminB + 4, posNeck[0] - xminB + 3, neck, color='#af7900', fontsize=7)
+        for lobe in lobes:
+            posLobe = pos[lobe]
+            circ = plt.Circle((posLobe[1] - yminB, posLobe[0] - xminB), radius=3, ec='#56b4e9', fc='None', lw=2)
+            ax.add_patch(circ)
+            ax.text(posLobe[1] - yminB + 4, posLobe[0] - xminB + 3, lobe, color='#136492', fontsize=7)
+        ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.4), fancybox=False, shadow=False, ncol=3, fontsize=7, handler_map={matplotlib.patches.Circle: HandlerEllipse()})
+        if os.path.exists(self.outputFolder + '/Results'):
+            fig.savefig(self.outputFolder + '/Results/Cell_' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
+        else:
+            fig.savefig(self.outputFolder + '/Cell_' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
+
+    def compute_graph_complexity(self, visGraph):
+        """
+        compute the complexity of the graph using the relative density of the clique
+        """
+        edgesCompleteGraph = (visGraph.number_of_nodes() * (visGraph.number_of_nodes() - 1)) * 0.5
+        delta = visGraph.number_of_edges() / edgesCompleteGraph
+        return(delta)
+
+class CellProtrusionPropertyCalculator(object):
+
+    def __init__(self, visGraph, triWayJunctionPos, cellContour, extractionDictForTriWayJunction=False):
+        self.visGraph = visGraph # visibility graph (networkx graph) with 'pos' and 'LobeNeckNone' node attributes
+        self.triWayJunctionPos = np.asarray(triWayJunctionPos) # 2D array with each row being the coordinates of one tri-way junction in an ordered fashion
+        self.cellContour = cellContour
+        self.extractionDictForTriWayJunction = extractionDictForTriWayJunction
+        self.calcProtrusionDepthAndWidth()
+
+    def calcProtrusionDepthAndWidth(self):
+        self.orderedContour = self.extractOrderedContour()
+        self.cellOutlineRing = self.createLinearRingFromContour()
+        if self.extractionDictForTriWayJunction:
+            labeledImage = self.extractionDictForTriWayJunction["labeledImage"]
+            cellLabel = self.extractionDictForTriWayJunction["cellLabel"]
+            labelGeometry = self.extractionDictForTriWayJunction.get("labelGeometry")
+            junctionsOfCell = self.extractionDictForTriWayJunction.get("junctionsOfCell")
+            self.triWayJunctionPos = self.extractTriWayJunctions(cellLabel, self.visGraph, self.triWayJunctionPos, labeledImage, labelGeometry, junctionsOfCell)
+        self.lobePos, self.selectedLobeKeys = self.extractPositionOfFromVisibilityGraph(undulationType="Lobe")
+        triWayJunctionPosList = [(x, y) for x, y in self.triWayJunctionPos]
+        self.uniqueJunctions = len(list(set(triWayJunctionPosList)))
+        self.protrusionDepths = self.calcShortestDistanceOfPointsToPolygon(self.triWayJunctionPos, self.lobePos, self.uniqueJunctions)
+        self.protrusionWidthAtHalfHeight = self.calcWidthAtHalfHeightFor(self.triWayJunctionPos, self.protrusionDepths, self.uniqueJunctions)
+
+    def extractOrderedContour(self):
+        orderedContour = self.cellContour
+        if np.any(orderedContour[0, :] != orderedContour[-1, :]):
+            orderedContour = np.concatenate([orderedContour[:, :], orderedContour[0, :].reshape(1, 2)])
+        return(orderedContour)
+
+    def createLinearRingFromContour(self):
+        cellOutlineRing = self.createLinearRingFromCoordinates(self.orderedContour)
+        assert cellOutlineRing.is_valid, "The cell contour of cell label is not valid. Contour: {}".format(self.orderedContour)
+        return(cellOutlineRing)
+
+    def createLinearRingFromCoordinates(self, coordinates):
+        return(shapely.geometry.LinearRing(shapely.geometry.asLineString(coordinates)))
+
+    def extractTriWayJunctions(self, cellLabel, visGraph, allTriWayJunctions, labeledImage, labelGeometry=None, junctionsOfCell=None):
+        cellLabelInLabeledImage = cellLabel + 1
+        unorderedJunctions = self.extractJunctionOfCell(allTriWayJunctions, cellLabelInLabeledImage, labeledImage, labelGeometry, junctionsOfCell)
+        unorderedJunctions = self.clipTriWayJunctionToCellOutline(self.cellOutlineRing, unorderedJunctions)
+        orderedTriWayJunctions = self.orderJunctions(unorderedJunctions, self.orderedContour)
+        return(orderedTriWayJunctions)
+
+    def extractJunctionOfCell(self, triWayJunctions, cellLabel, labeledImage, labelGeometry=None, junctionsOfCell=None):
+        if junctionsOfCell is not None:
+            # the junction map uses the neighbourhood of the dilation below
+            junctionIndex = CoordinateIndex(junctionsOfCell)
+            idx = np.asarray([index for index, junction in enumerate(triWayJunctions) if junction in junctionIndex], dtype=int)
+            return(triWayJunctions[idx, :].copy())
+        if labelGeometry is None:
+            labelGeometry = LabelGeometry(labeledImage)
+        # the crop margin is larger than the reach of the dilation, so junctions outside of the crop are never close to the cell
+        cellMask, offset = labelGeometry.crop(cellLabel, pad=8)
+        cellImage = skimage.morphology.dilation(cellMask.astype(float), np.ones((8, 8)))
+        junctionsInCrop = triWayJunctions - offset
+        inCrop = np.where(np.all((junctionsInCrop >= 0) & (junctionsInCrop < cellImage.shape), axis=1))[0]
+        idx = inCrop[cellImage[junctionsInCrop[inCrop, 0], junctionsInCrop[inCrop, 1]] == 1]
+        return(triWayJunctions[idx, :].copy())
+
+    def clipTriWayJunctionToCellOutline(self, cellOutlineRing, junctionCoordinates):
+        for i in range(len(junctionCoordinates)):
+            currentTriWayJunction = shapely.geometry.Point(junctionCoordinates[i])
+            correctedTriWayJunction = cellOutlineRing.interpolate(cellOutlineRing.project(currentTriWayJunction))
+            if not self.isCorrectedTriWayJunctionOnOutline(np.asarray(list(cellOutlineRing.coords)), junctionCoordinates[i]):
+                junctionCoordinates[i] = self.correctToOutline(np.asarray(list(cellOutlineRing.coords)), list(correctedTriWayJunction.coords))
+            else:
+                junctionCoordinates[i] = list(correctedTriWayJunction.coords)[0]
+        return(junctionCoordinates)
+
+    def isCorrectedTriWayJunctionOnOutline(self, cellOutline, junction):
+        return(np.any((cellOutline[:, 0] == junction[0]) & (cellOutline[:, 1] == junction[1])))
+
+    def correctToOutline(self, cellOutline, junction):
+        xyDistances = cellOutline - junction
+        bestIdx = np.argmin(np.linalg.norm(xyDistances, axis=1))
+        return(cellOutline[bestIdx, :])
+
+    def orderJunctions(self, unorderedJunctions, orderedContour, threshold=5):
+        orderedJunctions = []
+        if unorderedJunctions.shape[0] < 3:
+            return unorderedJunctions
+        for xyCoor in orderedContour:
+            distances = np.linalg.norm(unorderedJunctions - xyCoor, axis=1)
+            idx = np.where(distances < threshold)[0]
+            if len(idx) == 1:
+                orderedJunctions.append(unorderedJunctions[idx, :].tolist()[0])
+                unorderedJunctions = np.delete(unorderedJunctions, idx, axis=0)
+                if len(unorderedJunctions) == 0:
+                    break
+        orderedJunctions = np.asarray(orderedJunctions)
+        return(orderedJunctions)
+
+    def extractPositionOfFromVisibilityGraph(self, undulationType="Lobe"):
+        selectedNodeKeys = []
+        coordinates = []
+        nodeUndulationAttribute = nx.get_node_attributes(self.visGraph, 'LobeNeckNone')
+        allCoordinates = nx.get_node_attributes(self.visGraph, 'pos')
+        for nodeKey, undulationProperty in nodeUndulationAttribute.items():
+            if undulationProperty == undulationType:
+                coordinates.append(allCoordinates[nodeKey])
+                selectedNodeKeys.append(nodeKey)
+        coordinates = np.asarray(coordinates)
+        return(coordinates, selectedNodeKeys)
+
+    def calcShortestDistanceOfPointsToPolygon(self, polygonVertices, points, uniqueJunctions):
+        if uniqueJunctions > 2:
+            cellPolygon = shapely.geometry.asPolygon(polygonVertices)
+            cellPolygonRing = self.createLinearRingFromCoordinates(polygonVertices)
+            nrOfUndulations = points.shape[0]
+            undulationDepths = np.zeros(nrOfUndulations)
+            for i in range(nrOfUndulations):
+                undulationPoint = shapely.geometry.Point(points[i, :])
+                isInsideCell = cellPolygon.contains(undulationPoint)
+                undulationDepths[i] = cellPolygonRing.distance(undulationPoint)
+                if isInsideCell:
+                    undulationDepths[i] *= -1
+        else:
+            undulationDepths = [np.NaN] * len(points)
+        return(undulationDepths)
+
+    def calcWidthAtHalfHeightFor(self, polygonVertices, depthOfCell, uniqueJunctions):
+        nodeCoordinates = nx.get_node_attributes(self.visGraph, 'pos')
+        if uniqueJunctions > 2:
+            cellPolygonRing = self.createLinearRingFromCoordinates(polygonVertices)
+            widths = np.zeros(len(self.selectedLobeKeys))
+            for i in range(len(self.selectedLobeKeys)):
+                currentLobeNodeKey = self.selectedLobeKeys[i]
+                undulationPoint = shapely.geometry.Point(nodeCoordinates[currentLobeNodeKey])
+                if depthOfCell[i] != 0:
+                    widths[i] = self.calcWidthAtHalfHeight(undulationPoint, cellPolygonRing)
+                else:
+                    widths[i] = np.NaN
+        else:
+            widths = [np.NaN] * len(self.selectedLobeKeys)
+        return(widths)
+
+    def calcWidthAtHalfHeight(self, undulationPoint, cellPolygonRing,
+                              lengthOfParallelSegment=400, recursiveCallIncreasingSegmentLength=False,
+                              recursiveCallNr=0):
+        auxiliaryLineAtHalfHeight = self.createParallelToPolygonLineAtHalfHeight(undulationPoint,
+                                            cellPolygonRing, lengthOfParallelSegment=lengthOfParallelSegment)
+        if auxiliaryLineAtHalfHeight != None:
+            intersects = self.cellOutlineRing.intersection(auxiliaryLineAtHalfHeight)
+            intersects = self.correctPotentialLineString(intersects, undulationPoint)
+            widthAtHalfHeight = np.NaN
+            if type(intersects) != type(shapely.geometry.Point()):
+                if len(intersects) > 2:
+                    lotOfUDToPolygon = shapely.geometry.LineString([undulationPoint, cellPolygonRing.interpolate(cellPolygonRing.project(undulationPoint))])
+                    intersects = self.reduceToImportantentIntersections(intersects, lotOfUDToPolygon)
+                    undulationWidthAtHalfHeightLine = shapely.geometry.LineString(intersects)
+                    widthAtHalfHeight = undulationWidthAtHalfHeightLine.length
+                if len(intersects) == 2:
+                    undulationWidthAtHalfHeightLine = shapely.geometry.LineString(intersects)
+                    widthAtHalfHeight = undulationWidthAtHalfHeightLine.length
+        else:
+            widthAtHalfHeight = np.NaN
+        return(widthAtHalfHeight)
+
+    def createParallelToPolygonLineAtHalfHeight(self, undulationPoint, cellPolygonRing,
+                                                lengthOfParallelSegment=200):
+        halfUDPoint = self.calcPointAtHalfUndulationDepth(undulationPoint, cellPolygonRing)
+        parallelSegmentVector = self.calcVectorOfClosestPolygonSegment(undulationPoint, cellPolygonRing)
+        if np.linalg.norm(parallelSegmentVector) != 0:
+            factorForVector = lengthOfParallelSegment / (2 * np.linalg.norm(parallelSegmentVector))
+            startPointOfParallelSegment = np.asarray(halfUDPoint.coords)[0] + factorForVector * parallelSegmentVector
+            endPointOfParallelSegment = np.asarray(halfUDPoint.coords)[0] - factorForVector * parallelSegmentVector
+            auxiliaryLineAtHalfHeight = shapely.geometry.LineString([startPointOfParallelSegment, endPointOfParallelSegment])
+            return(auxiliaryLineAtHalfHeight)
+        else:
+            return(None)
+
+    def calcPointAtHalfUndulationDepth(self, undulationPoint, cellPolygonRing):
+        pointOnRing = cellPolygonRing.interpolate(cellPolygonRing.project(undulationPoint))
+        undulationDepthLine = shapely.geometry.LineString([undulationPoint, pointOnRing])
+        distance = undulationDepthLine.length
+        halfUDPoint = undulationDepthLine.interpolate(distance / 2)
+        return(halfUDPoint)
+
+    def calcVectorOfClosestPolygonSegment(self, undulationPoint, cellPolygonRing):
+        closestPolygonSegment = self.findClosestLineSegment(cellPolygonRing, undulationPoint)
+        startOfSegement, endOfSegment = list(closestPolygonSegment.coords)
+        closestSegmentVector = np.asarray(endOfSegment) - np.asarray(startOfSegement)
+        return(closestSegmentVector)
+
+    def findClosestLineSegment(self, linearRing, point):
+        oldPoint = None
+        splitRingSegments = []
+        for newPoint in linearRing.coords:
+            if oldPoint:
+                splitRingSegments.append(shapely.geometry.LineString([newPoint, oldPoint]))
+            oldPoint = newPoint
+        argMin = None
+        minDistance = np.inf
+        for i in range(len(splitRingSegments)):
+            distance = splitRingSegments[i].distance(point)
+            if distance < minDistance:
+                minDistance = distance
+                argMin = i
+        return(splitRingSegments[argMin])
+
+    def correctPotentialLineString(self, potentialLineStrings, referencePoint):
+        if type(potentialLineStrings) != type(shapely.geometry.Point()):
+            if type(potentialLineStrings) == type(shapely.geometry.LineString()):
+                potentialLineStrings = list(potentialLineStrings.coords)
+            else:
+                potentialLineStrings = list(potentialLineStrings)
+                containsLine = False
+                for i in range(len(potentialLineStrings)):
+                    if type(potentialLineStrings[i]) == type(shapely.geometry.LineString()):
+                        minDistances = np.inf
+                        closestPointToReferencePoint = None
+                        for point in potentialLineStrings[i].coords:
+                            point = shapely.geometry.Point(point)
+                            d = referencePoint.distance(point)
+                            if d < minDistances:
+                                closestPointToReferencePoint = point
+                        potentialLineStrings[i] = closestPointToReferencePoint
+            potentialLineStrings = shapely.geometry.MultiPoint(potentialLineStrings)
+        return(potentialLineStrings)
+
+    def reduceToImportantentIntersections(self, intersects, lotOfUDToPolygon):
+        intersectionCoordinates = list(intersects)
+        direction = 0
+        interlinkedIntersects = shapely.geometry.LineString(intersectionCoordinates)
+        directionChecked = 0
+        while interlinkedIntersects.intersects(lotOfUDToPolygon) or directionChecked < 2:
+            if len(intersectionCoordinates) == 2:
+                break
+            removedIntersection = intersectionCoordinates.pop(direction)
+            interlinkedIntersects = shapely.geometry.LineString(intersectionCoordinates)
+            if not interlinkedIntersects.intersects(lotOfUDToPolygon):
+                intersectionCoordinates.insert(direction, removedIntersection)
+                direction = -1
+                directionChecked += 1
+        return(intersectionCoordinates)
+
+    def GetProtrusionDepths(self):
+        return(self.protrusionDepths)
+
+    def GetProtrusionWidthAtHalfHeight(self):
+        return(self.protrusionWidthAtHalfHeight)
+
+class VisGraphOther:
+
+    def __init__(self, selectedImage, resolution, outputFolder, inputType, fileList, roiInput, visibilityBackend='vectorized', pixelDistances=None, numberOfWorkers=1):
+        self.selectedImage = selectedImage
+        self.outputFolder = outputFolder
+        self.resolution = float(resolution)
+        self.inputType = inputType
+        self.fileList = fileList
+        self.roiInput = roiInput
+        self.visibilityBackend = visibilityBackend
+        self.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+        self.contourCache = {}
+        self.numberOfWorkers = int(numberOfWorkers)
+        if self.roiInput == False:
+            self.shapeResultsTable = pd.DataFrame(columns=['File', 'LabeledImage', 'GraphNumber', '#Nodes', '#Edges', 'Completeness'])
+        else:
+            self.shapeResultsTable = pd.DataFrame(columns=['File', '#Nodes', '#Edges', 'Completeness'])
+        self.prepare_output_folder()
+
+        if pixelDistances is None:
+            self.create_graphs_and_tables()
+        else:
+            self.sweep_pixel_distances(pixelDistances)
+        report_visibility_counters(self.visibilityCounters)
+        show_Message("\nGraVis is done!")
+
+    def prepare_output_folder(self):
+        """
+        create the output folder and remove results of previous runs
+        """
+        if not os.path.exists(self.outputFolder):
+            os.makedirs(self.outputFolder)
+        if os.path.isfile(self.outputFolder + '/visibilityGraphs.gpickle'):
+            os.remove(self.outputFolder + '/visibilityGraphs.gpickle')
+        if os.path.isfile(self.outputFolder + '/cellContours.gpickle'):
+            os.remove(self.outputFolder + '/cellContours.gpickle')
+        if os.path.isfile(self.outputFolder + '/ShapeResultsTable.csv'):
+            os.remove(self.outputFolder + '/ShapeResultsTable.csv')
+
+    def create_graphs_and_tables(self):
+        """
+        create the visibility graphs of all shapes or ROIs and summarize their results in tables
+        """
+        if self.inputType == 'image':
+            if self.roiInput == False:
+                self.labeledImage, self.labels = self.label_binary_image(self.selectedImage)
+                show_Message("...Create visibility graphs.")
+                self.visibilityGraphsOther = self.visibility_graphs_other(self.labeledImage, self.labels, self.resolution, self.outputFolder, self.contourCache.setdefault(self.selectedImage, {}))
+                for graph in self.visibilityGraphsOther.keys():
+                    self.add_data_to_table(self.visibilityGraphsOther[graph], self.selectedImage, graph, 'LabeledShapes.png', self.outputFolder)
+                self.plot_labeled_image(self.labeledImage, self.outputFolder, self.labels, 'image', 1)
+            else:
+                self.keyName, self.cellContour = self.read_roi_file(self.selectedImage)
+                show_Message("...Create visibility graph.")
+                self.visibilityGraphsOther = self.create_visibility_graph_roi(self.cellContour, self.resolution)
+                self.save_contour_and_graph_roi(self.visibilityGraphsOther, self.cellContour, self.outputFolder)
+                self.add_data_to_table_roi(self.visibilityGraphsOther, self.keyName, self.outputFolder)
+        elif self.numberOfWorkers > 1:
+            self.create_graphs_of_folder_in_parallel()
+        else:
+            if self.roiInput == False:
+                graphIndex = 1
+                self.visibilityGraphsOther = {}
+                for fileIndex, file in enumerate(self.fileList):
+                    check_cancelled()
+                    self.labeledImage, self.labels = self.label_binary_image(file)
+                    show_Message("...Create visibility graph " + str(fileIndex + 1) + " of " + str(len(self.fileList)))
+                    self.visibilityGraph = self.visibility_graphs_other(self.labeledImage, self.labels, self.resolution, self.outputFolder, self.contourCache.setdefault(file, {}))
+                    graphIndex = self.add_graphs_of_image(self.visibilityGraph, file, self.labeledImage, self.labels, graphIndex)
+            else:
+                for fileIndex, file in enumerate(self.fileList):
+                    check_cancelled()
+                    self.keyName, self.cellContour = self.read_roi_file(file)
+                    show_Message("...Create visibility graph " + str(fileIndex + 1) + " of " + str(len(self.fileList)))
+                    self.visibilityGraphsOther = self.create_visibility_graph_roi(self.cellContour, self.resolution)
+                    self.add_graph_of_roi(self.visibilityGraphsOther, self.cellContour, self.keyName, file)
+
+    def create_graphs_of_folder_in_parallel(self):
+        """
+        create the visibility graphs of all images or ROIs of the folder in a process pool
+        """
+        show_Message("...Create visibility graphs of " + str(len(self.fileList)) + " files with " + str(self.numberOfWorkers) + " processes:")
+        if self.roiInput == False:
+            results = run_image_jobs(create_visibility_graphs_of_image, self.fileList, (self.resolution, self.visibilityBackend), self.numberOfWorkers)
+            # results are saved in the order of the folder, not in the order the images finished
+            graphIndex = 1
+            self.visibilityGraphsOther = {}
+            for file, result in zip(self.fileList, results):
+                check_cancelled()
+                if result is not None:
+                    self.labeledImage, self.labels, visGraphsAll, cellContoursAll, visibilityCounters = result
+                    self.save_shape_graphs(visGraphsAll, cellContoursAll, self.outputFolder)
+                    graphIndex = self.add_graphs_of_image(visGraphsAll, file, self.labeledImage, self.labels, graphIndex)
+                    self.add_visibility_counters(visibilityCounters)
+        else:
+            results = run_image_jobs(create_visibility_graph_of_roi, self.fileList, (self.resolution, self.visibilityBackend), self.numberOfWorkers)
+            for file, result in zip(self.fileList, results):
+                check_cancelled()
+                if result is not None:
+                    self.keyName, self.cellContour, self.visibilityGraphsOther, visibilityCounters = result
+                    self.add_graph_of_roi(self.visibilityGraphsOther, self.cellContour, self.keyName, file)
+                    self.add_visibility_counters(visibilityCounters)
+
+    def add_graphs_of_image(self, visGraphsAll, file, labeledImage, labels, graphIndex):
+        """
+        number the visibility graphs of one image of the folder consecutively and add them to the result table
+        """
+        labeledFile = self.plot_labeled_image(labeledImage, self.outputFolder, labels, 'folder', graphIndex)
+        if len(visGraphsAll) == 1:
+            self.visibilityGraphsOther[graphIndex] = list(visGraphsAll.values())[0]
+            self.add_data_to_table(list(visGraphsAll.values())[0], file, graphIndex, labeledFile, self.outputFolder)
+            graphIndex += 1
+        else:
+            for graph in visGraphsAll.keys():
+                self.visibilityGraphsOther[graphIndex] = visGraphsAll[graph]
+                self.add_data_to_table(visGraphsAll[graph], file, graphIndex, labeledFile, self.outputFolder)
+                graphIndex += 1
+        return(graphIndex)
+
+    def add_graph_of_roi(self, visGraph, cellContour, keyName, file):
+        """
+        save the visibility graph of one ROI file of the folder and add it to the result table
+        """
+        if len(visGraph.nodes()) > 0:
+            self.save_contour_and_graph_roi(visGraph, cellContour, self.outputFolder)
+            self.add_data_to_table_roi(visGraph, keyName, self.outputFolder)
+        else:
+            show_Message("\nWith the resolution you provided no visibility graph could be created for " + file)
+
+    def add_visibility_counters(self, visibilityCounters):
+        """
+        add the visibility test counters of a process pool worker
+        """
+        for counter in visibilityCounters:
+            self.visibilityCounters[counter] += visibilityCounters[counter]
+
+    def sweep_pixel_distances(self, pixelDistances):
+        """
+        create visibility graphs and result tables for several node distances, shape contours are extracted only once
+        """
+        outputFolder, resolution = self.outputFolder, self.resolution
+        if self.roiInput == False:
+            self.sweep_pixel_distances_of_images(pixelDistances)
+        else:
+            for pixelDistance in pixelDistances:
+                show_Message("...Node distance of " + str(pixelDistance) + " px:")
+                self.resolution = float(pixelDistance)
+                self.outputFolder = outputFolder + '/PixelDistance_' + str(pixelDistance)
+                self.prepare_output_folder()
+                self.create_graphs_and_tables()
+        self.outputFolder, self.resolution = outputFolder, resolution
+
+    def sweep_pixel_distances_of_images(self, pixelDistances):
+        """
+        create the visibility graphs of all node distances image by image and add them to the results of each node distance
+        """
+        outputFolders = [self.outputFolder + '/PixelDistance_' + str(pixelDistance) for pixelDistance in pixelDistances]
+        for outputFolder in outputFolders:
+            self.outputFolder = outputFolder
+            self.prepare_output_folder()
+        fileList = [self.selectedImage] if self.inputType == 'image' else self.fileList
+        results = None
+        # every image is labeled once for all distances, folders are shared out to the process pool image by image
+        if self.inputType != 'image' and self.numberOfWorkers > 1:
+            show_Message("...Create visibility graphs of " + str(len(fileList)) + " files with " + str(self.numberOfWorkers) + " processes:")
+            results = run_image_jobs(create_sweep_graphs_of_image, fileList, (pixelDistances, self.visibilityBackend), self.numberOfWorkers)
+        elif self.inputType == 'image':
+            show_Message("...Create visibility graphs.")
+        graphIndices = [1] * len(pixelDistances)
+        graphsOfDistances = [{} for pixelDistance in pixelDistances]
+        for fileIndex, file in enumerate(fileList):
+            check_cancelled()
+            if results is not None:
+                result = results[fileIndex]
+            else:
+                if self.inputType != 'image':
+                    show_Message("...Create visibility graph " + str(fileIndex + 1) + " of " + str(len(fileList)))
+                result = create_sweep_graphs_of_image(file, pixelDistances, self.visibilityBackend)
+            if result is None:
+                continue
+            self.labeledImage, self.labels, shapeGraphs, visibilityCounters = result
+            self.add_visibility_counters(visibilityCounters)
+            for index, (visGraphsAll, cellContoursAll) in enumerate(shapeGraphs):
+                self.outputFolder, self.resolution = outputFolders[index], float(pixelDistances[index])
+                self.visibilityGraphsOther = graphsOfDistances[index]
+                self.save_shape_graphs(visGraphsAll, cellContoursAll, self.outputFolder)
+                if self.inputType == 'image':
+                    self.visibilityGraphsOther.update(visGraphsAll)
+                    for graph in visGraphsAll.keys():
+                        self.add_data_to_table(visGraphsAll[graph], file, graph, 'LabeledShapes.png', self.outputFolder)
+                    self.plot_labeled_image(self.labeledImage, self.outputFolder, self.labels, 'image', 1)
+                else:
+                    graphIndices[index] = self.add_graphs_of_image(visGraphsAll, file, self.labeledImage, self.labels, graphIndices[index])
+
+    def label_binary_image(self, selectedImage):
+        """
+        check if input is binary image and label all objects (white)
+        """
+        rawImage = skimage.io.imread(selectedImage)
+        if len(rawImage.shape) == 2:
+            if len(np.unique(rawImage)) == 2:
+                binaryImage = rawImage > 0
+            else:
+                show_Message("Warning, the input image is not binary.")
+                binaryImage = rawImage > np.mean(rawImage)
+        else:
+            show_Message("Warning, the input image is not binary.")
+            grayImage = skimage.color.rgb2gray(rawImage)
+            binaryImage = grayImage > 0.5
+        if (1 in binaryImage[0, :]) or (1 in binaryImage[-1, :]) or (1 in binaryImage[:, 0]) or (1 in binaryImage[:, -1]):
+            binaryImage = np.pad(binaryImage, pad_width=3, mode='constant', constant_values=0)
+        labeledImage, labels = sp.ndimage.label(binaryImage, np.ones((3,3)))
+        return(labeledImage, labels)
+
+    def read_roi_file(self, filename):
+        """
+        read roi file and return corresponding x/y coordinates
+        """
+        fileType = filename.split('/')[-1].split('.')[-1]
+        if fileType == 'roi' or fileType == 'ROI':
+            keyName = filename.split('/')[-1].split('.')[0]
+            roiFile = read_roi.read_roi_file(filename)
+            xCoordinates = roiFile[keyName]['x']
+            yCoordinates = roiFile[keyName]['y']
+            cellContour = np.array(list(zip(xCoordinates, yCoordinates)))
+            return(keyName, cellContour)
+        else:
+            show_Warning("The folder you chose, inludes ROI files and other file types. Please remove files which are not ROI files for the analysis.")
+
+    def save_contour_and_graph_roi(self, visGraph, cellContour, outputFolder):
+        """
+        save the visibility graph and cell contour extracted from ROI file
+        """
+        if len(cellContour) != 0:
+            cellContoursPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
+            pickle.dump(cellContour, cellContoursPickle)
+            cellContoursPickle.close()
+        if len(visGraph.nodes()) != 0:
+            visGraphsPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
+            pickle.dump(visGraph, visGraphsPickle)
+            visGraphsPickle.close()
+
+    def visibility_graphs_other(self, labeledImage, labels, resolution, outputFolder, contourCache=None):
+        """
+        create and save a visibility graph for all cells, contours found in the cache are not extracted again
+        """
+        visGraphsAll, cellContoursAll = self.create_shape_graphs(labeledImage, labels, resolution, contourCache)
+        self.save_shape_graphs(visGraphsAll, cellContoursAll, outputFolder)
+        return(visGraphsAll)
+
+    def create_shape_graphs(self, labeledImage, labels, resolution, contourCache=None):
+        """
+        create a visibility graph for all cells, shapes without a graph are skipped
+        """
+        visGraphsAll = {}
+        cellContoursAll = {}
+        for label in range(1, labels+1):
+            check_cancelled()
+            show_Message("......Graph " + str(label) + " of " + str(labels))
+            visGraph, cellContour = self.create_visibility_graph(labeledImage, label, resolution, contourCache)
+            if visGraph != None:
+                visGraphsAll[label] = visGraph
+                cellContoursAll[label] = cellContour
+        return(visGraphsAll, cellContoursAll)
+
+    def save_shape_graphs(self, visGraphsAll, cellContoursAll, outputFolder):
+        """
+        append the visibility graphs and contours of all cells to the output files
+        """
+        for label in visGraphsAll.keys():
+            visGraphsOtherPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
+            pickle.dump(visGraphsAll[label], visGraphsOtherPickle)
+            visGraphsOtherPickle.close()
+            cellContoursOtherPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
+            pickle.dump(cellContoursAll[label], cellContoursOtherPickle)
+            cellContoursOtherPickle.close()
+
+    def create_visibility_graph(self, labeledImage, label, resolution, contourCache=None):
+        """
+        create visibility graph from cell contour
+        """
+        visGraph = nx.Graph()
+        if contourCache is None:
+            contourCache = {}
+        if label not in contourCache:
+            contourCache[label] = self.extract_cell_contour(label, labeledImage)[1]
+        cellContourOrdered = contourCache[label]
+        if len(cellContourOrdered) != 0:
+            pixelsOnContour = interpolate_contour_pixels(cellContourOrdered, resolution)
+            if len(pixelsOnContour) != 0 and len(pixelsOnContour) >= 4:
+                for key in pixelsOnContour:
+                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
+                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
+            else:
+                visGraph, cellContourOrdered = None, None
+        else:
+            visGraph, cellContourOrdered = None, None
+        return(visGraph, cellContourOrdered)
+
+    def create_visibility_graph_roi(self, cellContour, resolution):
+        """
+        create visibility graph from cell contour
+        """
+        visGraph = nx.Graph()
+        if len(cellContour) != 0:
+            pixelsOnContour = interpolate_contour_pixels(cellContour, resolution)
+            if len(pixelsOnContour) != 0 and len(pixelsOnContour) >= 4:
+                for key in pixelsOnContour:
+                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
+                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
+        return(visGraph)
+
+    def get_label_geometry(self, labeledImage):
+        """
+        return the label geometry of the labeled image, computed once per image
+        """
+        labelGeometry = getattr(self, 'labelGeometry', None)
+        if labelGeometry is None or labelGeometry.labeledImage is not labeledImage:
+            labelGeometry = LabelGeometry(labeledImage)
+            self.labelGeometry = labelGeometry
+        return(labelGeometry)
+
+    def extract_cell_contour(self, label, labeledImage):
+        """
+        extract the contour of a specified cell, the contour image is cropped to the bounding box of the cell
+        """
+        labelGeometry = self.get_label_geometry(labeledImage)
+        cellImage, offset = labelGeometry.crop(label, pad=2)
+        if len(cellImage) == 0:
+            return(invert(cellImage), [])
+        if labelGeometry.touches_border(label):
+            # shapes on the image border are buffered, their contour keeps the coordinates of the buffered image
+            cellImage = np.pad(cellImage, pad_width=2, mode='constant', constant_values=0)
+        contourImage = invert(cellImage)
+        cellContour = find_contour_of_object(cellImage)
+        cellContourOrdered = marching_squares(cellContour, cellImage)
+        for xPos, yPos in cellContourOrdered:
+            contourImage[xPos, yPos] = 1
+        if len(cellContourOrdered) != 0:
+            cellContourOrdered = cellContourOrdered + offset
+        return(contourImage, cellContourOrdered)
+
+    def add_edges_to_visGraph(self, pixelsOnContour, visGraph):
+        """
+        add edge to visGraph if the edge between two nodes lies inside the cell (concave)
+        """
+        visGraph = add_visibility_edges(pixelsOnContour, visGraph, self.visibilityBackend, self.visibilityCounters)
+        return(visGraph)
+
+    def add_data_to_table(self, visGraph, file, index, labeledFile, outputFolder):
+        """
+        summarize all results in a table
+        """
+        fileName = file.split('/')[-1]
+        sigma = self.compute_graph_complexity(visGraph)
+        dataAppend = [fileName, labeledFile, index, visGraph.number_of_nodes(), visGraph.number_of_edges(), sigma]
+        self.shapeResultsTable.loc[0] = dataAppend
+        if not os.path.isfile(outputFolder + '/ShapeResultsTable.csv'):
+            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
+        else:
+            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
+
+    def add_data_to_table_roi(self, visGraph, filename, outputFolder):
+        """
+        summarize all results in a table
+        """
+        sigma = self.compute_graph_complexity(visGraph)
+        dataAppend = [filename, visGraph.number_of_nodes(), visGraph.number_of_edges(), sigma]
+        self.shapeResultsTable.loc[0] = dataAppend
+        if not os.path.isfile(outputFolder + '/ShapeResultsTable.csv'):
+            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
+        else:
+            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
+
+    def compute_graph_complexity(self, visGraph):
+        """
+        compute the complexity of the graph using the relative density of the clique
+        """
+        edgesCompleteGraph = (visGraph.number_of_nodes() * (visGraph.number_of_nodes() - 1)) * 0.5
+        delta = visGraph.number_of_edges() / edgesCompleteGraph
+        return(delta)
+
+    def plot_labeled_image(self, labeledImage, outputFolder, labels, fileType, index):
+        """
+        plot the labeled image with labels
+        """
+        textPositions = []
+        textString = []
+        labelGeometry = self.get_label_geometry(labeledImage)
+        for idx in range(1, labels + 1):
+            cmx, cmy = labelGeometry.centroid(idx)
+            textPositions.append([cmx, cmy])
+            graphNumber = idx + index - 1
+            textString.append(str(graphNumber))
+
+        fig, axs = plt.subplots(1, 1, figsize=(10, 10))
+        plt.imshow(labeledImage, cmap='viridis')
+        axs.axes.get_yaxis().set_visible(False)
+        axs.axes.get_xaxis().set_visible(False)
+        for idx in range(len(textString)):
+            plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='white')
+        if fileType == 'image':
+            fig.savefig(outputFolder + '/LabeledShapes.png', bbox_inches='tight', dpi=300)
+        else:
+            fig.savefig(outputFolder + '/LabeledShapes_' + str(index) + '.png', bbox_inches='tight', dpi=300)
+            return('LabeledShapes_' + str(index) + '.png')
+
+class Comparison:
+
+    def __init__(self, outputFolder, pathToVisibilityGraphs, entries, plotPCA, plotDendrogram):
+        self.pathToVisibilityGraphs = list(pathToVisibilityGraphs.values())
+        if len(entries) != 0:
+            self.inputLabels = []
+            for key in entries.keys():
+                if isinstance(entries[key], str):
+                    self.inputLabels.append(entries[key])
+                else:
+                    self.inputLabels.append(entries[key].get())
+        self.outputFolder = outputFolder
+
+        self.plotPCA = plotPCA
+        self.plotDendrogram = plotDendrogram
+        self.resultsTable = pd.DataFrame(columns=['File', 'Graph', 'Label', 'Color'])
+        self.colorList = ['#0077bb', '#ee3377', '#ee7733', '#009988', '#33bbee', '#cc3311', '#bbbbbb']
+
+        self.visibilityGraphsAll = []
+        if len(self.pathToVisibilityGraphs) == 1:
+            self.visibilityGraphs = {}
+            graphCounter = 1
+            with open(self.pathToVisibilityGraphs[0], 'rb') as pickleFile:
+                try:
+                    while True:
+                        obj = pickle.load(pickleFile)
+                        try:
+                            items = obj.items()
+                            self.visibilityGraphs = obj
+                        except (AttributeError, TypeError):
+                            self.visibilityGraphs[graphCounter] = obj
+                            graphCounter += 1
+                except EOFError:
+                    pass
+            self.inputLabels = np.arange(1, len(self.visibilityGraphs) + 1, 1)
+            for indexKey, key in enumerate(self.visibilityGraphs.keys()):
+                self.visibilityGraphsAll.append(self.visibilityGraphs[key])
+                dataAppend = [self.pathToVisibilityGraphs[0].split('/')[-1], indexKey+1, indexKey+1, 'gray']
+                self.resultsTable.loc[len(self.resultsTable)] = dataAppend
+        else:
+            for index, graphSet in enumerate(self.pathToVisibilityGraphs):
+                self.visibilityGraphs = {}
+                graphCounter = 1
+                with open(graphSet, 'rb') as pickleFile:
+                    try:
+                        while True:
+                            obj = pickle.load(pickleFile)
+                            try:
+                                items = obj.items()
+                                self.visibilityGraphs = obj
+                            except (AttributeError, TypeError):
+                                self.visibilityGraphs[graphCounter] = obj
+                                graphCounter += 1
+                    except EOFError:
+                        pass
+                for indexKey, key in enumerate(self.visibilityGraphs.keys()):
+                    self.visibilityGraphsAll.append(self.visibilityGraphs[key])
+                    dataAppend = [graphSet.split('/')[-1], indexKey+1, self.inputLabels[index], self.colorList[index]]
+                    self.resultsTable.loc[len(self.resultsTable)] = dataAppend
+
+        if len(self.visibilityGraphsAll) <= 200:
+            self.distanceMatrix = self.calculate_distance_matrix(self.visibilityGraphsAll)
+            np.save(self.outputFolder + "/distanceMatrix.npy", self.distanceMatrix)
+            self.resultsTable.to_csv(self.outputFolder + "/annotationsDistanceMatrix.csv", index=False, sep=';', decimal=',')
+            if self.plotPCA == True:
+                self.plot_PCA(self.distanceMatrix, self.resultsTable)
+            if self.plotDendrogram == True:
+                self.plot_Dendrogram(self.distanceMatrix, self.resultsTable)
+        else:
+            show_Warning("The number of graphs you selected is too large.")
+
+    def calculate_distance_matrix(self, visibilityGraphs):
+        """
+        calculate the distance matrix of the input visibility graphs
+        """
+        show_Message("...Calculate distance matrix.")
+        self.distanceMatrix = np.zeros((len(visibilityGraphs), len(visibilityGraphs)))
+        for index in range(len(visibilityGraphs)):
+            check_cancelled()
+            graph1 = visibilityGraphs[index]
+            for pair in range(len(visibilityGraphs)):
+                graph2 = visibilityGraphs[pair]
+                distance = self.calculate_Laplacian(graph1, graph2)
+                self.distanceMatrix[index, pair] = distance
+        return(self.distanceMatrix)
+
+    def calculate_Laplacian(self, graph1, graph2):
+        """
+        calculate the distance between two graphs using the Kolmogorov-Smirnov statistic of the eigenvalue distributions of the Laplacian matrices
+        """
+        laplacianGraph1 = laplacian_matrix(graph1).toarray()
+        laplacianGraph2 = laplacian_matrix(graph2).toarray()
+        eigenvaluesGraph1 = np.linalg.eig(laplacianGraph1)[0]
+        normalizedEigenvaluesGraph1 = eigenvaluesGraph1 / np.max(eigenvaluesGraph1)
+        eigenvaluesGraph2 = np.linalg.eig(laplacianGraph2)[0]
+        normalizedEigenvaluesGraph2 = eigenvaluesGraph2 / np.max(eigenvaluesGraph2)
+        distance = sp.stats.ks_2samp(normalizedEigenvaluesGraph1, normalizedEigenvaluesGraph2)[0]
+        return(distance)
+
+    def plot_PCA(self, distanceMatrix, resultsTable):
+        """
+        plot a PCA from the provided distance matrix and labels
+        """
+        if resultsTable['Label'].dtype == 'float':
+            labels = [int(element) for element in resultsTable['Label']]
+        else:
+            labels = list(resultsTable['Label'])
+        colors = resultsTable['Color']
+        pca = sklearn.decomposition.PCA(n_components=2)
+        principalComponents = pca.fit_transform(distanceMatrix)
+
+        fig, ax = plt.subplots(1, 1, figsize=(10, 10))
+        ax.set_xlabel('PC1 (' + str(np.round(pca.explained_variance_ratio_[0] * 100, 1)) + '%)')
+        ax.set_ylabel('PC2 (' + str(np.round(pca.explained_variance_ratio_[1] * 100, 1)) + '%)')
+        if len(np.unique(colors)) == 1:
+            ax.scatter(principalComponents[:, 0], principalComponents[:, 1], c=colors, s=50, marker='o')
+            for index, text in enumerate(labels):
+                ax.annotate(text, (principalComponents[index][0]+0.03, principalComponents[index][1]))
+        else:
+            start, stop  = 0, 0
+            for index, color in enumerate(np.unique(colors)):
+                stop = len(resultsTable[resultsTable['Color'] == color]) + stop
+                selectedPC1, selectedPC2 = principalComponents[start:stop, 0], principalComponents[start:stop, 1]
+                ax.scatter(selectedPC1, selectedPC2, c=color, s=50, marker='o', label=labels[start])
+                start += len(resultsTable[resultsTable['Color'] == color])
+            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), fancybox=True, shadow=True, ncol=5)
+        fig.savefig(self.outputFolder + '/PCA_DistanceMatrix.png', bbox_inches='tight', dpi=300)
+
+    def plot_Dendrogram(self, distanceMatrix, resultsTable):
+        """
+        plot the dendrogram of the calculated distance matrix using complete linkage hierarchical clustering
+        """
+        if resultsTable['Label'].dtype == 'float':
+            labels = [int(element) for element in resultsTable['Label']]
+        else:
+            labels = list(resultsTable['Label'])
+        upperTriangle = sp.spatial.distance.squareform(distanceMatrix)
+        linked = sp.cluster.hierarchy.linkage(upperTriangle, 'complete')
+
+        fig = plt.figure(figsize=(5, 3))
+        sp.cluster.hierarchy.dendrogram(linked, orientation='top', labels=labels, distance_sort='descending', show_leaf_counts=True)
+        plt.xticks(fontsize=7, rotation=45)
+        plt.yticks(fontsize=7)
+        fig.savefig(self.outputFolder + '/Dendrogram_DistanceMatrix.png', bbox_inches='tight', dpi=300)
+
+class BoundaryIndex(object):
+    """
+    uniform grid over the boundary segments of a polygon to decide most line visibility tests without a DE-9IM relation
+    """
+
+    def __init__(self, Polygon, Boundary, cellSize=None):
+        self.Polygon = Polygon
+        self.Boundary = Boundary
+        self.preparedPolygon = shapely.prepared.prep(Polygon)
+        boundaryCoordinates = np.asarray(Boundary.coords, dtype=float)
+        self.segmentStarts, self.segmentEnds = boundaryCoordinates[:-1], boundaryCoordinates[1:]
+        self.origin = np.min(boundaryCoordinates, axis=0)
+        extent = np.max(boundaryCoordinates, axis=0) - self.origin
+        if cellSize is None:
+            segmentLengths = np.sqrt(np.sum((self.segmentEnds - self.segmentStarts) ** 2, axis=1))
+            cellSize = max(4 * np.mean(segmentLengths), np.max(extent) / 64, 1)
+        self.cellSize = float(cellSize)
+        self.gridShape = tuple((np.floor(extent / self.cellSize).astype(int) + 1).tolist())
+        # every segment is registered in the cells of its bounding box and their neighbours
+        cells, segments = [], []
+        lowerCells = np.maximum(self.cell_of(np.minimum(self.segmentStarts, self.segmentEnds)) - 1, 0)
+        upperCells = np.minimum(self.cell_of(np.maximum(self.segmentStarts, self.segmentEnds)) + 1, np.asarray(self.gridShape) - 1)
+        for segment, (lowerCell, upperCell) in enumerate(zip(lowerCells, upperCells)):
+            xCells, yCells = np.arange(lowerCell[0], upperCell[0] + 1), np.arange(lowerCell[1], upperCell[1] + 1)
+            segmentCells = (xCells[:, np.newaxis] * self.gridShape[1] + yCells).ravel()
+            cells.append(segmentCells)
+            segments.append(np.full(len(segmentCells), segment))
+        cells, segments = np.concatenate(cells), np.concatenate(segments)
+        order = np.argsort(cells, kind='stable')
+        self.cellSegments = segments[order]
+        self.cellStarts = np.searchsorted(cells[order], np.arange(self.gridShape[0] * self.gridShape[1] + 1))
+        self.fastAccepted = 0
+        self.fastRejected = 0
+        self.exactTests = 0
+
+    def cell_of(self, points):
+        return(np.floor((points - self.origin) / self.cellSize).astype(int))
+
+    def candidate_segments(self, starts, ends):
+        """
+        return all pairs of lines and boundary segments registered in the cells the lines pass
+        """
+        lengths = np.sqrt(np.sum((ends - starts) ** 2, axis=1))
+        numberOfSamples = np.ceil(2 * lengths / self.cellSize).astype(int) + 2
+        lines = np.repeat(np.arange(len(starts)), numberOfSamples)
+        sampleIndices = np.arange(len(lines)) - np.repeat(np.cumsum(numberOfSamples) - numberOfSamples, numberOfSamples)
+        samples = starts[lines] + (sampleIndices / (numberOfSamples[lines] - 1))[:, np.newaxis] * (ends - starts)[lines]
+        cells = self.cell_of(samples)
+        cells = np.clip(cells[:, 0], 0, self.gridShape[0] - 1) * self.gridShape[1] + np.clip(cells[:, 1], 0, self.gridShape[1] - 1)
+        # a straight line visits every cell only once, so repeated cells follow each other
+        newCell = np.ones(len(cells), dtype=bool)
+        newCell[1:] = (cells[1:] != cells[:-1]) | (lines[1:] != lines[:-1])
+        lines, cells = lines[newCell], cells[newCell]
+        counts = self.cellStarts[cells + 1] - self.cellStarts[cells]
+        offsets = np.arange(np.sum(counts)) + np.repeat(self.cellStarts[cells] - (np.cumsum(counts) - counts), counts)
+        return(np.repeat(lines, counts), self.cellSegments[offsets])
+
+    def visible_lines(self, starts, ends):
+        """
+        check for lines between boundary points if they lie inside the polygon
+        """
+        lines, segments = self.candidate_segments(starts, ends)
+        directions = ends - starts
+        sidesStart = directions[lines, 0] * (self.segmentStarts[segments, 1] - starts[lines, 1]) - directions[lines, 1] * (self.segmentStarts[segments, 0] - starts[lines, 0])
+        sidesEnd = directions[lines, 0] * (self.segmentEnds[segments, 1] - starts[lines, 1]) - directions[lines, 1] * (self.segmentEnds[segments, 0] - starts[lines, 0])
+        # only segments reaching the line through the chord can cross or touch it
+        reaching = sidesStart * sidesEnd <= 0
+        lines, segments, sidesStart, sidesEnd = lines[reaching], segments[reaching], sidesStart[reaching], sidesEnd[reaching]
+        lineStarts, lineEnds = starts[lines], ends[lines]
+        segmentStarts, segmentEnds = self.segmentStarts[segments], self.segmentEnds[segments]
+        segmentDirections = segmentEnds - segmentStarts
+        sidesLineStart = segmentDirections[:, 0] * (lineStarts[:, 1] - segmentStarts[:, 1]) - segmentDirections[:, 1] * (lineStarts[:, 0] - segmentStarts[:, 0])
+        sidesLineEnd = segmentDirections[:, 0] * (lineEnds[:, 1] - segmentStarts[:, 1]) - segmentDirections[:, 1] * (lineEnds[:, 0] - segmentStarts[:, 0])
+        crossings = (sidesStart * sidesEnd < 0) & (sidesLineStart * sidesLineEnd < 0)
+        # any other contact with the boundary than in the two end points of a line needs the exact test
+        startsAtStart, startsAtEnd = np.all(segmentStarts == lineStarts, axis=1), np.all(segmentStarts == lineEnds, axis=1)
+        endsAtStart, endsAtEnd = np.all(segmentEnds == lineStarts, axis=1), np.all(segmentEnds == lineEnds, axis=1)
+        contacts = (sidesStart == 0) & ~startsAtStart & ~startsAtEnd & is_within_bounds(segmentStarts, lineStarts, lineEnds)
+        contacts |= (sidesEnd == 0) & ~endsAtStart & ~endsAtEnd & is_within_bounds(segmentEnds, lineStarts, lineEnds)
+        contacts |= (sidesLineStart == 0) & ~startsAtStart & ~endsAtStart & is_within_bounds(lineStarts, segmentStarts, segmentEnds)
+        contacts |= (sidesLineEnd == 0) & ~startsAtEnd & ~endsAtEnd & is_within_bounds(lineEnds, segmentStarts, segmentEnds)
+        contacts |= (startsAtStart & endsAtEnd) | (startsAtEnd & endsAtStart)
+        rejected = np.bincount(lines[crossings], minlength=len(starts)) > 0
+        exact = (np.bincount(lines[contacts], minlength=len(starts)) > 0) & ~rejected
+        exact |= np.all(starts == ends, axis=1)
+        visible = np.zeros(len(starts), dtype=bool)
+        for line in np.where(exact)[0]:
+            visible[line] = is_visible_line(shapely.geometry.LineString([starts[line], ends[line]]), self.Polygon, self.Boundary)
+        # lines without any contact lie either completely inside or completely outside of the polygon
+        for line in np.where(~rejected & ~exact)[0]:
+            visible[line] = self.preparedPolygon.contains(shapely.geometry.Point((starts[line] + ends[line]) / 2))
+        self.exactTests += int(np.sum(exact))
+        self.fastAccepted += int(np.sum(visible & ~exact))
+        self.fastRejected += int(np.sum(~visible & ~exact))
+        return(visible)
+
+class CompactVisGraph(object):
+    """
+    visibility graph stored as CSR adjacency, node positions and lobe/neck labels in numpy arrays
+    """
+    lobeNeckNames = ['None', 'Lobe', 'Neck']
+
+    def __init__(self, positions, indptr, indices, lobeNeckNone=None):
+        self.positions = np.asarray(positions, dtype=np.int32).reshape(-1, 2)
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.lobeNeckNone = None if lobeNeckNone is None else np.asarray(lobeNeckNone, dtype=np.int8)
+
+    @classmethod
+    def from_visible_pairs(cls, pixelsOnContour, visiblePairs):
+        """
+        fill the CSR adjacency directly from the contour nodes and their visible node pairs
+        """
+        numberOfNodes = len(pixelsOnContour)
+        positions = np.asarray([pixelsOnContour[node] for node in range(numberOfNodes)]).reshape(-1, 2)
+        edges = np.sort(np.asarray(list(visiblePairs), dtype=np.int64).reshape(-1, 2), axis=1)
+        # pairs are undirected, so each edge is stored once per direction like in a networkx graph
+        edges = np.unique(edges, axis=0)
+        nodes1, nodes2 = np.append(edges[:, 0], edges[:, 1]), np.append(edges[:, 1], edges[:, 0])
+        order = np.lexsort((nodes2, nodes1))
+        indptr = np.append(0, np.cumsum(np.bincount(nodes1, minlength=numberOfNodes)))
+        return(cls(positions, indptr, nodes2[order]))
+
+    def number_of_nodes(self):
+        return(len(self.positions))
+
+    def number_of_edges(self):
+        return(len(self.indices) // 2)
+
+    def edge_lengths(self):
+        """
+        recompute the edge lengths in double precision from the node positions, as stored in the networkx graphs
+        """
+        nodes1 = np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))
+        return(np.sqrt(np.sum((self.positions[nodes1].astype(np.int64) - self.positions[self.indices]) ** 2, axis=1)))
+
+    def closeness_centrality(self):
+        """
+        calculate the closeness centrality of all nodes with the edge lengths as distance like networkx does
+        """
+        numberOfNodes = self.number_of_nodes()
+        adjacency = sp.sparse.csr_matrix((self.edge_lengths(), self.indices, self.indptr), shape=(numberOfNodes, numberOfNodes))
+        distances = sp.sparse.csgraph.dijkstra(adjacency, directed=False)
+        reachable = np.isfinite(distances)
+        totalDistances = np.sum(np.where(reachable, distances, 0), axis=1)
+        reachableNodes = np.sum(reachable, axis=1) - 1
+        closenessCentrality = np.zeros(numberOfNodes)
+        connected = totalDistances > 0
+        closenessCentrality[connected] = reachableNodes[connected] / totalDistances[connected]
+        if numberOfNodes > 1:
+            closenessCentrality *= reachableNodes / (numberOfNodes - 1)
+        return(closenessCentrality)
+
+    def laplacian_matrix(self):
+        """
+        calculate the Laplacian matrix of the unweighted graph
+        """
+        numberOfNodes = self.number_of_nodes()
+        adjacency = sp.sparse.csr_matrix((np.ones(len(self.indices), dtype=int), self.indices, self.indptr), shape=(numberOfNodes, numberOfNodes))
+        return(sp.sparse.diags(np.diff(self.indptr), dtype=int) - adjacency)
+
+    def set_lobes_and_necks(self, lobeIndices, neckIndices):
+        """
+        label nodes as lobe, neck or none
+        """
+        self.lobeNeckNone = np.zeros(self.number_of_nodes(), dtype=np.int8)
+        self.lobeNeckNone[list(neckIndices)] = self.lobeNeckNames.index('Neck')
+        self.lobeNeckNone[list(lobeIndices)] = self.lobeNeckNames.index('Lobe')
+
+    def to_networkx(self):
+        """
+        build the equivalent networkx graph with pos, length and LobeNeckNone attributes
+        """
+        graph = nx.Graph()
+        positions = self.positions.astype(np.int64)
+        for node in range(self.number_of_nodes()):
+            graph.add_node(node, pos=(positions[node][0], positions[node][1]))
+        nodes1 = np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))
+        upper = nodes1 < self.indices
+        graph.add_edges_from((node1, node2, {'length': length}) for node1, node2, length in zip(nodes1[upper].tolist(), self.indices[upper].tolist(), self.edge_lengths()[upper].tolist()))
+        if self.lobeNeckNone is not None:
+            nx.set_node_attributes(graph, {node: self.lobeNeckNames[code] for node, code in enumerate(self.lobeNeckNone.tolist())}, name="LobeNeckNone")
+        return(graph)
+
+class LabelGeometry(object):
+    """
+    bounding boxes, areas and centroids of all labels of a labeled image computed in one pass
+    """
+
+    def __init__(self, labeledImage):
+        self.labeledImage = labeledImage
+        # single labels are cropped to their bounding box instead of masked in the full image
+        self.boundingBoxes = sp.ndimage.find_objects(labeledImage)
+        self.areas = np.bincount(labeledImage.ravel())
+        labels = np.arange(1, len(self.boundingBoxes) + 1)
+        self.centroids = np.asarray(sp.ndimage.center_of_mass(labeledImage > 0, labeledImage, labels), dtype=float).reshape(-1, 2)
+
+    def area(self, label):
+        """
+        return the number of pixels of a label
+        """
+        if 0 < label < len(self.areas):
+            return(int(self.areas[label]))
+        return(0)
+
+    def centroid(self, label):
+        """
+        return the center of mass of a label
+        """
+        return(self.centroids[label - 1])
+
+    def touches_border(self, label):
+        """
+        check if a label has pixels on the image border
+        """
+        boundingBox = self.boundingBoxes[label - 1]
+        return(boundingBox[0].start == 0 or boundingBox[1].start == 0 or boundingBox[0].stop == self.labeledImage.shape[0] or boundingBox[1].stop == self.labeledImage.shape[1])
+
+    def crop(self, label, pad=0):
+        """
+        return the mask of a label cropped to its bounding box plus pad pixels and the offset of the crop
+        """
+        boundingBox = self.boundingBoxes[label - 1] if 0 < label <= len(self.boundingBoxes) else None
+        if boundingBox is None:
+            return(np.zeros((0, 0), dtype=bool), np.zeros(2, dtype=int))
+        xMin, yMin = max(boundingBox[0].start - pad, 0), max(boundingBox[1].start - pad, 0)
+        xMax, yMax = min(boundingBox[0].stop + pad, self.labeledImage.shape[0]), min(boundingBox[1].stop + pad, self.labeledImage.shape[1])
+        return(self.labeledImage[xMin:xMax, yMin:yMax] == label, np.asarray([xMin, yMin]))
+
+class CoordinateIndex(object):
+    """
+    hash index of coordinates built once per contour or graph
+    """
+
+    def __init__(self, coordinates, keys=None):
+        # queries around a point cost O(k) regardless of the number of coordinates
+        self.keys = {}
+        coordinates = np.asarray(coordinates).reshape(-1, 2).tolist()
+        if keys is None:
+            keys = range(len(coordinates))
+        # the first occurrence of a coordinate is kept like in a linear scan
+        for key, (xPos, yPos) in zip(keys, coordinates):
+            self.keys.setdefault((xPos, yPos), key)
+
+    def __len__(self):
+        return(len(self.keys))
+
+    def __contains__(self, point):
+        return((point[0], point[1]) in self.keys)
+
+    def get(self, point, default=None):
+        """
+        return the key of a coordinate
+        """
+        return(self.keys.get((point[0], point[1]), default))
+
+    def find(self, point, radius, output='index'):
+        """
+        find keys or offsets of the coordinates around a point, offsets are visited in the order of the radius combinations
+        """
+        foundPositions = []
+        for xRadius, yRadius in itertools.product(radius, repeat=2):
+            key = self.keys.get((point[0] + xRadius, point[1] + yRadius))
+            if key is not None:
+                if output == 'index':
+                    foundPositions.append(key)
+                else:
+                    foundPositions.append([xRadius, yRadius])
+        return(foundPositions)
+
+class SkeletonAnalysis(object):
+    """
+    crossings, endpoints, tracked branches and branchless skeleton of a skeleton image, computed once per image
+    """
+
+    def __init__(self, skeletonImage, branchlessSkeleton=None):
+        self.skeletonImage = skeletonImage
+        skeletonImage = skeletonImage * 1
+        detectedNodes = detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
+        # only skeleton pixels are classified, other values of the skeleton image stay in the detected nodes
+        self.crossings = np.argwhere((detectedNodes == 2) & (skeletonImage == 1))
+        self.endpoints = np.argwhere((detectedNodes == 3) & (skeletonImage == 1))
+        if branchlessSkeleton is None:
+            branchlessSkeleton = detect_branches(skeletonImage, mode='remove', detectedNodes=detectedNodes)
+        self.branchlessSkeleton = branchlessSkeleton
+        self.trackedBranches = detect_branches(skeletonImage, mode='track', detectedNodes=detectedNodes) == 4
+
+    def save(self, fileName):
+        """
+        save the skeleton analysis as compressed numpy archive
+        """
+        np.savez_compressed(fileName, skeletonImage=self.skeletonImage, branchlessSkeleton=self.branchlessSkeleton, trackedBranches=self.trackedBranches, crossings=self.crossings, endpoints=self.endpoints)
+
+    @classmethod
+    def load(cls, fileName):
+        """
+        load a skeleton analysis saved with save
+        """
+        skeletonAnalysis = cls.__new__(cls)
+        with np.load(fileName) as archive:
+            for key in ['skeletonImage', 'branchlessSkeleton', 'trackedBranches', 'crossings', 'endpoints']:
+                setattr(skeletonAnalysis, key, archive[key])
+        return(skeletonAnalysis)
+
+class PackedMask(object):
+    """
+    boolean image stored with one bit per pixel, used for the intermediates of the pre-processing in low memory mode
+    """
+
+    def __init__(self, mask):
+        self.shape = mask.shape
+        self.bits = np.packbits(mask, axis=None)
+
+    def unpack(self):
+        """
+        return the boolean image
+        """
+        return(np.unpackbits(self.bits, count=int(np.prod(self.shape))).reshape(self.shape).astype(bool))
+
+    def saved_bytes(self):
+        """
+        return how many bytes less than the boolean image are stored
+        """
+        return(int(np.prod(self.shape)) - self.bits.nbytes)
+
+# version of the cached results, increase it when the results of a stage or the classes in them change
+stageCacheVersion = 1
+
+class StageCache(object):
+    """
+    folder of pickled results of the analysis stages, keyed by a hash of the input image and the parameters of every stage
+    """
+
+    def __init__(self, cacheFolder, maximumSize=2**30):
+        self.cacheFolder = cacheFolder
+        self.maximumSize = int(maximumSize)
+        if not os.path.exists(self.cacheFolder):
+            os.makedirs(self.cacheFolder, exist_ok=True)
+
+    def key(self, stage, *parameters):
+        """
+        return the key of a stage from its parameters, the keys of upstream stages are passed as parameters
+        """
+        # numpy scalars are converted to plain numbers, so equal parameters always give the same key
+        parameters = json.dumps([stageCacheVersion, stage, *parameters], sort_keys=True, default=lambda value: value.item())
+        return(stage + '-' + hashlib.sha256(parameters.encode()).hexdigest())
+
+    def file_key(self, fileName):
+        """
+        return the key of the bytes of a file
+        """
+        fileHash = hashlib.sha256()
+        with open(fileName, 'rb') as file:
+            for block in iter(lambda: file.read(2**20), b''):
+                fileHash.update(block)
+        return('file-' + fileHash.hexdigest())
+
+    def array_key(self, stage, *arrays):
+        """
+        return the key of the content of arrays
+        """
+        arrayHash = hashlib.sha256(json.dumps(stageCacheVersion).encode())
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            arrayHash.update(json.dumps([list(array.shape), array.dtype.str]).encode())
+            arrayHash.update(array.data)
+        return(stage + '-' + arrayHash.hexdigest())
+
+    def path(self, key):
+        """
+        return the file of a key in the cache folder
+        """
+        return(os.path.join(self.cacheFolder, key + '.pickle'))
+
+    def __contains__(self, key):
+        return(os.path.isfile(self.path(key)))
+
+    def get(self, key):
+        """
+        return the cached result of a key and mark it as recently used, or None if it is not cached
+        """
+        try:
+            with open(self.path(key), 'rb') as file:
+                result = pickle.load(file)
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            return(None)
+        except Exception:
+            # results that cannot be loaded are removed and computed again
+            show_Warning("The cached result " + key + " cannot be loaded and will be computed again.")
+            self.remove(key)
+            return(None)
+        return(result)
+
+    def put(self, key, result):
+        """
+        add the result of a key to the cache
+        """
+        # the file is written under a temporary name so other processes never read a partial result
+        temporaryFile, temporaryName = tempfile.mkstemp(dir=self.cacheFolder, suffix='.tmp')
+        with os.fdopen(temporaryFile, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryName, self.path(key))
+        self.evict()
+
+    def remove(self, key):
+        """
+        remove the result of a key from the cache
+        """
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        remove the least recently used results until the cache is not larger than the maximum size
+        """
+        cachedFiles = []
+        for entry in os.scandir(self.cacheFolder):
+            if entry.name.endswith('.pickle'):
+                try:
+                    fileStatus = entry.stat()
+                except FileNotFoundError:
+                    continue
+                cachedFiles.append((fileStatus.st_mtime, fileStatus.st_size, entry.name[:-len('.pickle')]))
+        cacheSize = sum(size for _, size, _ in cachedFiles)
+        for _, size, key in sorted(cachedFiles):
+            if cacheSize <= self.maximumSize:
+                break
+            self.remove(key)
+            cacheSize -= size
+
+# run an analysis on a background thread
+class AnalysisJob(object):
+
+    def __init__(self, function, *arguments):
+        """
+        progress messages and the outcome of the analysis are reported as (kind, value) events
+        """
+        self.function = function
+        self.arguments = arguments
+        self.events = queue.Queue()
+        # the analysis checks for cancellation only between cells or images
+        self.cancelEvent = threading.Event()
+        self.result = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """
+        start the analysis on the background thread
+        """
+        self.thread.start()
+        return(self)
+
+    def run(self):
+        """
+        run the analysis and report if it is done, was cancelled or failed
+        """
+        jobState.job = self
+        try:
+            self.result = self.function(*self.arguments)
+            self.report('done', self.result)
+        except AnalysisCancelled:
+            show_Message("\nAnalysis was cancelled.")
+            self.report('cancelled', None)
+        except Exception as error:
+            logging.exception("Analysis failed.")
+            self.report('failed', error)
+        finally:
+            jobState.job = None
+
+    def report(self, kind, value):
+        """
+        add an event for the thread that started the job
+        """
+        self.events.put((kind, value))
+
+    def cancel(self):
+        """
+        stop the analysis at the next cell or image
+        """
+        self.cancelEvent.set()
+
+    def is_running(self):
+        """
+        check if the analysis is still running
+        """
+        return(self.thread.is_alive())
+
+# raised at the next cell or image after a background job was cancelled
+class AnalysisCancelled(Exception):
+    pass
+
+##### general functions #####
+cellWorkerState = {}
+tileWorkerState = {}
+jobState = threading.local()
+# process pools spawn their workers, forking a process with running threads like the GUI can deadlock
+processContext = multiprocessing.get_context('spawn')
+
+def initialize_tile_worker(sharedImageName, imageShape, imageType, gaussianSigma, tubeSigma, fused):
+    """
+    attach a process pool worker to the shared image which is filtered in tiles
+    """
+    initialize_image_worker()
+    sharedImage = shared_memory.SharedMemory(name=sharedImageName)
+    tileWorkerState['sharedImage'] = sharedImage
+    tileWorkerState['image'] = np.ndarray(imageShape, dtype=imageType, buffer=sharedImage.buf)
+    tileWorkerState['sigmas'] = (gaussianSigma, tubeSigma)
+    tileWorkerState['fused'] = fused
+
+def filter_shared_tile(haloTile, innerTile):
+    """
+    filter a tile of the shared image in a process pool worker
+    """
+    gaussianSigma, tubeSigma = tileWorkerState['sigmas']
+    return(filter_tile(tileWorkerState['image'][haloTile], gaussianSigma, tubeSigma, tileWorkerState['fused'])[innerTile])
+
+def initialize_cell_worker(sharedImageName, imageShape, imageType, settings):
+    """
+    attach a process pool worker to the shared labeled image and prepare a VisGraph for single cells
+    """
+    initialize_image_worker()
+    sharedImage = shared_memory.SharedMemory(name=sharedImageName)
+    visGraph = VisGraph.__new__(VisGraph)
+    for name, value in settings.items():
+        setattr(visGraph, name, value)
+    visGraph.labeledImage = np.ndarray(imageShape, dtype=imageType, buffer=sharedImage.buf)
+    visGraph.labelGeometry = LabelGeometry(visGraph.labeledImage)
+    cellWorkerState['sharedImage'] = sharedImage
+    cellWorkerState['visGraph'] = visGraph
+
+def create_cell_results(task):
+    """
+    create the visibility graph of a single cell in a process pool worker and collect its contour and table rows
+    """
+    label, cachedContour, cachedGraph, cellJunctions = task
+    visGraph = cellWorkerState['visGraph']
+    visGraph.junctions, visGraph.junctionMap = cellJunctions, {label: range(len(cellJunctions))}
+    visGraph.contourCache = {} if cachedContour is None else {label: cachedContour}
+    visGraph.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+    visGraph.collectedOutput = []
+    if cachedGraph is None:
+        cellGraph, cellContour = visGraph.create_visibility_graph(visGraph.labeledImage, label, visGraph.resolution)
+    else:
+        cellGraph, cellContour = cachedGraph
+    visGraph.append_to_pickle(cellContour, 'cellContours.gpickle')
+    contourOutput, visGraph.collectedOutput = visGraph.collectedOutput, []
+    visGraph.add_cell_data_to_table(label - 1, cellGraph, cellContour, visGraph.labeledImage, visGraph.resolution)
+    return(cellGraph, cellContour, visGraph.contourCache[label], contourOutput, visGraph.collectedOutput, visGraph.visibilityCounters)
+
+def initialize_image_worker():
+    """
+    prepare a process pool worker for plotting and logging without the GUI
+    """
+    plt.switch_backend('Agg')
+    jobState.job = None
+    for handler in logging.getLogger().handlers[:]:
+        if not isinstance(handler, logging.StreamHandler):
+            logging.getLogger().removeHandler(handler)
+    # spawned workers start without handlers and log their progress to the console
+    if len(logging.getLogger().handlers) == 0:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def run_image_jobs(job, fileList, arguments, numberOfWorkers, maxPendingImages=None, onImageDone=None):
+    """
+    run a job for every image of a folder in a process pool and return the results in the order of the folder
+    """
+    # at most maxPendingImages images are queued at once, so finished images are reported as they complete
+    if maxPendingImages is None:
+        maxPendingImages = 2 * numberOfWorkers
+    results = [None] * len(fileList)
+    remainingFiles = iter(enumerate(fileList))
+    pending = {}
+    finished = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=numberOfWorkers, mp_context=processContext, initializer=initialize_image_worker) as executor:
+        for index, file in itertools.islice(remainingFiles, max(maxPendingImages, 1)):
+            pending[executor.submit(job, file, *arguments)] = (index, file)
+        while len(pending) > 0:
+            if is_cancelled():
+                for future in pending:
+                    future.cancel()
+                show_Message("...Waiting for " + str(sum(future.running() for future in pending)) + " running images to stop.")
+                executor.shutdown(wait=True, cancel_futures=True)
+                check_cancelled()
+            done, _ = concurrent.futures.wait(pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                index, file = pending.pop(future)
+                finished += 1
+                try:
+                    results[index] = future.result()
+                    show_Message("...Finished image " + str(finished) + " of " + str(len(fileList)) + ": " + file)
+                except Exception as error:
+                    show_Message("...Analysis of " + file + " failed: " + str(error))
+                if onImageDone is not None:
+                    onImageDone(index, file, results[index])
+                for index, file in itertools.islice(remainingFiles, 1):
+                    pending[executor.submit(job, file, *arguments)] = (index, file)
+    return(results)
+
+def analyze_pavement_cell_image(fileName, analysis, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, resolution, plotLobeOutput, visibilityBackend='vectorized', pixelDistances=None, tileSize=None, numberOfWorkers=1, lowMemory=False, fastFilter=False, stageCache=None):
+    """
+    run pre-processing and/or graph extraction of one pavement cell image in its own output folder
+    """
+    outputFolder = os.path.splitext(fileName)[0]
+    if not os.path.exists(outputFolder):
+        os.mkdir(outputFolder)
+    preprocessedImage = None
+    detectedCells = None
+    if analysis != 'Graph extraction':
+        preprocessedImage = Preprocessor(fileName, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, outputFolder, tileSize, numberOfWorkers, lowMemory, fastFilter, stageCache)
+        detectedCells = preprocessedImage.labels - 1
+    if analysis != 'Pre-processing':
+        VisGraph(fileName, preprocessedImage, plotIntermediate, resolution, outputFolder, plotLobeOutput, False, False, [fileName], visibilityBackend, pixelDistances, numberOfWorkers, stageCache)
+    return(outputFolder, detectedCells)
+
+def list_stack_frames(fileList):
+    """
+    list the frames of a time-lapse as pairs of file name and page
+    """
+    # every page of a multi-page TIFF file is a frame and other files are single frames
+    frames = []
+    for fileName in fileList:
+        numberOfPages = 1
+        if fileName.split('.')[-1] in ['tif', 'TIF', 'tiff', 'TIFF']:
+            with tifffile.TiffFile(fileName) as tiffFile:
+                numberOfPages = len(tiffFile.pages)
+        if numberOfPages > 1:
+            frames.extend((fileName, page) for page in range(numberOfPages))
+        else:
+            frames.append((fileName, None))
+    return(frames)
+
+def analyze_pavement_cell_stack(frames, outputFolder, analysis, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, resolution, plotLobeOutput, visibilityBackend='vectorized', tileSize=None, numberOfWorkers=1, lowMemory=False, fastFilter=False, stageCache=None):
+    """
+    run pre-processing and/or graph extraction of the frames of a time-lapse in their order and track the cells across frames
+    """
+    # every frame reuses the detection decisions and the skeleton of the previous frame and the graphs and table rows of its unchanged cells
+    if not os.path.exists(outputFolder):
+        os.makedirs(outputFolder)
+    priorFrame, priorGraph = None, None
+    cellTracks = []
+    trackOfLabel, numberOfTracks = {}, 0
+    for index, (fileName, page) in enumerate(frames):
+        check_cancelled()
+        show_Message("\nStart analysis of frame " + str(index + 1) + " of " + str(len(frames)) + ": " + fileName + ("" if page is None else ", page " + str(page + 1)))
+        frameFolder = outputFolder + '/Frame_' + str(index + 1)
+        if not os.path.exists(frameFolder):
+            os.mkdir(frameFolder)
+        if analysis != 'Graph extraction':
+            priorFrame = Preprocessor(fileName, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, frameFolder, tileSize, numberOfWorkers, lowMemory, fastFilter, stageCache, page, priorFrame)
+        if analysis != 'Pre-processing':
+            visGraph = VisGraph(fileName, priorFrame, plotIntermediate, resolution, frameFolder, plotLobeOutput, False, False, [fileName], visibilityBackend, None, numberOfWorkers, stageCache, priorGraph, True)
+            trackOfLabel, numberOfTracks = assign_tracks(visGraph.labels, visGraph.cellMatches, trackOfLabel, numberOfTracks)
+            cellTracks.append(create_frame_tracks(index + 1, frameFolder, visGraph.cellMatches, trackOfLabel))
+            priorGraph = visGraph
+    if len(cellTracks) != 0:
+        cellTracks = pd.concat(cellTracks).sort_values(['Track', 'Frame'])
+        cellTracks.to_csv(outputFolder + '/CellTracks.csv', index=False, sep=';', decimal=',')
+        show_Message("...Tracked " + str(numberOfTracks) + " cells across " + str(len(frames)) + " frames.")
+    return(outputFolder, numberOfTracks)
+
+def assign_tracks(labels, cellMatches, priorTrackOfLabel, numberOfTracks):
+    """
+    continue the tracks of the cells matched to the previous frame and start new tracks for all other cells
+    """
+    trackOfLabel = {}
+    for label in range(2, labels + 1):
+        priorLabel = cellMatches[label][0] if label in cellMatches else None
+        if priorLabel in priorTrackOfLabel:
+            trackOfLabel[label] = priorTrackOfLabel[priorLabel]
+        else:
+            numberOfTracks += 1
+            trackOfLabel[label] = numberOfTracks
+    return(trackOfLabel, numberOfTracks)
+
+def create_frame_tracks(frame, frameFolder, cellMatches, trackOfLabel):
+    """
+    combine the tracks of the cells of a frame with their results in the shape results table of the frame
+    """
+    frameTracks = pd.DataFrame({'Track': [trackOfLabel[label] for label in trackOfLabel], 'Frame': frame, 'CellNumber': [label - 1 for label in trackOfLabel],
+                                'PreviousCellNumber': [cellMatches[label][0] - 1 if label in cellMatches else np.nan for label in trackOfLabel],
+                                'Unchanged': [label in cellMatches and cellMatches[label][1] for label in trackOfLabel]})
+    shapeResults = pd.read_csv(frameFolder + '/ShapeResultsTable.csv', sep=';', decimal=',')
+    return(frameTracks.merge(shapeResults, on='CellNumber', how='left'))
+
+def create_visibility_graphs_of_image(file, resolution, visibilityBackend):
+    """
+    label a binary image and create the visibility graphs of all its shapes in a process pool worker
+    """
+    visGraphOther = VisGraphOther.__new__(VisGraphOther)
+    visGraphOther.visibilityBackend = visibilityBackend
+    visGraphOther.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+    labeledImage, labels = visGraphOther.label_binary_image(file)
+    visGraphsAll, cellContoursAll = visGraphOther.create_shape_graphs(labeledImage, labels, resolution)
+    return(labeledImage, labels, visGraphsAll, cellContoursAll, visGraphOther.visibilityCounters)
+
+def create_sweep_graphs_of_image(file, pixelDistances, visibilityBackend):
+    """
+    label a binary image once and create the visibility graphs of all its shapes for every node distance
+    """
+    visGraphOther = VisGraphOther.__new__(VisGraphOther)
+    visGraphOther.visibilityBackend = visibilityBackend
+    visGraphOther.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+    labeledImage, labels = visGraphOther.label_binary_image(file)
+    contourCache = {}
+    shapeGraphs = []
+    for pixelDistance in pixelDistances:
+        show_Message("...Node distance of " + str(pixelDistance) + " px:")
+        shapeGraphs.append(visGraphOther.create_shape_graphs(labeledImage, labels, float(pixelDistance), contourCache))
+    return(labeledImage, labels, shapeGraphs, visGraphOther.visibilityCounters)
+
+def create_visibility_graph_of_roi(file, resolution, visibilityBackend):
+    """
+    read a ROI file and create its visibility graph in a process pool worker
+    """
+    visGraphOther = VisGraphOther.__new__(VisGraphOther)
+    visGraphOther.visibilityBackend = visibilityBackend
+    visGraphOther.visibilityCounters = {'fastAccepted': 0, 'fastRejected': 0, 'exactTests': 0}
+    keyName, cellContour = visGraphOther.read_roi_file(file)
+    visGraph = visGraphOther.create_visibility_graph_roi(cellContour, resolution)
+    return(keyName, cellContour, visGraph, visGraphOther.visibilityCounters)
+
+def show_Message(msg):
+    logging.info(msg)
+    report_progress(msg)
+
+def show_Warning(msg):
+    logging.warning(msg)
+
+def report_progress(msg):
+    """
+    report a progress message to the background job running on this thread
+    """
+    job = getattr(jobState, 'job', None)
+    if job is not None:
+        job.report('progress', msg)
+
+def is_cancelled():
+    """
+    check if the background job running on this thread was cancelled
+    """
+    job = getattr(jobState, 'job', None)
+    return(job is not None and job.cancelEvent.is_set())
+
+def check_cancelled():
+    """
+    stop the analysis if the background job running on this thread was cancelled
+    """
+    if is_cancelled():
+        raise AnalysisCancelled()
+
+def keep_labels_on_border(labeledImage):
+    """
+    modified version of skimage.segmentation.clear_border to keep only labels touching the image border
+    """
+    image = labeledImage
+    # create borders with buffer_size
+    borders = np.zeros_like(image, dtype=np.bool_)
+    ext = 1
+    slstart = slice(ext)
+    slend   = slice(-ext, None)
+    slices  = [slice(s) for s in image.shape]
+    for d in range(image.ndim):
+        slicedim = list(slices)
+        slicedim[d] = slstart
+        borders[tuple(slicedim)] = True
+        slicedim[d] = slend
+        borders[tuple(slicedim)] = True
+
+    labels = skimage.measure.label(image, background=0)
+    number = np.max(labeledImage) + 1
+    # determine all objects that are connected to borders
+    borders_indices = np.unique(labeledImage[borders])
+    indices = np.arange(number + 1)
+    # mask all label indices that are not connected to borders
+    label_mask = ~np.in1d(indices, borders_indices)
+    mask = label_mask[labeledImage.ravel()].reshape(labeledImage.shape)
+    image[mask] = 0
+    return(image)
+
+def find_edge_contour(image):
+    """
+    extract contour of artificial edges
+    """
+    # add buffer to image to detect contour also on borders
+    bufferedImage = skimage.util.pad(image, pad_width=2, mode='constant')
+    edgeContour = find_contour_of_object(bufferedImage)
+    return(edgeContour)
+
+def find_contour_of_object(cellObject):
+    """
+    find contour of an object: background pixels 4-connected to the object and object pixels on the image border
+    """
+    coord = np.transpose(np.where(cellObject != 0))
+    lenX, lenY = cellObject.shape[0] - 1, cellObject.shape[1] - 1
+    onBorder = (coord[:, 0] == 0) | (coord[:, 0] == lenX) | (coord[:, 1] == 0) | (coord[:, 1] == lenY)
+    interior = coord[~onBorder]
+    candidates = [coord[onBorder]]
+    pixelOrder = [np.flatnonzero(onBorder)]
+    neighborOrder = [np.zeros(np.count_nonzero(onBorder), dtype=int)]
+    # up, left, right and down neighbors are visited in this order for every object pixel
+    for neighbor, (xShift, yShift) in enumerate([(-1, 0), (0, -1), (0, 1), (1, 0)]):
+        neighbors = interior + [xShift, yShift]
+        background = cellObject[neighbors[:, 0], neighbors[:, 1]] == 0
+        candidates.append(neighbors[background])
+        pixelOrder.append(np.flatnonzero(~onBorder)[background])
+        neighborOrder.append(np.full(np.count_nonzero(background), neighbor))
+    candidates = np.concatenate(candidates)
+    if len(candidates) == 0:
+        return(np.asarray([]))
+    # contour pixels are ordered by their first occurrence when scanning the object row by row
+    candidates = candidates[np.lexsort((np.concatenate(neighborOrder), np.concatenate(pixelOrder)))]
+    linearIndices = candidates[:, 0] * cellObject.shape[1] + candidates[:, 1]
+    firstOccurrences = np.sort(np.unique(linearIndices, return_index=True)[1])
+    return(candidates[firstOccurrences])
+
+def bounds(x,xmin,xmax):
+    """
+    define bounds of image window
+    """
+    if (x <= xmin): #if x is smaller than xmin, set x to xmin
+        x = xmin
+    elif ( x >= xmax):   #if x is larger than xmax, set x to xmax
+        x = xmax
+    return(x)
+
+def contour_orientations(image, coordinates):
+    """
+    define the orientations (left, right, top, bottom) of the pixel windows of all contour pixels
+    """
+    # a side of the window is an orientation if its three pixels are not zero
+    xPos, yPos = coordinates[:, 0], coordinates[:, 1]
+    windows = image[xPos[:, None, None] + np.arange(-1, 2)[:, None], yPos[:, None, None] + np.arange(-1, 2)] > 0
+    return(np.stack([np.all(windows[:, :, 0], axis=1), np.all(windows[:, :, 2], axis=1), np.all(windows[:, 0, :], axis=1), np.all(windows[:, 2, :], axis=1)], axis=1))
+
+def measure_intensity_along_contour(image, coordinates, orientations):
+    """
+    measure intensity along contour to detect intensity gradients
+    """
+    lx, ly = image.shape[0] - 1, image.shape[1] - 1
+    xPos, yPos = coordinates[:, 0], coordinates[:, 1]
+    # the intensity profiles of at most 11 pixels are clipped at the last row and column and have to be longer than 5 pixels
+    longProfiles = np.stack([yPos >= 5, ly - yPos >= 6, xPos >= 5, lx - xPos >= 6], axis=1)
+    correctedPixels = np.zeros(len(coordinates), dtype=bool)
+    for orient, (xStep, yStep, crossOffsets) in enumerate(intensityProfiles):
+        selected = np.flatnonzero(orientations[:, orient] & longProfiles[:, orient])
+        crossOffsets = np.asarray(crossOffsets)
+        windowMeans = []
+        for distance in [0, 3]:
+            if xStep == 0:
+                xWindow = xPos[selected, None] + crossOffsets
+                yWindow = np.repeat(yPos[selected, None] + distance * yStep, len(crossOffsets), axis=1)
+                inWindow = xWindow < lx
+            else:
+                xWindow = np.repeat(xPos[selected, None] + distance * xStep, len(crossOffsets), axis=1)
+                yWindow = yPos[selected, None] + crossOffsets
+                inWindow = yWindow < ly
+            windowSums = np.sum(image[xWindow, yWindow].astype('int') * inWindow, axis=1)
+            windowMeans.append(windowSums / np.sum(inWindow, axis=1))
+        # a pixel is corrected if the mean intensity 3 pixels away is more than 25% of the mean intensity at the pixel
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correctedPixels[selected] |= windowMeans[1] * 100 / windowMeans[0] > 25
+    return(correctedPixels)
+
+def remove_pixels_in_boxes(image, boxes):
+    """
+    set all pixels in the boxes (xmin, xmax, ymin, ymax) of the image to zero at once
+    """
+    boxes = boxes[(boxes[:, 0] < boxes[:, 1]) & (boxes[:, 2] < boxes[:, 3])]
+    if len(boxes) == 0:
+        return(image)
+    # every box adds one to the pixels it covers in the cumulative sums of its corners, only the region of the boxes is counted
+    xMin, xMax, yMin, yMax = boxes[:, 0].min(), boxes[:, 1].max(), boxes[:, 2].min(), boxes[:, 3].max()
+    boxes = boxes - [xMin, xMin, yMin, yMin]
+    coverage = np.zeros((xMax - xMin + 1, yMax - yMin + 1), dtype=np.int32)
+    np.add.at(coverage, (boxes[:, 0], boxes[:, 2]), 1)
+    np.add.at(coverage, (boxes[:, 0], boxes[:, 3]), -1)
+    np.add.at(coverage, (boxes[:, 1], boxes[:, 2]), -1)
+    np.add.at(coverage, (boxes[:, 1], boxes[:, 3]), 1)
+    coverage = np.cumsum(np.cumsum(coverage, axis=0), axis=1)
+    image[xMin:xMax, yMin:yMax][coverage[:-1, :-1] > 0] = 0
+    return(image)
+
+# images with a side longer than twice this size are searched for artificial edges in a downsampled image first
+houghImageSize = 1024
+# orientations of the contour pixels are ordered left, right, top, bottom
+# step of the intensity profile away from the contour pixel and offsets of the pixels across the profile for every orientation
+intensityProfiles = [(0, -1, [-1, 0, 1]), (0, 1, [0, 1]), (-1, 0, [-1, 0, 1]), (1, 0, [-1, 0, 1])]
+# offsets (xmin, xmax, ymin, ymax) of the periphery which is cleaned around an edge pixel for every orientation
+peripheryOffsets = np.array([[-1, 2, -20, 1], [-1, 2, -1, 21], [-20, 1, -1, 2], [-1, 21, -1, 2]])
+
+def detect_lines_coarse_to_fine(binaryImage, threshold, lineLength, maximumSize=1024, numberOfStrips=10):
+    """
+    detect straight edges of a binary image with Sobel filter and probabilistic Hough lines, searching a downsampled image first
+    """
+    # candidate lines are searched in the image downsampled by a power of two to at most maximumSize pixels
+    factor = 2 ** int(np.ceil(np.log2(max(max(binaryImage.shape) / maximumSize, 1))))
+    paddedImage = np.pad(binaryImage, [(0, -binaryImage.shape[0] % factor), (0, -binaryImage.shape[1] % factor)])
+    coarseImage = paddedImage.reshape(paddedImage.shape[0] // factor, factor, paddedImage.shape[1] // factor, factor).any(axis=(1, 3))
+    # downsampled edges are stepped, a gap of one pixel keeps them in one candidate line
+    coarseLines = skimage.transform.probabilistic_hough_line(skimage.filters.sobel(coarseImage), threshold=max(threshold // factor, 5), line_length=max(lineLength // factor, 5), line_gap=1)
+    coarseLines = sorted(coarseLines, key=lambda line: -np.hypot(line[1][0] - line[0][0], line[1][1] - line[0][1]))
+    # the strips also cover parts of the edge which the candidate line missed
+    margin = lineLength // 2 + factor
+    # candidates are confirmed in full resolution strips, the full image is only searched if no candidate is confirmed
+    for (yStart, xStart), (yEnd, xEnd) in coarseLines[:numberOfStrips]:
+        xMin, xMax = max(min(xStart, xEnd) * factor - margin, 0), min((max(xStart, xEnd) + 1) * factor + margin, binaryImage.shape[0])
+        yMin, yMax = max(min(yStart, yEnd) * factor - margin, 0), min((max(yStart, yEnd) + 1) * factor + margin, binaryImage.shape[1])
+        stripLines = skimage.transform.probabilistic_hough_line(skimage.filters.sobel(binaryImage[xMin:xMax, yMin:yMax]), threshold=threshold, line_length=lineLength, line_gap=0)
+        if len(stripLines) > 0:
+            return([((y0 + yMin, x0 + xMin), (y1 + yMin, x1 + xMin)) for (y0, x0), (y1, x1) in stripLines])
+    return(skimage.transform.probabilistic_hough_line(skimage.filters.sobel(binaryImage), threshold=threshold, line_length=lineLength, line_gap=0))
+
+def tube_filter(image, sigma, dtype='int'):
+    """
+    enhance tube-like structures
+    """
+    imR = tube_response(image, sigma)
+    imT = 255.0 * (imR - imR.min()) / (imR.max() - imR.min())
+    imT = imT.astype(dtype)
+    return(imT)
+
+def tube_response(image, sigma):
+    """
+    calculate the negative smaller eigenvalue of the Hessian matrix, which is large for tube-like structures
+    """
+    if Version(skimage.__version__) < Version('0.14'):
+        imH=skimage.feature.hessian_matrix(image, sigma=sigma, mode='reflect')
+        imM=skimage.feature.hessian_matrix_eigvals(imH[0], imH[1], imH[2])
+    else:
+        imH=skimage.feature.hessian_matrix(image, sigma=sigma, mode='reflect', order='xy')
+        imM=skimage.feature.hessian_matrix_eigvals(imH)
+    imR = -1.0 * imM[1]
+    return(imR)
+
+def fused_tube_filter(image, gaussianSigma, tubeSigma, dtype='int'):
+    """
+    smooth the image and enhance tube-like structures with the fused tube response
+    """
+    imR = fused_tube_response(image, gaussianSigma, tubeSigma)
+    imT = 255.0 * (imR - imR.min()) / (imR.max() - imR.min())
+    imT = imT.astype(dtype)
+    return(imT)
+
+def fused_tube_response(image, gaussianSigma, tubeSigma):
+    """
+    calculate the tube response of the smoothed image in 32-bit floats
+    """
+    # the gaussian smoothing and the smoothing of the Hessian matrix are fused, two gaussian filters equal one gaussian filter with the combined sigma
+    smoothedImage = sp.ndimage.gaussian_filter(skimage.img_as_float32(image), sigma=math.hypot(gaussianSigma, tubeSigma), mode='reflect')
+    gradientRows, gradientColumns = np.gradient(smoothedImage)
+    hessianRR = np.gradient(gradientRows, axis=0)
+    hessianRC = np.gradient(gradientRows, axis=1)
+    del gradientRows
+    hessianCC = np.gradient(gradientColumns, axis=1)
+    del gradientColumns
+    # smaller eigenvalue of the Hessian matrix in closed form
+    imR = np.sqrt((0.5 * (hessianRR - hessianCC)) ** 2 + hessianRC ** 2) - 0.5 * (hessianRR + hessianCC)
+    return(imR)
+
+def filter_tile(image, gaussianSigma, tubeSigma, fused=False):
+    """
+    smooth an image tile and calculate its tube response
+    """
+    if fused:
+        return(fused_tube_response(image, gaussianSigma, tubeSigma))
+    gaussianImage = skimage.filters.gaussian(image, sigma=gaussianSigma)
+    return(tube_response(gaussianImage, tubeSigma))
+
+def split_image_into_tiles(imageShape, tileSize, halo):
+    """
+    split an image into tiles of at most tileSize x tileSize pixels
+    """
+    # every tile is returned as the slices of the tile, of the tile with its halo and of the tile within the haloed tile
+    tiles = []
+    for xStart in range(0, imageShape[0], tileSize):
+        for yStart in range(0, imageShape[1], tileSize):
+            xEnd, yEnd = min(xStart + tileSize, imageShape[0]), min(yStart + tileSize, imageShape[1])
+            xMin, yMin = max(xStart - halo, 0), max(yStart - halo, 0)
+            xMax, yMax = min(xEnd + halo, imageShape[0]), min(yEnd + halo, imageShape[1])
+            tiles.append(((slice(xStart, xEnd), slice(yStart, yEnd)), (slice(xMin, xMax), slice(yMin, yMax)), (slice(xStart - xMin, xEnd - xMin), slice(yStart - yMin, yEnd - yMin))))
+    return(tiles)
+
+def filter_tiles(image, tiles, gaussianSigma, tubeSigma, numberOfWorkers=1, fused=False):
+    """
+    yield the index and tube response of every tile
+    """
+    if numberOfWorkers <= 1:
+        for index, (tile, haloTile, innerTile) in enumerate(tiles):
+            check_cancelled()
+            yield(index, filter_tile(image[haloTile], gaussianSigma, tubeSigma, fused)[innerTile])
+        return
+    # more workers filter the tiles in a process pool sharing the image
+    remainingTiles = iter(enumerate(tiles))
+    pending = {}
+    sharedImage = shared_memory.SharedMemory(create=True, size=max(image.nbytes, 1))
+    try:
+        np.ndarray(image.shape, dtype=image.dtype, buffer=sharedImage.buf)[...] = image
+        with concurrent.futures.ProcessPoolExecutor(max_workers=numberOfWorkers, mp_context=processContext, initializer=initialize_tile_worker,
+                                                    initargs=(sharedImage.name, image.shape, image.dtype.str, gaussianSigma, tubeSigma, fused)) as executor:
+            # at most two tiles per worker are queued, so finished tiles do not pile up in memory
+            for index, (tile, haloTile, innerTile) in itertools.islice(remainingTiles, 2 * numberOfWorkers):
+                pending[executor.submit(filter_shared_tile, haloTile, innerTile)] = index
+            while len(pending) > 0:
+                if is_cancelled():
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    check_cancelled()
+                done, _ = concurrent.futures.wait(pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield(pending.pop(future), future.result())
+                    for index, (tile, haloTile, innerTile) in itertools.islice(remainingTiles, 1):
+                        pending[executor.submit(filter_shared_tile, haloTile, innerTile)] = index
+    finally:
+        sharedImage.close()
+        sharedImage.unlink()
+
+def tube_filter_in_tiles(image, gaussianSigma, tubeSigma, tileSize, numberOfWorkers=1, fused=False):
+    """
+    smooth the image and enhance tube-like structures tile by tile to bound the memory for large images
+    """
+    # the result equals tube_filter of the smoothed image or fused_tube_filter of the image
+    # the halo covers both truncated gaussian kernels and the two gradients of the Hessian matrix
+    halo = int(4 * gaussianSigma + 0.5) + int(4 * tubeSigma + 0.5) + 2
+    tiles = split_image_into_tiles(image.shape, tileSize, halo)
+    show_Message("...Filter image in " + str(len(tiles)) + " tiles.")
+    minimum, maximum = np.inf, -np.inf
+    tubeImage = np.zeros(image.shape, dtype=np.uint8)
+    # tube responses are kept on disk until the range of the whole image is known
+    with tempfile.TemporaryDirectory() as tileFolder:
+        for index, response in filter_tiles(image, tiles, gaussianSigma, tubeSigma, numberOfWorkers, fused):
+            np.save(tileFolder + '/tile' + str(index) + '.npy', response)
+            minimum, maximum = min(minimum, response.min()), max(maximum, response.max())
+        for index, (tile, haloTile, innerTile) in enumerate(tiles):
+            response = np.load(tileFolder + '/tile' + str(index) + '.npy')
+            tubeImage[tile] = (255.0 * (response - minimum) / (maximum - minimum)).astype('int')
+    return(tubeImage)
+
+def correct_gaps_in_skeleton(skeletonImage):
+    """
+    find gaps in the skeleton and close them if the gap is small and both ends have the same direction/angle
+    """
+    skeletonImage = skeletonImage * 1
+    correctedSkeletonImage = skeletonImage.copy()
+    endpoints = detect_crossings_and_endpoints(skeletonImage, mode='endpoints', output='list')
+    if len(endpoints) != 0:
+        correctingEndpoints = find_close_endpoint_pairs(endpoints)
+        imageEndpointsCrossings = detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
+        endpointAngles = {}
+
+        for xPos, yPos in correctingEndpoints:
+            angles, rows, columns = evaluate_angle(xPos, yPos, endpoints, imageEndpointsCrossings, endpointAngles)
+            if len(angles) != 0 and (np.max(angles) - np.min(angles) < 20):
+                correctedSkeletonImage[rows, columns] = 2
+                #print("Correction added: ", str(xPos), str(yPos))
+    return(correctedSkeletonImage)
+
+def bridge_gaps_with_prior(skeletonImage, priorSkeleton, maximumLength=10):
+    """
+    close gaps between endpoints of the skeleton with short pieces of the skeleton of the previous frame
+    """
+    skeletonImage = skeletonImage * 1
+    endpoints = detect_crossings_and_endpoints(skeletonImage, mode='endpoints', output='list')
+    pieces, numberOfPieces = sp.ndimage.label(priorSkeleton & (skeletonImage == 0), np.ones((3, 3)))
+    if len(endpoints) < 2 or numberOfPieces == 0:
+        return(skeletonImage, 0)
+    # pieces of the previous skeleton in the 8-neighbourhood of every endpoint
+    lenX, lenY = skeletonImage.shape
+    neighbours = endpoints[:, None, :] + np.asarray(neighbourOffsets)[None, :, :]
+    insideImage = (neighbours[..., 0] >= 0) & (neighbours[..., 0] < lenX) & (neighbours[..., 1] >= 0) & (neighbours[..., 1] < lenY)
+    neighbourPieces = np.where(insideImage, pieces[np.clip(neighbours[..., 0], 0, lenX - 1), np.clip(neighbours[..., 1], 0, lenY - 1)], 0)
+    endpointPieces = np.unique(np.stack([np.repeat(np.arange(len(endpoints)), len(neighbourOffsets)), neighbourPieces.ravel()], axis=1), axis=0)
+    endpointPieces = endpointPieces[endpointPieces[:, 1] > 0]
+    touchedEndpoints = np.bincount(endpointPieces[:, 1], minlength=numberOfPieces + 1)
+    pieceSizes = np.bincount(pieces.ravel(), minlength=numberOfPieces + 1)
+    # pieces bridge a gap if they touch at least two endpoints and have at most maximumLength pixels
+    bridges = (touchedEndpoints >= 2) & (pieceSizes <= maximumLength)
+    bridges[0] = False
+    # the pieces and their endpoints are marked like the corrections of correct_gaps_in_skeleton
+    skeletonImage[bridges[pieces]] = 2
+    bridgedEndpoints = endpoints[endpointPieces[bridges[endpointPieces[:, 1]], 0]]
+    skeletonImage[bridgedEndpoints[:, 0], bridgedEndpoints[:, 1]] = 2
+    return(skeletonImage, int(np.sum(bridges)))
+
+def evaluate_angle(x, y, endpoints, image, endpointAngles=None):
+    """
+    evaluate whether the angles of both endpoints are similar
+    """
+    allAngles = []
+    # the angles of endpoints are measured only once if a dictionary is given for them
+    if endpointAngles is None:
+        endpointAngles = {}
+    xPos1, yPos1 = endpoints[x]
+    xPos2, yPos2 = endpoints[y]
+    rows, columns = skimage.draw.line(xPos1, yPos1, xPos2, yPos2)
+    # the window of an endpoint in the last row or column does not contain the endpoint, so its angle cannot be measured
+    if max(xPos1, xPos2) >= image.shape[0] - 1 or max(yPos1, yPos2) >= image.shape[1] - 1:
+        return(allAngles, rows, columns)
+    if np.sum(image[rows[1:-1], columns[1:-1]]) == 0:
+        if x not in endpointAngles:
+            endpointAngles[x] = measure_angle_of_endpoints(xPos1, yPos1, image)
+        if y not in endpointAngles:
+            endpointAngles[y] = measure_angle_of_endpoints(xPos2, yPos2, image)
+        angleEndpoint1, angleEndpoint2 = endpointAngles[x], endpointAngles[y]
+        if xPos2 < xPos1:
+            angleBetweenEndpoints = angle180([yPos2 - yPos1, xPos2 - xPos1])
+        else:
+            angleBetweenEndpoints = angle180([yPos1 - yPos2, xPos1 - xPos2])
+        allAngles = [angleEndpoint1, angleEndpoint2, angleBetweenEndpoints]
+    return(allAngles, rows, columns)
+
+def map_junctions_to_labels(junctions, labeledImage):
+    """
+    map every label to the indices of the tri-cellular junctions with a pixel of the label in their neighbourhood
+    """
+    junctions = np.asarray(junctions, dtype=int).reshape(-1, 2)
+    # a pixel dilated with np.ones((8, 8)) covers the offsets -4 to 3, so a junction is reached by cell pixels at the offsets -3 to 4
+    xOffsets, yOffsets = np.meshgrid(np.arange(-3, 5), np.arange(-3, 5), indexing='ij')
+    xPos = junctions[:, 0, np.newaxis] + xOffsets.ravel()
+    yPos = junctions[:, 1, np.newaxis] + yOffsets.ravel()
+    inImage = (xPos >= 0) & (xPos < labeledImage.shape[0]) & (yPos >= 0) & (yPos < labeledImage.shape[1])
+    junctionIndices = np.broadcast_to(np.arange(len(junctions))[:, np.newaxis], xPos.shape)[inImage]
+    pairs = np.unique(np.stack([labeledImage[xPos[inImage], yPos[inImage]], junctionIndices], axis=1), axis=0)
+    labels, starts = np.unique(pairs[:, 0], return_index=True)
+    return(dict(zip(labels.tolist(), np.split(pairs[:, 1], starts[1:]))))
+
+def match_labels(labeledImage, priorLabeledImage):
+    """
+    match the cells of a labeled image to the cells of the previous frame that share more than half of the area of both cells
+    """
+    cells = (labeledImage > 1) & (priorLabeledImage > 1)
+    numberOfPriorLabels = int(priorLabeledImage.max()) + 1
+    pairs, overlaps = np.unique(labeledImage[cells].astype(np.int64) * numberOfPriorLabels + priorLabeledImage[cells], return_counts=True)
+    labels, priorLabels = pairs // numberOfPriorLabels, pairs % numberOfPriorLabels
+    areas, priorAreas = np.bincount(labeledImage.ravel()), np.bincount(priorLabeledImage.ravel())
+    matched = (2 * overlaps > areas[labels]) & (2 * overlaps > priorAreas[priorLabels])
+    # matched cells are unchanged if they cover the same pixels
+    unchanged = (overlaps == areas[labels]) & (overlaps == priorAreas[priorLabels])
+    return({int(label): (int(priorLabel), bool(isUnchanged)) for label, priorLabel, isUnchanged in zip(labels[matched], priorLabels[matched], unchanged[matched])})
+
+def match_junctions(junctions, priorJunctions):
+    """
+    check if a cell has the same tri-cellular junctions as in the previous frame
+    """
+    junctions, priorJunctions = np.reshape(junctions, (-1, 2)), np.reshape(priorJunctions, (-1, 2))
+    return({tuple(junction) for junction in junctions.tolist()} == {tuple(junction) for junction in priorJunctions.tolist()})
+
+def create_window(image, x, y, xUp, xDown, yLeft, yRight):
+    """
+    create a window from the specified coordinates in the image
+    """
+    lx, ly = image.shape[0] - 1, image.shape[1] - 1
+    xmin, xmax = bounds(x - xUp, 0, lx), bounds(x + xDown, 0, lx)
+    ymin, ymax = bounds(y - yLeft, 0, ly), bounds(y + yRight, 0, ly)
+    window = image[xmin:xmax, ymin:ymax].copy()
+    return(window, [xmin, xmax, ymin, ymax])
+
+def find_close_endpoint_pairs(points, minimumDistance=1, maximumDistance=10):
+    """
+    find all pairs of points with a distance of at least minimumDistance and less than maximumDistance with a KD-tree
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    pairs = sp.spatial.cKDTree(points).query_pairs(r=maximumDistance, output_type='ndarray')
+    distances = np.sqrt(np.sum((points[pairs[:, 0]] - points[pairs[:, 1]]) ** 2, axis=1))
+    pairs = pairs[(distances >= minimumDistance) & (distances < maximumDistance)]
+    # each pair (i, j) has i > j and pairs are sorted by i and j
+    pairs = np.sort(pairs, axis=1)[:, ::-1]
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    return(pairs)
+
+# offsets of the 8-neighbourhood, the neighbour at neighbourOffsets[k] sets bit k of the neighbourhood code
+neighbourOffsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+def create_neighbourhood_table():
+    """
+    count the 4-connected and 8-connected components of the 8-neighbourhood of a pixel for all 256 neighbourhood codes
+    """
+    table = np.zeros((256, 2), dtype=int)
+    for code in range(256):
+        window = np.zeros((3, 3), dtype=int)
+        for bit, (xShift, yShift) in enumerate(neighbourOffsets):
+            window[1 + xShift, 1 + yShift] = (code >> bit) & 1
+        table[code, 0] = sp.ndimage.label(window)[1]
+        table[code, 1] = sp.ndimage.label(window, np.ones((3, 3)))[1]
+    return(table)
+
+neighbourhoodTable = create_neighbourhood_table()
+
+def encode_neighbourhoods(image):
+    """
+    encode the 8-neighbourhood of every pixel as a byte
+    """
+    foreground = np.pad(image != 0, 1)
+    # pixels in the last row and column are not part of any neighbourhood like in create_window
+    foreground[-2, :] = False
+    foreground[:, -2] = False
+    lenX, lenY = image.shape
+    codes = np.zeros(image.shape, dtype=np.uint8)
+    for bit, (xShift, yShift) in enumerate(neighbourOffsets):
+        codes |= foreground[1 + xShift:1 + xShift + lenX, 1 + yShift:1 + yShift + lenY].astype(np.uint8) << bit
+    return(codes)
+
+def detect_crossings_and_endpoints(skeletonImage, mode='both', output='image'):
+    """
+    detect crossings and endpoints of the skeleton
+    """
+    skeletonImage = skeletonImage * 1
+    detected_nodes = skeletonImage.copy()
+    skeletonPixels = skeletonImage == 1
+    # pixels are classified by the components of their 8-neighbourhood with a lookup table
+    components = neighbourhoodTable[encode_neighbourhoods(skeletonImage)]
+    components4, components8 = components[..., 0], components[..., 1]
+    nodes = np.zeros(skeletonImage.shape, dtype=bool)
+    if mode == 'both' or mode == 'endpoints':
+        endpoints = skeletonPixels & (components4 <= 1)
+        detected_nodes[endpoints] = 3
+        nodes |= endpoints
+    if mode == 'both' or mode == 'crossings':
+        crossings = skeletonPixels & ((components4 == 3) | (components4 == 4))
+        detected_nodes[crossings] = 2
+        nodes |= crossings
+        # pixels with two neighbour branches are crossings if no neighbour is a crossing yet, earlier pixels of the row-major scan are already classified
+        lenX, lenY = skeletonImage.shape[0] - 1, skeletonImage.shape[1] - 1
+        for x, y in np.argwhere(skeletonPixels & (components4 == 2) & (components8 == 1)).tolist():
+            neighbourCrossing = False
+            for xShift, yShift in neighbourOffsets:
+                xPos, yPos = x + xShift, y + yShift
+                if 0 <= xPos < lenX and 0 <= yPos < lenY:
+                    earlier = xShift < 0 or (xShift == 0 and yShift < 0)
+                    if (detected_nodes[xPos, yPos] if earlier else skeletonImage[xPos, yPos]) == 2:
+                        neighbourCrossing = True
+                        break
+            if not neighbourCrossing:
+                detected_nodes[x, y] = 2
+                nodes[x, y] = True
+    if output == 'image':
+        return(detected_nodes)
+    else:
+        return(np.argwhere(nodes))
+
+def angle180(dxy):
+    """
+    calculate the angle between two points in 180 degree range
+    """
+    dx, dy = dxy
+    rad2deg = 180.0 / np.pi
+    angle = np.mod(np.arctan2(-dx, -dy) * rad2deg + 360.0, 360.0)
+    if angle >= 270:
+        angle = 360 - angle
+    return(angle)
+
+def measure_angle_of_endpoints(x, y, image):
+    """
+    measure the angle between two endpoint of the skeleton
+    """
+    window, winBounds = create_window(image, x, y, 5, 6, 5, 6)
+    cleanedWindow = (window > 0) * 1
+    labeledWindow, labelsWindow = sp.ndimage.label(cleanedWindow, np.ones((3, 3)))
+    labelSkeleton = labeledWindow[x - winBounds[0], y - winBounds[2]]
+    coordLabel = np.transpose(np.where(labeledWindow == labelSkeleton))
+    newWindow = window.copy() * 0
+    for s, t in coordLabel:
+        newWindow[s, t] = window[s, t]
+
+    if 2 in newWindow:
+        coord = np.transpose(np.where(newWindow == 2))
+        dista = []
+        for s, t in coord:
+            dista.append(euclidean([s, t], [x - winBounds[0], y - winBounds[2]]))
+        w = np.argmin(dista)
+        if x < coord[w][0] + winBounds[0]:
+            angle = angle180([y - (coord[w][1] + winBounds[2]), x - (coord[w][0] + winBounds[0])])
+        else:
+            angle = angle180([(coord[w][1] + winBounds[2]) - y, (coord[w][0] + winBounds[0]) - x])
+    else:
+        coord = np.transpose(np.where(window == 1))
+        dista = []
+        for s, t in coord:
+            dista.append(euclidean([s, t], [x - winBounds[0], y - winBounds[2]]))
+        if len(dista) != 0:
+            w = np.argmax(dista)
+            if x < coord[w][0] + winBounds[0]:
+                angle = angle180([y - (coord[w][1] + winBounds[2]), x - (coord[w][0] + winBounds[0])])
+            else:
+                angle = angle180([(coord[w][1] + winBounds[2]) - y, (coord[w][0] + winBounds[0]) - x])
+        else:
+            angle = 0
+    return(angle)
+
+def euclidean(x, y):
+    """
+    calculate the Euclidean distance between two points
+    """
+    dist = math.sqrt(((int(x[0]) - int(y[0])) ** 2) + ((int(x[1]) - int(y[1])) ** 2))
+    return(dist)
+
+def detect_branches(skeletonImage, mode='remove', detectedNodes=None):
+    """
+    remove skeleton branches by tracking from endpoints back to crossings
+    """
+    # crossings and endpoints of the skeleton can be passed if they were already detected
+    if detectedNodes is None:
+        detected_nodes = detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
+    else:
+        detected_nodes = detectedNodes.copy()
+    # other values than 1 in the skeleton are not classified in the first pass, afterwards the whole skeleton is classified as binary image once
+    classifyAll = mode == 'remove' and np.any(skeletonImage > 1)
+    endpoints = np.argwhere(detected_nodes == 3).tolist()
+    while len(endpoints) > 0:
+        visitedPixels = track_or_remove_branches(detected_nodes, mode, endpoints)
+        if classifyAll:
+            detected_nodes = detect_crossings_and_endpoints(detected_nodes > 0, mode='both', output='image')
+            endpoints = np.argwhere(detected_nodes == 3).tolist()
+            classifyAll = False
+        elif mode == 'remove':
+            # only the pixels next to removed pixels can change their class
+            endpoints = reclassify_pixels(detected_nodes, visitedPixels)
+        else:
+            # tracked pixels stay in the skeleton and crossings are not tracked, so no pixel changes its class
+            endpoints = []
+    if mode == 'remove':
+        return(detected_nodes > 0)
+    else:
+        return(detected_nodes)
+
+def track_or_remove_branches(detected_nodes, mode, branchPixels):
+    """
+    depending on the mode either remove or track the branches starting at the endpoints and return the visited pixels
+    """
+    visitedPixels = []
+    # branches are followed pixel by pixel and only pixels marked in the previous step are visited
+    while len(branchPixels) > 0:
+        nextBranchPixels = []
+        for x, y in branchPixels:
+            window, winBounds = create_window(detected_nodes, x, y, 1, 2, 1, 2)
+            label_counts = np.sum(np.unique(window) > 0)
+            label_sum = np.sum(window)
+            label_number = np.sum(window > 0)
+            if mode == 'remove':
+                followBranch = label_counts == 2
+            else:
+                followBranch = (label_counts <= 3 and label_sum < 9) or (label_sum == 9 and label_number == 4)
+            if followBranch:
+                nextBranchPixels.extend((np.argwhere(window == 1) + [winBounds[0], winBounds[2]]).tolist())
+                detected_nodes[winBounds[0]:winBounds[1], winBounds[2]:winBounds[3]] = np.where(window == 1, 3, window)
+            detected_nodes[x, y] = 0 if mode == 'remove' else 4
+        visitedPixels.extend(branchPixels)
+        # the marked pixels are visited in the next step in the order of the image rows
+        branchPixels = sorted(nextBranchPixels)
+    return(visitedPixels)
+
+def reclassify_pixels(detected_nodes, removedPixels):
+    """
+    classify the skeleton pixels next to removed pixels again and return the new endpoints
+    """
+    lenX, lenY = detected_nodes.shape[0] - 1, detected_nodes.shape[1] - 1
+    changedPixels = set()
+    for x, y in removedPixels:
+        for xShift, yShift in neighbourOffsets:
+            xPos, yPos = x + xShift, y + yShift
+            if 0 <= xPos <= lenX and 0 <= yPos <= lenY and detected_nodes[xPos, yPos] != 0:
+                changedPixels.add((xPos, yPos))
+    changedPixels = sorted(changedPixels)
+    queuedPixels = set(changedPixels)
+    endpoints = []
+    # pixels are classified like in detect_crossings_and_endpoints and visited in row-major order,
+    # a pixel that becomes or stops being a crossing passes the change on to the following pixels
+    while len(changedPixels) > 0:
+        x, y = heapq.heappop(changedPixels)
+        code = 0
+        for bit, (xShift, yShift) in enumerate(neighbourOffsets):
+            xPos, yPos = x + xShift, y + yShift
+            # pixels in the last row and column are not part of any neighbourhood like in encode_neighbourhoods
+            if 0 <= xPos < lenX and 0 <= yPos < lenY and detected_nodes[xPos, yPos] != 0:
+                code |= 1 << bit
+        components4, components8 = neighbourhoodTable[code]
+        pixelClass = 1
+        if components4 <= 1:
+            pixelClass = 3
+        elif components4 == 3 or components4 == 4:
+            pixelClass = 2
+        elif components4 == 2 and components8 == 1:
+            pixelClass = 2
+            # only earlier pixels of the row-major scan are compared, they are already classified
+            for xShift, yShift in neighbourOffsets[:4]:
+                xPos, yPos = x + xShift, y + yShift
+                if 0 <= xPos < lenX and 0 <= yPos < lenY and detected_nodes[xPos, yPos] == 2:
+                    pixelClass = 1
+                    break
+        if (detected_nodes[x, y] == 2) != (pixelClass == 2):
+            for xShift, yShift in neighbourOffsets[4:]:
+                xPos, yPos = x + xShift, y + yShift
+                if 0 <= xPos <= lenX and 0 <= yPos <= lenY and detected_nodes[xPos, yPos] != 0 and (xPos, yPos) not in queuedPixels:
+                    queuedPixels.add((xPos, yPos))
+                    heapq.heappush(changedPixels, (xPos, yPos))
+        detected_nodes[x, y] = pixelClass
+        if pixelClass == 3:
+            endpoints.append([x, y])
+    return(endpoints)
+
+def create_labeled_and_tracked_image(skeletonImage, labeledImage, trackedBranches=None):
+    """
+    create a labeled image, where background=0, skeleton=1, tracked branches=2 and cell labels>=3
+    """
+    labeledTrackedImage = labeledImage.copy() + 3
+    if trackedBranches is None:
+        trackedBranches = detect_branches(skeletonImage, mode='track') == 4
+    trackedPixels = np.transpose(np.where(trackedBranches))
+    skeletonPixels = np.transpose(np.where(labeledTrackedImage == 3))
+    backgroundPixels = np.transpose(np.where(labeledTrackedImage == 4))
+
+    labeledTrackedImage[backgroundPixels[:,0], backgroundPixels[:,1]] = 0
+    labeledTrackedImage[skeletonPixels[:,0], skeletonPixels[:,1]] = 1
+    labeledTrackedImage[trackedPixels[:,0], trackedPixels[:,1]] = 2
+    return(labeledTrackedImage)
+
+def marching_squares(contour, cellImage):
+    """
+    sort contour coordinates using marching squares algorithm
+    """
+    contourImage = cellImage.copy() * 2
+    contourImage[contour[:, 0], contour[:, 1]] = 1
+    xRight, yRight = find_rightmost_point(contour)
+    lenX, lenY = contourImage.shape
+    # windows are classified with a lookup table and sorted pixels are marked in images, so every step takes constant time
+    windowCodes = None
+    if np.all((contourImage >= 0) & (contourImage <= 2)):
+        windowCodes = contourImage[:-1, :-1] + 3 * contourImage[:-1, 1:] + 9 * contourImage[1:, :-1] + 27 * contourImage[1:, 1:]
+    remainingPixels = np.zeros(contourImage.shape, dtype=bool)
+    remainingPixels[contour[:, 0], contour[:, 1]] = True
+    sortedPixels = np.zeros(contourImage.shape, dtype=bool)
+    orderedContour = np.empty((len(contour), 2), dtype=int)
+    numberOrdered = 0
+    numberRemaining = np.count_nonzero(remainingPixels)
+    visitedWindows = {}
+    while numberRemaining > 0:
+        # the walk only depends on the window position, revisiting a window without sorting a pixel in between or leaving the image never closes the contour
+        if visitedWindows.get((xRight, yRight)) == numberOrdered or yRight >= lenY:
+            show_Message('......Could not close the contour while sorting the contour coordinates.')
+            break
+        visitedWindows[(xRight, yRight)] = numberOrdered
+        if windowCodes is not None and 0 <= xRight < lenX - 1 and 0 <= yRight < lenY - 1:
+            nextWindow, nextContourPixel = orientationTable[windowCodes[xRight, yRight]]
+        else:
+            nextWindow, nextContourPixel = orientation(contourImage[xRight:xRight+2, yRight:yRight+2])
+        for xShift, yShift in nextContourPixel:
+            xPos, yPos = xRight + xShift, yRight + yShift
+            if not (0 <= xPos < lenX and 0 <= yPos < lenY):
+                continue
+            if not sortedPixels[xPos, yPos]:
+                if remainingPixels[xPos, yPos]:
+                    orderedContour[numberOrdered] = [xPos, yPos]
+                    numberOrdered += 1
+                    sortedPixels[xPos, yPos] = True
+                    remainingPixels[xPos, yPos] = False
+                    numberRemaining -= 1
+            else:
+                # the contour is closed, pixels which were not reached are dropped
+                numberRemaining = 0
+                break
+        if nextWindow == 'left':
+            yRight = yRight - 1
+        elif nextWindow == 'right':
+            yRight = yRight + 1
+        elif nextWindow == 'up':
+            xRight = xRight - 1
+        elif nextWindow == 'down':
+            xRight = xRight + 1
+    if numberRemaining > 0:
+        clockwise = []
+    else:
+        orderedContour = orderedContour[:numberOrdered]
+        clockwise = np.append([orderedContour[0]], orderedContour[-1:0:-1], axis=0)
+        clockwise = clockwise.astype('int')
+    return(clockwise)
+
+def create_orientation_table():
+    """
+    classify all 2x2 windows with background (0), contour (1) and object (2) pixels
+    """
+    table = []
+    # the window code is the sum of the pixel values times 1, 3, 9 and 27
+    for code in range(81):
+        window = np.array([[code % 3, code // 3 % 3], [code // 9 % 3, code // 27]])
+        if np.count_nonzero(window) == 4:
+            table.append(('', []))
+        else:
+            table.append(orientation(window))
+    return(table)
+
+def find_rightmost_point(contour):
+    """
+    return the rightmost point of a list of coordinates
+    """
+    index = np.where(contour[:, 1] == np.max(contour[:, 1]))[0]
+    return(contour[index[0]][0], contour[index[0]][1])
+
+def orientation(window):
+    """
+    define the direction of the shift for the next window according to the marching square algorithm
+    """
+    orient=''
+    nextContourPixel = []
+    if np.sum(window > 0) == 0:
+        orient = 'right'
+    elif np.sum(window > 0) == 1:
+        if window[0, 0] != 0:
+            orient = 'up'
+        elif window[0, 1] != 0:
+            orient = 'right'
+        elif window[1, 0] != 0:
+            orient = 'left'
+        elif window[1, 1] != 0:
+            orient = 'down'
+    elif np.sum(window > 0) == 2:
+        if window[0, 1] != 0 and window[1, 1] != 0:
+            orient = 'down'
+            nextContourPixel = [[1, 1]]
+        elif window[0, 0] != 0 and window[0, 1] != 0:
+            orient = 'right'
+            nextContourPixel = [[0, 1]]
+        elif window[0, 0] != 0 and window[1, 0] != 0:
+            orient = 'up'
+            nextContourPixel = [[0, 0]]
+        elif window[1, 0] != 0 and window[1, 1] != 0:
+            orient = 'left'
+            nextContourPixel = [[1, 0]]
+        elif window[0, 0] != 0 and window[1, 1] != 0:
+            orient = 'up'
+            nextContourPixel = [[0, 0]]
+        elif window[0, 1] != 0 and window[1, 0] != 0:
+            orient = 'left'
+            nextContourPixel = [[1, 0]]
+    elif np.sum(window > 0) == 3:
+        if window[0, 0] != 0 and window[0, 1] != 0 and window[1, 1] != 0:
+            orient = 'down'
+            if window[0, 1] == 1:
+                nextContourPixel = [[0, 1], [1, 1]]
+            else:
+                nextContourPixel = [[1, 1]]
+        elif window[0, 0] != 0 and window[1, 0] != 0 and window[1, 1] != 0:
+            orient = 'up'
+            if window[1, 0] == 1:
+                nextContourPixel = [[1, 0], [0, 0]]
+            else:
+                nextContourPixel = [[0, 0]]
+        elif window[0, 1] != 0 and window[1, 0] != 0 and window[1, 1] != 0:
+            orient = 'left'
+            if window[1, 1] == 1:
+                nextContourPixel = [[1, 1], [1, 0]]
+            else:
+                nextContourPixel = [[1, 0]]
+        elif window[0, 0] != 0 and window[0, 1] != 0 and window[1, 0] != 0:
+            orient = 'right'
+            if window[0, 0] == 1:
+                nextContourPixel = [[0, 0], [0, 1]]
+            else:
+                nextContourPixel = [[0, 1]]
+    else:
+        print('Error: too many pixels in window.')
+    return(orient, nextContourPixel)
+
+orientationTable = create_orientation_table()
+
+def find_index_of_coordinates(point, array, radius, output):
+    """
+    find position of point coordinates around radius in an array
+    """
+    foundPositions = CoordinateIndex(array).find(point, radius, output)
+    return(foundPositions)
+
+def calculate_pixel_distance(resolution):
+    """
+    calculate the optimal pixel distance between nodes along the contour from the image resolution
+    """
+    pixelDistance = int(np.round(1 / (resolution * 0.65)))
+    return(pixelDistance)
+
+def interpolate_contour_pixels(cellContour, pixelDistance):
+    """
+    determine all cell contour pixels which will be assigned as nodes according to the optimal pixel distance
+    """
+    pixelsOnContour = {}
+    contourLength = len(cellContour)
+    contourIndices = np.round(np.linspace(0, contourLength - pixelDistance, (contourLength - pixelDistance) / pixelDistance)).astype('int')
+    pixels = np.asarray(cellContour[contourIndices])
+    for idx in range(len(pixels)):
+        pixelsOnContour[idx] = (pixels[idx][0], pixels[idx][1])
+    return(pixelsOnContour)
+
+def find_visible_pairs(pixelsOnContour, backend='vectorized', counters=None):
+    """
+    find all pairs of visible contour nodes using the selected backend
+    """
+    if backend == 'shapely':
+        visiblePairs = find_visible_pairs_shapely(pixelsOnContour)
+    elif backend == 'vectorized':
+        visiblePairs = find_visible_pairs_vectorized(pixelsOnContour)
+    elif backend == 'sweep':
+        visiblePairs = find_visible_pairs_sweep(pixelsOnContour)
+    elif backend == 'indexed':
+        visiblePairs = find_visible_pairs_indexed(pixelsOnContour, counters)
+    else:
+        raise ValueError("Unknown visibility backend: " + str(backend))
+    return(visiblePairs)
+
+def add_visibility_edges(pixelsOnContour, visGraph, backend='vectorized', counters=None):
+    """
+    add all edges between visible contour nodes to the visibility graph using the selected backend
+    """
+    visiblePairs = find_visible_pairs(pixelsOnContour, backend, counters)
+    for node1, node2 in visiblePairs:
+        visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
+    return(visGraph)
+
+def laplacian_matrix(graph):
+    """
+    calculate the Laplacian matrix for both compact and networkx visibility graphs
+    """
+    if isinstance(graph, CompactVisGraph):
+        return(graph.laplacian_matrix())
+    return(nx.laplacian_matrix(graph))
+
+def report_visibility_counters(counters):
+    """
+    log how many lines were decided by the boundary index and how many needed the exact test
+    """
+    if sum(counters.values()) > 0:
+        show_Message("...Visibility tests: " + str(counters['fastAccepted']) + " fast accepted, " + str(counters['fastRejected']) + " fast rejected, " + str(counters['exactTests']) + " exact tests.")
+
+def find_visible_pairs_shapely(pixelsOnContour):
+    """
+    find all node pairs whose connecting line lies inside the polygon using the DE-9IM relation of each line
+    """
+    visiblePairs = []
+    Polygon = shapely.geometry.Polygon([[pixelsOnContour[key][1], pixelsOnContour[key][0]] for key in pixelsOnContour])
+    Boundary = shapely.geometry.LineString(list(Polygon.exterior.coords))
+    combs = itertools.combinations(range(len(pixelsOnContour)), 2)
+    for node1, node2 in list(combs):
+        line = shapely.geometry.LineString(((pixelsOnContour[node1][1], pixelsOnContour[node1][0]), (pixelsOnContour[node2][1], pixelsOnContour[node2][0])))
+        if is_visible_line(line, Polygon, Boundary):
+            visiblePairs.append((node1, node2))
+    return(visiblePairs)
+
+def is_visible_line(line, Polygon, Boundary):
+    """
+    check with the DE-9IM relation if a line between two contour nodes lies inside the polygon
+    """
+    cases = ['FFFF0F212', '0FFF0F212', '1FFF0F212', 'F0FF0F212', '00FF0F212', '10FF0F212', 'F1FF0F212']
+    DE9IM = line.relate(Polygon)
+    if DE9IM in cases:
+        intersection = Boundary.intersection(line)
+        # shapely 2 has no len() for multi-part geometries, a single point has no parts
+        if DE9IM == '10FF0F212' and len(getattr(intersection, 'geoms', [intersection])) <= 3:
+            return(True)
+        if DE9IM == 'F1FF0F212' and intersection.geom_type == 'LineString':
+            return(True)
+        if DE9IM in cases[:5]:
+            return(True)
+    return(False)
+
+def find_visible_pairs_indexed(pixelsOnContour, counters=None, blockSize=2**14):
+    """
+    find all node pairs whose connecting line lies inside the polygon, only lines touching the boundary get the DE-9IM test
+    """
+    coordinates = np.asarray([pixelsOnContour[key] for key in pixelsOnContour], dtype=float)
+    Polygon = shapely.geometry.Polygon([[pixelsOnContour[key][1], pixelsOnContour[key][0]] for key in pixelsOnContour])
+    # the fast tests assume a valid polygon, self-touching polygons and spikes keep the DE-9IM test for all lines
+    if np.any(coordinates != np.round(coordinates)) or not Polygon.is_valid:
+        return(find_visible_pairs_shapely(pixelsOnContour))
+    visiblePairs = []
+    Boundary = shapely.geometry.LineString(list(Polygon.exterior.coords))
+    boundaryIndex = BoundaryIndex(Polygon, Boundary)
+    points = coordinates[:, ::-1]
+    allNodes1, allNodes2 = np.triu_indices(len(points), 1)
+    for start in range(0, len(allNodes1), blockSize):
+        nodes1, nodes2 = allNodes1[start:start + blockSize], allNodes2[start:start + blockSize]
+        visible = boundaryIndex.visible_lines(points[nodes1], points[nodes2])
+        visiblePairs.extend(zip(nodes1[visible].tolist(), nodes2[visible].tolist()))
+    if counters is not None:
+        for counter in ['fastAccepted', 'fastRejected', 'exactTests']:
+            counters[counter] = counters.get(counter, 0) + getattr(boundaryIndex, counter)
+    return(visiblePairs)
+
+def find_visible_pairs_vectorized(pixelsOnContour, blockSize=2**19):
+    """
+    find all node pairs whose connecting line lies inside the polygon by testing blocks of lines against all polygon segments at once
+    """
+    coordinates = np.asarray([pixelsOnContour[key] for key in pixelsOnContour], dtype=float)
+    # self-touching polygons, spikes and repeated nodes are left to the DE-9IM test, cell contours are valid polygons
+    if np.any(coordinates != np.round(coordinates)) or not shapely.geometry.Polygon(coordinates[:, ::-1]).is_valid:
+        return(find_visible_pairs_shapely(pixelsOnContour))
+    # coordinates are doubled so that all midpoints needed for the inside test stay integers
+    nodes = 2 * coordinates.astype(np.int64)
+    numberOfNodes = len(nodes)
+    allNodes1, allNodes2 = np.triu_indices(numberOfNodes, 1)
+    visible = np.zeros(len(allNodes1), dtype=bool)
+    step = max(1, blockSize // max(numberOfNodes, 1))
+    for start in range(0, len(allNodes1), step):
+        visible[start:start + step] = classify_chords(nodes, allNodes1[start:start + step], allNodes2[start:start + step])
+    return(list(zip(allNodes1[visible].tolist(), allNodes2[visible].tolist())))
+
+def classify_chords(nodes, node1, node2):
+    """
+    decide for a block of chords between polygon nodes if they match one of the accepted DE-9IM cases
+    """
+    numberOfChords, numberOfNodes = len(node1), len(nodes)
+    segmentEnds = np.roll(nodes, -1, axis=0)
+    pointsA, pointsB = nodes[node1], nodes[node2]
+    chords = pointsB - pointsA
+    chordLengths = np.sum(chords ** 2, axis=1)
+    # side of all polygon nodes relative to each chord (cross product written as a matrix product, exact for pixel coordinates)
+    closedNodes = np.append(nodes, nodes[:1], axis=0).astype(float)
+    sides = np.stack([chords[:, 0], -chords[:, 1]], axis=1).astype(float) @ np.stack([closedNodes[:, 1], closedNodes[:, 0]])
+    sides -= (chords[:, 0] * pointsA[:, 1] - chords[:, 1] * pointsA[:, 0]).astype(float)[:, np.newaxis]
+    # segments with ends on both sides of the chord have to be checked for a proper crossing
+    chordIndex, segmentIndex = np.divmod(np.flatnonzero(sides[:, :-1] * sides[:, 1:] < 0), numberOfNodes)
+    segmentVectors = segmentEnds[segmentIndex] - nodes[segmentIndex]
+    sideA = cross_product_sign(segmentVectors, pointsA[chordIndex] - nodes[segmentIndex])
+    sideB = cross_product_sign(segmentVectors, pointsB[chordIndex] - nodes[segmentIndex])
+    properCrossing = np.bincount(chordIndex[sideA * sideB < 0], minlength=numberOfChords) > 0
+    # nodes on the line of the chord touch it if they lie between both chord ends
+    chordIndex, nodeIndex = np.divmod(np.flatnonzero(sides == 0), numberOfNodes + 1)
+    chordIndex, nodeIndex = chordIndex[nodeIndex < numberOfNodes], nodeIndex[nodeIndex < numberOfNodes]
+    projections = np.sum((nodes[nodeIndex] - pointsA[chordIndex]) * chords[chordIndex], axis=1)
+    touching = (projections > 0) & (projections < chordLengths[chordIndex])
+    numberOfTouches = np.bincount(chordIndex[touching], minlength=numberOfChords)
+    touchPoints = np.zeros((numberOfChords, 2), dtype=np.int64)
+    touchPoints[chordIndex[touching]] = nodes[nodeIndex[touching]]
+    # segments on the line of the chord overlap it if their projections share an interval with the chord
+    collinear = sides[chordIndex, nodeIndex + 1] == 0
+    chordIndex, segmentIndex, projectionStart = chordIndex[collinear], nodeIndex[collinear], projections[collinear]
+    projectionEnd = np.sum((segmentEnds[segmentIndex] - pointsA[chordIndex]) * chords[chordIndex], axis=1)
+    overlapStart = np.maximum(np.minimum(projectionStart, projectionEnd), 0)
+    overlapEnd = np.minimum(np.maximum(projectionStart, projectionEnd), chordLengths[chordIndex])
+    overlapLengths = np.maximum(overlapEnd - overlapStart, 0)
+    overlapping = np.bincount(chordIndex[overlapLengths > 0], minlength=numberOfChords) > 0
+    coveredLengths = np.bincount(chordIndex, weights=overlapLengths, minlength=numberOfChords)
+    # lines along the boundary are only accepted if they follow a single polygon segment
+    alongBoundary = overlapping & (numberOfTouches == 0) & (coveredLengths == chordLengths)
+    # all other lines have to run through the inside of the polygon touching the boundary at most once
+    candidates = ~overlapping & ~properCrossing & (numberOfTouches <= 1) & (chordLengths > 0)
+    # without any further contact to the boundary a line is inside if it leaves its end nodes into the polygon
+    inside = np.zeros(numberOfChords, dtype=bool)
+    single = np.where(candidates & (numberOfTouches == 0))[0]
+    inside[single] = leaves_into_polygon(nodes, node1[single], chords[single], (pointsA[single] + pointsB[single]) // 2)
+    touched = np.where(candidates & (numberOfTouches == 1))[0]
+    insideFirst = leaves_into_polygon(nodes, node1[touched], chords[touched], (pointsA[touched] + touchPoints[touched]) // 2)
+    insideSecond = leaves_into_polygon(nodes, node2[touched], -chords[touched], (touchPoints[touched] + pointsB[touched]) // 2)
+    inside[touched] = insideFirst & insideSecond
+    return(alongBoundary | inside)
+
+def leaves_into_polygon(nodes, nodeIndex, directions, fallbackPoints):
+    """
+    test if lines starting at polygon nodes point into the interior angle of the polygon at these nodes
+    """
+    orientationSign = np.sign(np.sum(nodes[:, 0] * np.roll(nodes[:, 1], -1) - np.roll(nodes[:, 0], -1) * nodes[:, 1]))
+    nextEdges = nodes[(nodeIndex + 1) % len(nodes)] - nodes[nodeIndex]
+    previousEdges = nodes[nodeIndex - 1] - nodes[nodeIndex]
+    if orientationSign < 0:
+        nextEdges, previousEdges = previousEdges, nextEdges
+    # the interior angle reaches counterclockwise from the next to the previous edge
+    turn = cross_product_sign(nextEdges, previousEdges)
+    afterNext = cross_product_sign(nextEdges, directions)
+    beforePrevious = cross_product_sign(directions, previousEdges)
+    inside = np.where(turn > 0, (afterNext > 0) & (beforePrevious > 0), (afterNext > 0) | (beforePrevious > 0))
+    straight = (turn == 0) & (np.sum(nextEdges * previousEdges, axis=1) < 0)
+    inside[straight] = afterNext[straight] > 0
+    # spikes and degenerated polygons are decided with the crossing number instead
+    undecided = ((turn == 0) & ~straight) | (orientationSign == 0)
+    inside[undecided] = points_in_polygon(fallbackPoints[undecided], nodes)
+    return(inside)
+
+def is_within_bounds(points, corners1, corners2):
+    """
+    check if points lie inside the bounding boxes spanned by two corners
+    """
+    return(np.all((points >= np.minimum(corners1, corners2)) & (points <= np.maximum(corners1, corners2)), axis=-1))
+
+def cross_product_sign(vectors1, vectors2):
+    """
+    calculate the sign of the cross product for two arrays of 2D vectors
+    """
+    return(np.sign(vectors1[:, 0] * vectors2[:, 1] - vectors1[:, 1] * vectors2[:, 0]))
+
+def find_visible_pairs_sweep(pixelsOnContour):
+    """
+    find all node pairs whose connecting line lies inside the polygon with a rotational plane sweep around every node
+    """
+    coordinates = np.asarray([pixelsOnContour[key] for key in pixelsOnContour], dtype=float)
+    numberOfNodes = len(coordinates)
+    if np.any(coordinates != np.round(coordinates)) or len(np.unique(coordinates, axis=0)) != numberOfNodes:
+        return(find_visible_pairs_vectorized(pixelsOnContour))
+    nodes = coordinates.astype(np.int64)
+    nextEdges = np.roll(nodes, -1, axis=0) - nodes
+    previousEdges = np.roll(nodes, 1, axis=0) - nodes
+    orientationSign = np.sign(np.sum(nodes[:, 0] * np.roll(nodes[:, 1], -1) - np.roll(nodes[:, 0], -1) * nodes[:, 1]))
+    spikes = (cross_product_sign(nextEdges, previousEdges) == 0) & (np.sum(nextEdges * previousEdges, axis=1) > 0)
+    if orientationSign == 0 or np.any(spikes):
+        return(find_visible_pairs_vectorized(pixelsOnContour))
+    # walk along the polygon such that its interior is always on the left side
+    if orientationSign > 0:
+        successors = [(node + 1) % numberOfNodes for node in range(numberOfNodes)]
+    else:
+        successors = [(node - 1) % numberOfNodes for node in range(numberOfNodes)]
+    predecessors = [0] * numberOfNodes
+    for node in range(numberOfNodes):
+        predecessors[successors[node]] = node
+    visiblePairs = []
+    for node in range(numberOfNodes):
+        visibleNodes = sweep_visible_nodes(nodes, node, successors, predecessors)
+        visiblePairs.extend([(node, visibleNode) for visibleNode in visibleNodes if visibleNode > node])
+    return(sorted(visiblePairs))
+
+def sweep_visible_nodes(nodes, source, successors, predecessors):
+    """
+    rotate a ray around the source node through the interior angle of the polygon and collect all nodes visible from the source
+    """
+    numberOfNodes = len(nodes)
+    xCoordinates, yCoordinates = (nodes[:, 0] - nodes[source, 0]).tolist(), (nodes[:, 1] - nodes[source, 1]).tolist()
+    following, preceding = successors[source], predecessors[source]
+    relativeNodes = nodes - nodes[source]
+    startRay, endRay = relativeNodes[following], relativeNodes[preceding]
+    visibleNodes = []
+    # neighbours are visible unless another node lies on the polygon segment in between
+    for neighbour in [following, preceding]:
+        onRay = (cross_product_sign(relativeNodes, relativeNodes[[neighbour]]) == 0) & (np.sum(relativeNodes * relativeNodes[neighbour], axis=1) > 0)
+        if np.sum(onRay & (np.sum(relativeNodes ** 2, axis=1) < np.sum(relativeNodes[neighbour] ** 2))) == 0:
+            visibleNodes.append(neighbour)
+    # only nodes strictly inside the interior angle of the source node can be reached
+    turn = cross_product_sign(startRay[np.newaxis], endRay[np.newaxis])[0]
+    afterStart = cross_product_sign(np.tile(startRay, (numberOfNodes, 1)), relativeNodes)
+    beforeEnd = cross_product_sign(relativeNodes, np.tile(endRay, (numberOfNodes, 1)))
+    if turn > 0:
+        insideAngle = (afterStart > 0) & (beforeEnd > 0)
+    elif turn < 0:
+        insideAngle = (afterStart > 0) | (beforeEnd > 0)
+    else:
+        insideAngle = afterStart > 0
+    insideAngle[[source, following, preceding]] = False
+    candidates = np.where(insideAngle)[0]
+    angles = np.mod(np.arctan2(startRay[0] * relativeNodes[candidates, 1] - startRay[1] * relativeNodes[candidates, 0], np.sum(relativeNodes[candidates] * startRay, axis=1)), 2 * np.pi)
+    distances = np.sum(relativeNodes[candidates] ** 2, axis=1)
+    candidates = candidates[np.lexsort((distances, angles))].tolist()
+
+    def cross(node1, node2):
+        return(xCoordinates[node1] * yCoordinates[node2] - yCoordinates[node1] * xCoordinates[node2])
+
+    def side(edge, node):
+        start, end = edge
+        return((xCoordinates[end] - xCoordinates[start]) * (yCoordinates[node] - yCoordinates[start]) - (yCoordinates[end] - yCoordinates[start]) * (xCoordinates[node] - xCoordinates[start]))
+
+    def closer(edge1, edge2):
+        # both edges are crossed by the ray and do not intersect each other
+        sideSource = side(edge2, source)
+        side1, side2 = side(edge2, edge1[0]) * sideSource, side(edge2, edge1[1]) * sideSource
+        if side1 >= 0 and side2 >= 0 and (side1 != 0 or side2 != 0):
+            return(True)
+        if side1 <= 0 and side2 <= 0:
+            return(False)
+        sideSource = side(edge1, source)
+        return(side(edge1, edge2[0]) * sideSource < 0 or side(edge1, edge2[1]) * sideSource < 0)
+
+    def insert(edge):
+        lower, upper = 0, len(activeEdges)
+        while lower < upper:
+            middle = (lower + upper) // 2
+            if closer(edge, activeEdges[middle]):
+                upper = middle
+            else:
+                lower = middle + 1
+        activeEdges.insert(lower, edge)
+
+    # every polygon segment is named by the node it starts from and oriented along the sweep direction
+    edgeStarts, edgeEnds = np.arange(numberOfNodes), np.asarray(successors)
+    orientations = cross_product_sign(relativeNodes, relativeNodes[edgeEnds])
+    orientations[[source, preceding]] = 0
+    firstNodes = np.where(orientations > 0, edgeStarts, edgeEnds)
+    lastNodes = np.where(orientations > 0, edgeEnds, edgeStarts)
+    edges = [(first, last) if orientation != 0 else None for first, last, orientation in zip(firstNodes.tolist(), lastNodes.tolist(), orientations.tolist())]
+    # segments crossed by the ray directly after leaving the first polygon segment of the source
+    rays = np.tile(startRay, (numberOfNodes, 1))
+    afterFirst = cross_product_sign(relativeNodes[firstNodes], rays)
+    onStartRay = (afterFirst == 0) & (np.sum(relativeNodes[firstNodes] * startRay, axis=1) > 0)
+    initialEdges = (orientations != 0) & ((afterFirst > 0) | onStartRay) & (cross_product_sign(rays, relativeNodes[lastNodes]) > 0)
+    activeEdges, activeSet = [], set()
+    for edge in np.where(initialEdges)[0].tolist():
+        insert(edges[edge])
+        activeSet.add(edges[edge])
+
+    index = 0
+    while index < len(candidates):
+        group = [candidates[index]]
+        index += 1
+        while index < len(candidates) and cross(group[0], candidates[index]) == 0:
+            group.append(candidates[index])
+            index += 1
+        for node in group:
+            for edge in [edges[node], edges[predecessors[node]]]:
+                if edge is not None and edge[1] == node and edge in activeSet:
+                    activeEdges.remove(edge)
+                    activeSet.discard(edge)
+        nearestEdge = activeEdges[0] if len(activeEdges) != 0 else None
+        for position, node in enumerate(group[:2]):
+            if nearestEdge is not None and side(nearestEdge, source) * side(nearestEdge, node) < 0:
+                break
+            if position == 1:
+                # the ray may only pass the first node if the boundary touches it from one side
+                touchingNode = group[0]
+                if cross(touchingNode, successors[touchingNode]) * cross(touchingNode, predecessors[touchingNode]) <= 0:
+                    break
+            visibleNodes.append(node)
+        for node in group:
+            for edge in [edges[node], edges[predecessors[node]]]:
+                if edge is not None and edge[0] == node:
+                    insert(edge)
+                    activeSet.add(edge)
+    return(visibleNodes)
+
+def points_in_polygon(points, polygonNodes):
+    """
+    test if points which do not lie on the polygon boundary are inside the polygon using the crossing number
+    """
+    if len(points) == 0:
+        return(np.zeros(0, dtype=bool))
+    start, end = polygonNodes[np.newaxis, :, :], np.roll(polygonNodes, -1, axis=0)[np.newaxis, :, :]
+    points = points[:, np.newaxis, :]
+    straddling = (start[:, :, 1] > points[:, :, 1]) != (end[:, :, 1] > points[:, :, 1])
+    deltaY = end[:, :, 1] - start[:, :, 1]
+    leftSide = (points[:, :, 0] - start[:, :, 0]) * deltaY
+    rightSide = (points[:, :, 1] - start[:, :, 1]) * (end[:, :, 0] - start[:, :, 0])
+    crossing = straddling & np.where(deltaY > 0, leftSide < rightSide, leftSide > rightSide)
+    return(np.sum(crossing, axis=1) % 2 == 1)
+
+def invert(image):
+    """
+    invert image
+    """
+    if image.dtype == 'bool':
+        return ~image
+    else:
+        return dtype.dtype_limits(image, clip_negative=False)[1] - image
+
+def find_local_extrema(array):
+    """
+    find local minima and maxima in array
+    """
+    reverseArray = array[::-1]
+    array = np.append(array, array[:1])
+    reverseArray = np.append(reverseArray, reverseArray[:1])
+    signsArray = calculate_consecutive_difference(array)
+    signsReverseArray = calculate_consecutive_difference(reverseArray)[::-1]
+    neckIndices = []
+    lobeIndices = []
+    for idx, sign in enumerate(signsArray):
+        if sign == '-' and signsReverseArray[idx] == sign:
+            lobeIndices.append(idx)
+        elif sign == '+' and signsReverseArray[idx] == sign:
+            neckIndices.append(idx)
+    return(lobeIndices, neckIndices)
+
+def calculate_consecutive_difference(sequence):
+    """
+    calculate the difference of consecutive elements in an array
+    """
+    difference = [elem1 - elem2 for elem1, elem2 in zip(sequence[:-1], sequence[1:])]
+    signedDifference = np.sign(difference)
+    signedSequence = convert_to_sign(signedDifference)
+    return(signedSequence)
+
+def convert_to_sign(sequence):
+    """
+    convert signed numbers into + and - signs
+    """
+    signs = []
+    for idx in range(len(sequence)):
+        if sequence[idx] > 0:
+            signs.extend('+')
+        elif sequence[idx] < 0:
+            signs.extend('-')
+        else:
+            signs.extend('0')
+    return(''.join(signs))
+
+def get_key_from_value(dictionary, value):
+    """
+    get the dictionary key of a specified value
+    """
+    for key, val in dictionary.items():
+        if val == value:
+            return(key)
@@ -0,0 +1,211 @@
+import argparse
+import logging
+import os
+import glob
+import numpy as np
+from GraVis.ShapeAnalysis import VisGraph, VisGraphOther, Comparison, run_image_jobs, analyze_pavement_cell_image, analyze_pavement_cell_stack, list_stack_frames, StageCache, show_Message, show_Warning
+
+# exit codes of the batch analysis, invalid arguments exit with 2 like argparse
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_WARNINGS = 3
+
+analysisModes = {'both': 'Pre-processing & Graph extraction', 'preprocessing': 'Pre-processing', 'graphs': 'Graph extraction'}
+fileExtensions = ["/*.png", "/*.jpg", "/*.jpeg", "/*.tif", "/*.tiff", "/*.TIF", "/*.TIFF", "/*.ROI", "/*.roi"]
+dataKeys = ["data1", "data2", "data3", "data4", "data5", "data6", "data7"]
+
+# count warnings of the analysis for the exit code
+class WarningCounter(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self, level=logging.WARNING)
+        self.warnings = 0
+
+    def emit(self, record):
+        self.warnings += 1
+
+def create_parser():
+    """
+    create the command line parser with the options of the GUI
+    """
+    parser = argparse.ArgumentParser(prog='GraVis', description="Batch analysis with GraVis, a network-based shape descriptor, without the graphical user interface.",
+                                     epilog="Exit codes: 0 analysis is done, 1 analysis failed, 2 invalid arguments, 3 analysis is done with warnings.")
+    parser.add_argument('--log', default='GraVis.log', help="log file (default: GraVis.log)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    description = subparsers.add_parser('describe', help="create visibility graphs of pavement cells or other shapes")
+    description.add_argument('path', help="image, ROI file or folder with images or ROI files")
+    description.add_argument('--shapes', choices=['pavement', 'other'], default='pavement', help="analyze pavement cells or binary images of other shapes (default: pavement)")
+    description.add_argument('--analysis', choices=list(analysisModes.keys()), default='both', help="pavement cells only: pre-processing, graph extraction or both (default: both)")
+    description.add_argument('--resolution', type=float, help="image resolution in µm/px for pavement cells (e.g. 0.21) or pixel distance in px/node for other shapes (e.g. 10)")
+    description.add_argument('--clean-edges', action='store_true', help="enforce removal of artificial edges")
+    description.add_argument('--clean-noise', action='store_true', help="enforce noise removal from image")
+    description.add_argument('--rescale', action='store_true', help="enforce rescaling of the image")
+    description.add_argument('--plot-intermediate', action='store_true', help="plot intermediate pre-processing steps")
+    description.add_argument('--no-plot-lobes', action='store_true', help="do not plot graphical output for detected lobes")
+    description.add_argument('--workers', type=int, default=1, help="number of parallel processes: images of folders are analyzed in parallel, otherwise the cells of an image or of each time-lapse frame and, with --tile-size, the tiles of the pre-processing (default: 1)")
+    description.add_argument('--tile-size', type=int, help="pavement cells only: filter the image in tiles of at most N x N pixels during pre-processing to bound the memory for very large images (e.g. 4096)")
+    description.add_argument('--low-memory', action='store_true', help="pavement cells only: memory-map uncompressed TIFF images and keep smaller intermediates during pre-processing")
+    description.add_argument('--fast-filter', action='store_true', help="pavement cells only: enhance the cell contours with one fused gaussian filter in 32-bit floats, about twice as fast with results that can differ in single pixels")
+    description.add_argument('--stack', action='store_true', help="pavement cells only: analyze the pages of a multi-page TIFF or the images of a folder in alphabetical order as frames of a time-lapse and track the cells across frames")
+    description.add_argument('--cache', help="pavement cells only: folder of the stage cache, reruns load the pre-processing stages, junctions, contours and graphs that do not depend on changed options from it")
+    description.add_argument('--cache-size', type=float, default=1024, help="maximum size of the stage cache in MB, the least recently used results are removed (default: 1024)")
+    description.add_argument('--visibility-backend', choices=['vectorized', 'sweep', 'indexed', 'shapely'], default='vectorized', help="method that finds the visible node pairs of the visibility graphs, all methods create the same graphs (default: vectorized)")
+    description.add_argument('--pixel-distances', type=int, nargs='+', help="create the visibility graphs for several node distances in px (e.g. 5 10 15), the results of each distance are saved in a folder PixelDistance_N, for other shapes this replaces --resolution")
+
+    comparison = subparsers.add_parser('compare', help="compute the distance matrix of one or more sets of visibility graphs")
+    comparison.add_argument('graphs', nargs='+', help="visibility graph sets (.gpickle files), results are saved in the folder of the first set")
+    comparison.add_argument('--labels', nargs='+', help="one label per graph set, required for more than one set")
+    comparison.add_argument('--pca', action='store_true', help="plot PCA of the distance matrix")
+    comparison.add_argument('--dendrogram', action='store_true', help="plot dendrogram of the distance matrix")
+    return(parser)
+
+def select_files(path):
+    """
+    return file type, file list and ROI input of an image, ROI file or folder like the GUI selection
+    """
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        directoryName = path
+        fileList = [item for sublist in [glob.glob(directoryName + ext) for ext in fileExtensions] for item in sublist]
+        if len(fileList) == 0:
+            return('directory', fileList, False)
+        imageTypes = np.unique([element[-3:] for element in fileList])
+        roiInput = 'roi' in imageTypes or 'ROI' in imageTypes
+        if roiInput and len(imageTypes) != 1:
+            show_Warning("The folder you selected includes ROI files and images. Please remove all non-Roi files or keep only images.")
+            return('directory', None, roiInput)
+        show_Message("Selected image folder: " + directoryName)
+        show_Message("Detected " + str(len(fileList)) + " image files in the folder.")
+        return('directory', fileList, roiInput)
+    else:
+        show_Message("Opened image: " + path)
+        return('image', [path], path[-3:] == 'roi' or path[-3:] == 'ROI')
+
+def describe_pavement_cells(arguments, fileType, fileList, roiInput):
+    """
+    workflow of the shape description for pavement cells
+    """
+    analysis = analysisModes[arguments.analysis]
+    cleanEdges, cleanNoise, changeRescaling, plotIntermediate = int(arguments.clean_edges), int(arguments.clean_noise), int(arguments.rescale), int(arguments.plot_intermediate)
+    plotLobeOutput = 0 if arguments.no_plot_lobes else 1
+    stageCache = None
+    if arguments.cache is not None:
+        stageCache = StageCache(os.path.abspath(arguments.cache), arguments.cache_size * 2**20)
+    if roiInput == True:
+        if analysis != 'Graph extraction':
+            show_Warning("ROI files were selected. No pre-processing is neccessary for these files. Please select 'Graph extraction'.")
+        if analysis == 'Pre-processing':
+            return
+        if fileType == 'image':
+            outputFolder = os.path.splitext(fileList[0])[0]
+        else:
+            outputFolder = ('/').join(fileList[0].split('/')[:-1]) + '/Results'
+        if not os.path.exists(outputFolder):
+            os.mkdir(outputFolder)
+        show_Message("\nStart graph extraction for detected cells.")
+        VisGraph(fileList[0], None, plotIntermediate, arguments.resolution, outputFolder, plotLobeOutput, roiInput, fileType == 'directory', fileList, arguments.visibility_backend, arguments.pixel_distances)
+    elif arguments.stack:
+        if fileType == 'image':
+            outputFolder = os.path.splitext(fileList[0])[0]
+        else:
+            outputFolder = ('/').join(fileList[0].split('/')[:-1]) + '/TimeLapse'
+        frames = list_stack_frames(sorted(fileList))
+        show_Message("\nStart analysis of a time-lapse with " + str(len(frames)) + " frames.")
+        analyze_pavement_cell_stack(frames, outputFolder, analysis, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, arguments.resolution, plotLobeOutput, arguments.visibility_backend, arguments.tile_size, arguments.workers, arguments.low_memory, arguments.fast_filter, stageCache)
+    elif arguments.workers > 1 and len(fileList) > 1:
+        show_Message("\nStart analysis of " + str(len(fileList)) + " images with " + str(arguments.workers) + " processes.")
+        results = run_image_jobs(analyze_pavement_cell_image, fileList, [analysis, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, arguments.resolution, plotLobeOutput, arguments.visibility_backend, arguments.pixel_distances, arguments.tile_size, 1, arguments.low_memory, arguments.fast_filter, stageCache], arguments.workers)
+        for file, result in zip(fileList, results):
+            if result is None:
+                show_Warning("The analysis of " + file + " failed.")
+    else:
+        for file in fileList:
+            show_Message("\nStart analysis of " + file)
+            outputFolder, detectedCells = analyze_pavement_cell_image(file, analysis, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, arguments.resolution, plotLobeOutput, arguments.visibility_backend, arguments.pixel_distances, arguments.tile_size, arguments.workers, arguments.low_memory, arguments.fast_filter, stageCache)
+            if detectedCells is not None:
+                show_Message("..." + str(detectedCells) + " cells were detected")
+
+def describe_other_shapes(arguments, fileType, fileList, roiInput):
+    """
+    workflow of the shape description for other shapes
+    """
+    show_Message("\nStart graph extraction.")
+    outputFolder = "/".join(fileList[0].split('/')[:-1])
+    resolution = arguments.resolution if arguments.resolution is not None else arguments.pixel_distances[0]
+    VisGraphOther(fileList[0], resolution, outputFolder, fileType, fileList, roiInput, arguments.visibility_backend, arguments.pixel_distances, arguments.workers)
+
+def compare_graphs(arguments):
+    """
+    workflow of the shape comparison
+    """
+    graphsDict = dict(zip(dataKeys, arguments.graphs))
+    entriesDict = {}
+    if len(arguments.graphs) > 1:
+        entriesDict = dict(zip(dataKeys, arguments.labels))
+    show_Message("\nStart shape comparison. \n...Selected " + str(len(graphsDict)) + " graph sets for shape comparison.")
+    outputFolder = '/'.join(os.path.abspath(arguments.graphs[0]).split('/')[:-1])
+    Comparison(outputFolder, graphsDict, entriesDict, arguments.pca, arguments.dendrogram)
+
+def validate_arguments(parser, arguments):
+    """
+    check the arguments the GUI validates before starting the analysis
+    """
+    if arguments.command == 'describe':
+        if not os.path.exists(arguments.path):
+            parser.error("the selected image or folder does not exist: " + arguments.path)
+        if arguments.resolution is None and ((arguments.shapes == 'other' and arguments.pixel_distances is None) or (arguments.shapes == 'pavement' and arguments.analysis != 'preprocessing')):
+            parser.error("no resolution was provided, please use --resolution")
+        if arguments.workers < 1:
+            parser.error("the number of parallel processes has to be at least 1")
+        if arguments.pixel_distances is not None and min(arguments.pixel_distances) < 1:
+            parser.error("the node distances have to be at least 1 pixel")
+        if arguments.tile_size is not None and arguments.tile_size < 1:
+            parser.error("the tile size has to be at least 1 pixel")
+        if arguments.stack and arguments.shapes == 'other':
+            parser.error("time-lapse stacks can only be analyzed for pavement cells")
+        if arguments.pixel_distances is not None and arguments.stack:
+            parser.error("node distance sweeps cannot be combined with time-lapse stacks")
+        if arguments.cache_size <= 0:
+            parser.error("the size of the stage cache has to be positive")
+    else:
+        if len(arguments.graphs) > len(dataKeys):
+            parser.error("at most " + str(len(dataKeys)) + " graph sets can be compared")
+        for graphSet in arguments.graphs:
+            if not os.path.isfile(graphSet):
+                parser.error("the selected graph set does not exist: " + graphSet)
+        if len(arguments.graphs) > 1 and (arguments.labels is None or len(arguments.labels) != len(arguments.graphs)):
+            parser.error("please provide one label per graph set with --labels")
+
+def run_batch(argv=None):
+    """
+    run the shape description or comparison from the command line and return the exit code
+    """
+    parser = create_parser()
+    arguments = parser.parse_args(argv)
+    validate_arguments(parser, arguments)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.FileHandler(arguments.log), logging.StreamHandler()])
+    warningCounter = WarningCounter()
+    logging.getLogger().addHandler(warningCounter)
+    try:
+        if arguments.command == 'describe':
+            fileType, fileList, roiInput = select_files(arguments.path)
+            if fileList is None:
+                return(EXIT_FAILURE)
+            if len(fileList) == 0:
+                show_Warning("No images or ROI files were found in the selected folder.")
+                return(EXIT_FAILURE)
+            if arguments.shapes == 'pavement':
+                describe_pavement_cells(arguments, fileType, fileList, roiInput)
+            else:
+                describe_other_shapes(arguments, fileType, fileList, roiInput)
+        else:
+            compare_graphs(arguments)
+    except Exception:
+        logging.exception("GraVis failed.")
+        return(EXIT_FAILURE)
+    finally:
+        logging.getLogger().removeHandler(warningCounter)
+    if warningCounter.warnings > 0:
+        return(EXIT_WARNINGS)
+    return(EXIT_SUCCESS)
@@ -5,33 +5,13 @@ import tkinter.scrolledtext as ScrolledText
 from PIL import Image, ImageTk, ImageDraw
 import logging
 import os
-import sys
+import queue
 import numpy as np
-from numpy import linalg
 import glob
-import skimage
-from skimage import io, color, morphology, filters, transform, measure, exposure, restoration, feature, draw
-from skimage.morphology import disk
-from skimage.util import dtype
-import scipy as sp
-from scipy import ndimage, stats, spatial, cluster
-import itertools
-import pandas as pd
-import networkx as nx
-from packaging.version import Version
-import math
-import shapely
-from shapely import geometry
-import pickle
-import time
-import sklearn
-from sklearn import decomposition
 import read_roi
 import matplotlib
-from matplotlib.legend_handler import HandlerPatch
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-plt.rcParams.update({'figure.max_open_warning': 0})
+matplotlib.use("Agg")
+from GraVis.ShapeAnalysis import Preprocessor, VisGraph, VisGraphOther, Comparison, AnalysisJob, run_image_jobs, analyze_pavement_cell_image, show_Message, check_cancelled
 
 # add class for logging messages
 class LogHandler(logging.Handler):
@@ -39,25 +19,25 @@ class LogHandler(logging.Handler):
     def __init__(self, text):
         logging.Handler.__init__(self)
         self.text = text
+        self.records = queue.Queue()
+        self.text.after(100, self.show_records)
 
     def emit(self, record):
-        msg = self.format(record)
-        def append():
+        self.records.put((record.levelno, self.format(record), record.getMessage()))
+
+    def show_records(self):
+        """
+        show queued messages in the main thread, messages can also be logged by background jobs
+        """
+        while not self.records.empty():
+            level, msg, warning = self.records.get()
             self.text.configure(state='normal')
             self.text.insert(END, msg + '\n')
             self.text.configure(state='disabled')
             self.text.yview(END)
-        self.text.after(0, append)
-
-# create circles for legend in visual output
-class HandlerEllipse(HandlerPatch):
-    def create_artists(self, legend, orig_handle,
-                       xdescent, ydescent, width, height, fontsize, trans):
-        center = 0.5 * width - 0.5 * xdescent, 0.5 * height - 0.5 * ydescent
-        p = matplotlib.patches.Ellipse(xy=center, width=width*0.5, height=width*0.5)
-        self.update_prop(p, orig_handle, legend)
-        p.set_transform(trans)
-        return [p]
+            if level >= logging.WARNING:
+                messagebox.showinfo("Warning", warning)
+        self.text.after(100, self.show_records)
 
 ##### GUI #####
 class ShapeGui:
@@ -68,6 +48,9 @@ class ShapeGui:
         self.lastDir = ""
         self.fileType = ""
         self.fileList = ""
+        self.varWorkers = StringVar(value='1')
+        self.varProgress = StringVar()
+        self.job = None
         self.scriptPath = os.path.abspath(os.getcwd())
 
         ### settings for adjustable GUI size
@@ -124,6 +107,8 @@ class ShapeGui:
         self.logger = logging.getLogger()
         self.logger.addHandler(self.textHandler)
         self.scrolltext.grid(row=3, column=2, columnspan=2, pady=10)
+        self.labelProgressDescription = Label(self.FrameDescription, textvariable=self.varProgress, anchor=W, justify=LEFT).grid(row=4, column=2, sticky=W)
+        self.cancelDescription = Button(self.FrameDescription, text="Cancel Analysis", command=self.cancel_job, highlightbackground='medium sea green').grid(row=4, column=3, sticky=E)
 
         ### shape comparison Frame
         self.FrameComparison = Frame(self.tabComparison, width=self.widthTab, height=self.height)
@@ -146,6 +131,8 @@ class ShapeGui:
         self.checkPCA = Checkbutton(self.settingsComparison, text="plot PCA", variable=self.varPCA).grid(row=1, column=0, sticky=W)
         self.checkDend = Checkbutton(self.settingsComparison, text="plot dendrogram", variable=self.varDend).grid(row=2, column=0, sticky=W)
         self.RunComparison = Button(self.settingsComparison, text="Run Comparison", highlightbackground='medium sea green', command=self.start_comparison).grid(row=3, column=0, padx=20, pady=10)
+        self.cancelComparison = Button(self.settingsComparison, text="Cancel Comparison", highlightbackground='medium sea green', command=self.cancel_job).grid(row=4, column=0, padx=20)
+        self.labelProgressComparison = Label(self.settingsComparison, textvariable=self.varProgress, anchor=W, justify=LEFT).grid(row=5, column=0, sticky=W)
         self.quitComparison = Button(self.FrameComparison, text="Exit", command=self.root.destroy, highlightbackground='medium sea green').grid(row=0, column=2, sticky=E)
         self.canvasPlotPCA = Canvas(self.FrameComparison, width = int(self.widthTab*0.75), height=int(self.widthTab*0.75))
         self.canvasPlotPCA.grid(row=1, column=2, rowspan=3, sticky=NE)
@@ -283,10 +270,17 @@ class ShapeGui:
             self.parametersOther.grid(row=3, column=0, sticky='nsew', columnspan=2)
             self.labelAnalysisOther = Label(self.parametersOther, text="Please provide binary images for the analysis or \n ROI files of other objects. If an image folder was selected, \nthe visibility graphs of all images in the folder \nwill be saved in one file.", anchor=W, justify=LEFT).grid(row=0, column=0, padx=20, pady=20, sticky=W)
             self.graphextractionSettings(self.parametersOther)
+            self.parallelSettings(self.parametersOther)
             self.RunDescription = Button(self.parametersOther, text="Run Analysis", highlightbackground='medium sea green', command=self.start_description_other)
             self.labelResolution.grid(row=1, column=0, padx=20, sticky=W)
             self.addResolution.grid(row=2, column=0, padx=20, pady=10, sticky=W)
-            self.RunDescription.grid(row=3, column=0)
+            self.labelBackend.grid(row=3, column=0, padx=20, sticky=W)
+            self.dropdownBackend.grid(row=4, column=0, padx=20, pady=10, sticky=W)
+            self.labelPixelDistances.grid(row=5, column=0, padx=20, sticky=W)
+            self.addPixelDistances.grid(row=6, column=0, padx=20, pady=10, sticky=W)
+            self.labelWorkers.grid(row=7, column=0, padx=20, sticky=W)
+            self.addWorkers.grid(row=8, column=0, padx=20, pady=10, sticky=W)
+            self.RunDescription.grid(row=9, column=0)
 
     def show_settings_PCs(self, ev):
         """
@@ -297,6 +291,7 @@ class ShapeGui:
             self.parameterChoices.grid(row=1, column=0, sticky='nsew')
             self.preprocessingSettings(self.parameterChoices)
             self.graphextractionSettings(self.parameterChoices)
+            self.parallelSettings(self.parameterChoices)
             self.RunDescription = Button(self.parameterChoices, text="Run Analysis", highlightbackground='medium sea green', command=self.start_description_PCs)
             self.labelPreprocessing.grid(row=0, column=0, padx=20, pady=10, sticky=W)
             self.checkEdges.grid(row=1, column=0, padx=20, sticky=W)
@@ -306,29 +301,45 @@ class ShapeGui:
             self.checkPlotLobes.grid(row=5, column=0, padx=20, sticky=W)
             self.labelResolution.grid(row=6, column=0, padx=20, sticky=W)
             self.addResolution.grid(row=7, column=0, padx=20, sticky=W)
-            self.RunDescription.grid(row=8, column=0)
+            self.labelBackend.grid(row=8, column=0, padx=20, sticky=W)
+            self.dropdownBackend.grid(row=9, column=0, padx=20, sticky=W)
+            self.labelPixelDistances.grid(row=10, column=0, padx=20, sticky=W)
+            self.addPixelDistances.grid(row=11, column=0, padx=20, sticky=W)
+            self.labelWorkers.grid(row=12, column=0, padx=20, sticky=W)
+            self.addWorkers.grid(row=13, column=0, padx=20, sticky=W)
+            self.RunDescription.grid(row=14, column=0)
         elif self.varAnalysis.get() == 'Pre-processing':
             self.parameterChoicesPP = Frame(self.parametersPCs, width=self.widthTab)
             self.parameterChoicesPP.grid(row=1, column=0, sticky='nsew')
             self.preprocessingSettings(self.parameterChoicesPP)
+            self.parallelSettings(self.parameterChoicesPP)
             self.RunDescription = Button(self.parameterChoicesPP, text="Run Analysis", highlightbackground='medium sea green', command=self.start_description_PCs)
             self.labelPreprocessing.grid(row=1, column=0, padx=20, pady=10, sticky=W)
             self.checkEdges.grid(row=2, column=0, padx=20, sticky=W)
             self.checkNoise.grid(row=3, column=0, padx=20, sticky=W)
             self.checkRescaling.grid(row=4, column=0, padx=20, sticky=W)
             self.checkPlot.grid(row=5, column=0, padx=20, sticky=W)
-            self.RunDescription.grid(row=6, column=0)
+            self.labelWorkers.grid(row=6, column=0, padx=20, sticky=W)
+            self.addWorkers.grid(row=7, column=0, padx=20, sticky=W)
+            self.RunDescription.grid(row=8, column=0)
         else:
             self.parameterChoicesGE = Frame(self.parametersPCs, width=self.widthTab)
             self.parameterChoicesGE.grid(row=1, column=0, sticky='nsew')
             self.labelGraphextraction = Label(self.parameterChoicesGE, text="This step should only be selected, if the pre-processing \nof this image was already done previously or ROI files are used.", anchor=W, justify=LEFT)
             self.graphextractionSettings(self.parameterChoicesGE)
+            self.parallelSettings(self.parameterChoicesGE)
             self.RunDescription = Button(self.parameterChoicesGE, text="Run Analysis", highlightbackground='medium sea green', command=self.start_description_PCs)
             self.labelGraphextraction.grid(row=1, column=0, padx=20, sticky=W)
             self.checkPlotLobes.grid(row=2, column=0, padx=20, sticky=W)
             self.labelResolution.grid(row=3, column=0, padx=20, sticky=W)
             self.addResolution.grid(row=4, column=0, padx=20, sticky=W)
-            self.RunDescription.grid(row=5, column=0)
+            self.labelBackend.grid(row=5, column=0, padx=20, sticky=W)
+            self.dropdownBackend.grid(row=6, column=0, padx=20, sticky=W)
+            self.labelPixelDistances.grid(row=7, column=0, padx=20, sticky=W)
+            self.addPixelDistances.grid(row=8, column=0, padx=20, sticky=W)
+            self.labelWorkers.grid(row=9, column=0, padx=20, sticky=W)
+            self.addWorkers.grid(row=10, column=0, padx=20, sticky=W)
+            self.RunDescription.grid(row=11, column=0)
 
     def preprocessingSettings(self, settings):
         """
@@ -356,112 +367,277 @@ class ShapeGui:
         else:
             self.labelResolution = Label(settings, text="\n\nPixel distance px/node: (e.g. 10 px/node)")
         self.addResolution = Entry(settings, textvariable=self.varResolution)
+        self.varBackend = StringVar(value='vectorized')
+        self.labelBackend = Label(settings, text="\nVisibility backend: (all backends create the same graphs)")
+        self.dropdownBackend = OptionMenu(settings, self.varBackend, 'vectorized', 'sweep', 'indexed', 'shapely')
+        self.varPixelDistances = StringVar()
+        self.labelPixelDistances = Label(settings, text="\nNode distances of a sweep in px: (optional, e.g. 5 10 15)")
+        self.addPixelDistances = Entry(settings, textvariable=self.varPixelDistances)
+
+    def get_pixel_distances(self):
+        """
+        read the node distances of a sweep, returns None without a sweep and False for invalid entries
+        """
+        if self.varPixelDistances.get().strip() == "":
+            return(None)
+        try:
+            pixelDistances = [int(distance) for distance in self.varPixelDistances.get().split()]
+        except ValueError:
+            pixelDistances = [0]
+        if min(pixelDistances) < 1:
+            messagebox.showinfo("Warning", "The node distances of a sweep have to be positive integers separated by spaces (i.e. 5 10 15).")
+            return(False)
+        return(pixelDistances)
+
+    def parallelSettings(self, settings):
+        """
+        settings for the parallel analysis of image folders and cells
+        """
+        self.labelWorkers = Label(settings, text="\nNumber of parallel processes: (images of folders or cells of single images)")
+        self.addWorkers = Entry(settings, textvariable=self.varWorkers)
+
+    def get_number_of_workers(self):
+        """
+        read the number of parallel processes, invalid entries fall back to a serial analysis
+        """
+        try:
+            return(max(int(self.varWorkers.get()), 1))
+        except ValueError:
+            messagebox.showinfo("Warning", "The number of parallel processes has to be an integer. The images are analyzed one after another.")
+            return(1)
+
+    def check_resolution(self):
+        """
+        check the resolution provided by the user
+        """
+        if self.varResolution.get() == "":
+            messagebox.showinfo("Warning", "No resolution was provided. Please enter the image resolution and run the analysis again.")
+            return(False)
+        if ',' in self.varResolution.get():
+            messagebox.showinfo("Warning", "Please use a dot for floats (i.e. 0.23 µm/px).")
+            return(False)
+        return(True)
+
+    def read_settings_PCs(self):
+        """
+        read the settings for PCs before the analysis is started in the background
+        """
+        self.analysis = self.varAnalysis.get()
+        self.preprocessingOptions = [0, 0, 0, 0]
+        self.plotLobeOutput = 0
+        self.visibilityBackend = 'vectorized'
+        self.pixelDistances = None
+        if self.analysis != 'Graph extraction':
+            if self.roiInput == False:
+                self.preprocessingOptions = [self.varEdges.get(), self.varNoise.get(), self.varRescaling.get(), self.varPlot.get()]
+            else:
+                messagebox.showinfo("Warning", "ROI files were selected. No pre-processing is neccessary for these files. Please select 'Graph extraction'.")
+        if self.analysis != 'Pre-processing':
+            if self.check_resolution() == False:
+                return(False)
+            self.pixelDistances = self.get_pixel_distances()
+            if self.pixelDistances is False:
+                return(False)
+            self.resolution = self.varResolution.get()
+            self.plotLobeOutput = self.varPlotLobes.get()
+            self.visibilityBackend = self.varBackend.get()
+        self.numberOfWorkers = self.get_number_of_workers()
+        return(True)
 
     def start_description_PCs(self):
         """
         workflow for the shape description framework
         """
-        self.generatedOutput = False
-        self.roiFileList = False
+        if self.job_is_running():
+            return
         if self.fileName != "":
-            if self.fileType == "image":
-                self.analyze_image()
-            else:
-                if self.roiInput == False:
-                    for file in self.fileList:
-                        self.fileName = file
-                        self.display_original_image(self.fileName)
-                        self.canvasOriginal.update()
-                        self.analyze_image()
-                else:
-                    self.roiFileList = True
-                    self.fileName = self.fileList[0]
-                    self.analyze_image()
-            if self.generatedOutput == True:
-                messagebox.showinfo("GraVis", "Analysis is done. \n\nResults were saved into: \n\n" + self.outputFolder)
-                self.filename = ""
+            if self.read_settings_PCs() == True:
+                self.generatedOutput = False
+                self.roiFileList = False
+                self.run_job(self.finish_description_PCs, self.describe_PCs)
         else:
             messagebox.showinfo("Warning", "No image was selected. Please open an image first before starting the analysis.")
 
+    def describe_PCs(self):
+        """
+        analyze the selected image or folder in the background job
+        """
+        if self.fileType == "image":
+            self.analyze_image()
+        else:
+            if self.roiInput == False and self.numberOfWorkers > 1:
+                self.analyze_folder_in_parallel(self.numberOfWorkers)
+            elif self.roiInput == False:
+                for file in self.fileList:
+                    check_cancelled()
+                    self.fileName = file
+                    self.call_in_gui(self.display_original_image, self.fileName)
+                    self.analyze_image()
+            else:
+                self.roiFileList = True
+                self.fileName = self.fileList[0]
+                self.analyze_image()
+
+    def finish_description_PCs(self):
+        """
+        tell the user where the results of the PC analysis were saved
+        """
+        if self.generatedOutput == True:
+            messagebox.showinfo("GraVis", "Analysis is done. \n\nResults were saved into: \n\n" + self.outputFolder)
+            self.filename = ""
+
     def analyze_image(self):
         """
         processing steps for PCs depending on user input
         """
         if self.roiFileList == False:
-            self.outputFolder = self.fileName.split('.')[:-1][0]
+            self.outputFolder = os.path.splitext(self.fileName)[0]
         else:
             self.outputFolder = ('/').join(self.fileName.split('/')[:-1]) + '/Results'
         if not os.path.exists(self.outputFolder):
             os.mkdir(self.outputFolder)
-        if self.varAnalysis.get() == 'Pre-processing':
+        self.preprocessedImage = None
+        if self.analysis == 'Pre-processing':
             self.start_preprocessing()
-        elif self.varAnalysis.get() == 'Graph extraction':
-            self.preprocessedImage = None
+        elif self.analysis == 'Graph extraction':
             self.start_graphextraction()
         else:
             self.start_preprocessing()
             self.start_graphextraction()
 
+    def analyze_folder_in_parallel(self, numberOfWorkers):
+        """
+        run the pipeline for all images of the folder in parallel processes, every image keeps its own output folder
+        """
+        resolution = self.resolution if self.analysis != 'Pre-processing' else None
+        show_Message("\nStart analysis of " + str(len(self.fileList)) + " images with " + str(numberOfWorkers) + " processes.")
+        results = run_image_jobs(analyze_pavement_cell_image, self.fileList, [self.analysis] + self.preprocessingOptions + [resolution, self.plotLobeOutput, self.visibilityBackend, self.pixelDistances], numberOfWorkers, onImageDone=self.show_finished_image)
+        self.outputFolder = "/".join(self.fileList[0].split('/')[:-1])
+        self.generatedOutput = any(result is not None for result in results)
+
+    def show_finished_image(self, index, file, result):
+        """
+        show the original image and the number of detected cells of an image finished in parallel
+        """
+        if result is not None:
+            outputFolder, detectedCells = result
+            self.fileName = file
+            self.call_in_gui(self.display_original_image, file)
+            if detectedCells is not None:
+                show_Message("..." + str(detectedCells) + " cells were detected in " + file.split('/')[-1])
+
     def start_preprocessing(self):
         """
         start pre-processing pipeline
         """
         if self.roiInput == False:
+            cleanEdges, cleanNoise, changeRescaling, plotIntermediate = self.preprocessingOptions
             msg = ""
-            if self.varEdges.get() == 1:
+            if cleanEdges == 1:
                 msg += "Selected artificial edge removal. "
-            if self.varNoise.get() == 1:
+            if cleanNoise == 1:
                 msg += "Selected noise removal. "
-            if self.varRescaling.get() == 1:
+            if changeRescaling == 1:
                 msg += "Selected image rescaling. "
-            if self.varPlot.get() == 1:
+            if plotIntermediate == 1:
                 msg += "Selected plotting of intermediate steps."
-            if self.varPlotLobes.get() == 1:
+            if self.plotLobeOutput == 1:
                 msg += "Selected plotting of lobe positions."
             msg += "\nStart pre-processing of the image."
             show_Message(msg)
-            self.preprocessedImage = Preprocessor(self.fileName, self.varEdges.get(), self.varNoise.get(), self.varRescaling.get(), self.varPlot.get(), self.outputFolder)
-            self.display_segmented_image('/LabeledPavementCells.png', self.preprocessedImage.pathToFolder, "Show pre-processed image.")
+            self.preprocessedImage = Preprocessor(self.fileName, cleanEdges, cleanNoise, changeRescaling, plotIntermediate, self.outputFolder)
+            self.call_in_gui(self.display_segmented_image, '/LabeledPavementCells.png', self.preprocessedImage.pathToFolder, "Show pre-processed image.")
             show_Message("..." + str(self.preprocessedImage.labels-1) + " cells were detected")
-        else:
-            messagebox.showinfo("Warning", "ROI files were selected. No pre-processing is neccessary for these files. Please select 'Graph extraction'.")
 
     def start_graphextraction(self):
         """
         start graph extraction pipeline
         """
-        if self.varResolution.get() != "":
-            if ',' in self.varResolution.get():
-                messagebox.showinfo("Warning", "Please use a dot for floats (i.e. 0.23 µm/px).")
-            else:
-                show_Message("\nStart graph extraction for detected cells.")
-                self.visibilityGraphs = VisGraph(self.fileName, self.preprocessedImage, self.varPlot.get(), self.varResolution.get(), self.outputFolder, self.varPlotLobes.get(), self.roiInput, self.roiFileList, self.fileList)
-                self.generatedOutput = True
-        else:
-            messagebox.showinfo("Warning", "No resolution was provided. Please enter the image resolution and run the analysis again.")
+        show_Message("\nStart graph extraction for detected cells.")
+        self.visibilityGraphs = VisGraph(self.fileName, self.preprocessedImage, self.preprocessingOptions[3], self.resolution, self.outputFolder, self.plotLobeOutput, self.roiInput, self.roiFileList, self.fileList, self.visibilityBackend, self.pixelDistances, self.numberOfWorkers)
+        self.generatedOutput = True
 
     def start_description_other(self):
         """
         pipeline for description of other shapes
         """
+        if self.job_is_running():
+            return
         if self.fileName != "":
             show_Message("\nStart graph extraction.")
             self.outputFolder = "/".join(self.fileName.split('/')[:-1])
-            if self.varResolution.get() != "":
-                if ',' in self.varResolution.get():
-                    messagebox.showinfo("Warning", "Please use a dot for floats (i.e. 0.23 µm/px).")
-                else:
-                    self.visibilityGraphs = VisGraphOther(self.fileName, self.varResolution.get(), self.outputFolder, self.fileType, self.fileList, self.roiInput)
-                    messagebox.showinfo("GraVis", "Analysis is done. \n\nResults were saved into: \n\n" + self.outputFolder)
-                    if self.roiInput == False:
-                        if self.fileType == 'image':
-                            self.display_segmented_image('/LabeledShapes.png', self.outputFolder, "")
-                        else:
-                            self.display_segmented_image('/LabeledShapes_1.png', self.outputFolder, "")
-                    self.filename = ""
+            pixelDistances = self.get_pixel_distances()
+            if self.check_resolution() == True and pixelDistances is not False:
+                self.run_job(self.finish_description_other, VisGraphOther, self.fileName, self.varResolution.get(), self.outputFolder, self.fileType, self.fileList, self.roiInput, self.varBackend.get(), pixelDistances, self.get_number_of_workers())
         else:
             messagebox.showinfo("Warning", "No image was selected. Please open an image first before starting the analysis.")
 
+    def finish_description_other(self):
+        """
+        show the labeled shapes and tell the user where the results were saved
+        """
+        self.visibilityGraphs = self.job.result
+        messagebox.showinfo("GraVis", "Analysis is done. \n\nResults were saved into: \n\n" + self.outputFolder)
+        if self.roiInput == False:
+            if self.fileType == 'image':
+                self.display_segmented_image('/LabeledShapes.png', self.outputFolder, "")
+            else:
+                self.display_segmented_image('/LabeledShapes_1.png', self.outputFolder, "")
+        self.filename = ""
+
+    def run_job(self, onDone, function, *arguments):
+        """
+        run an analysis as background job so that the GUI stays responsive
+        """
+        self.job = AnalysisJob(function, *arguments).start()
+        self.root.after(100, self.poll_job, self.job, onDone)
+
+    def poll_job(self, job, onDone):
+        """
+        handle the events of the background job in the main thread
+        """
+        while not job.events.empty():
+            kind, value = job.events.get()
+            if kind == 'progress':
+                self.varProgress.set(value.strip())
+            elif kind == 'gui':
+                function, arguments = value
+                function(*arguments)
+            elif kind == 'done':
+                self.varProgress.set("")
+                onDone()
+                return
+            elif kind == 'cancelled':
+                self.varProgress.set("Analysis was cancelled.")
+                return
+            elif kind == 'failed':
+                self.varProgress.set("Analysis failed: " + str(value))
+                return
+        self.root.after(100, self.poll_job, job, onDone)
+
+    def call_in_gui(self, function, *arguments):
+        """
+        let the main thread update the GUI for the background job
+        """
+        self.job.report('gui', (function, arguments))
+
+    def job_is_running(self):
+        """
+        check if an analysis is still running
+        """
+        if self.job is not None and self.job.is_running():
+            messagebox.showinfo("Warning", "An analysis is still running. Please wait until it is done or cancel it first.")
+            return(True)
+        return(False)
+
+    def cancel_job(self):
+        """
+        cancel the running analysis after the current cell or image
+        """
+        if self.job is not None and self.job.is_running():
+            self.job.cancel()
+            self.varProgress.set("Cancel analysis after the current cell or image...")
+
     def select_graphs(self):
         """
         select visibility graphs for shape comparison
@@ -513,2018 +689,27 @@ class ShapeGui:
         """
         start comparison pipeline and show plots if selected by user
         """
+        if self.job_is_running():
+            return
         if len(self.graphsDict) != 0:
-            self.varPCA.get()
-            self.varDend.get()
             show_Message("\nStart shape comparison. \n...Selected " + str(len(self.graphsDict)) + " graph sets for shape comparison.")
             self.outputFolder = '/'.join(self.graphsDict['data1'].split('/')[:-1])
-            Comparison(self.outputFolder, self.graphsDict, self.entriesDict, self.varPCA.get(), self.varDend.get())
-            if self.varPCA.get() == True:
+            inputLabels = {key: self.entriesDict[key].get() for key in self.entriesDict.keys()}
+            self.run_job(self.finish_comparison, Comparison, self.outputFolder, dict(self.graphsDict), inputLabels, self.varPCA.get(), self.varDend.get())
+        else:
+            messagebox.showinfo("Warning", "No graph was selected. Please select graphs first before starting the comparison.")
+
+    def finish_comparison(self):
+        """
+        show the plots selected by the user after the comparison
+        """
+        if len(self.job.result.visibilityGraphsAll) <= 200:
+            if self.job.result.plotPCA == True:
                 self.imagePCA = self.display_image(self.outputFolder + '/PCA_DistanceMatrix.png', 0.75, None)
                 self.canvasPlotPCA.create_image(0, 0, anchor=NW, image=self.imagePCA)
                 self.canvasPlotPCA.config(background=self.origColor)
-            if self.varDend.get() == True:
+            if self.job.result.plotDendrogram == True:
                 self.imageDend = self.display_image(self.outputFolder + '/Dendrogram_DistanceMatrix.png', 0.75, None)
                 self.canvasPlotDend.create_image(0, 0, anchor=NW, image=self.imageDend)
                 self.canvasPlotDend.config(background=self.origColor)
             messagebox.showinfo("GraVis", "Comparison is done. \n\nResults were saved into: \n\n" + self.outputFolder)
-        else:
-            messagebox.showinfo("Warning", "No graph was selected. Please select graphs first before starting the comparison.")
-
-class Preprocessor:
-
-    def __init__(self, filename, cleanEdges, changeRescaling, cleanNoise, plotIntermediate, outputFolder):
-        self.filename = filename
-        self.pathToFolder = outputFolder
-
-        # parameters
-        self.cleanEdges = cleanEdges
-        self.changeRescaling = changeRescaling
-        self.cleanNoise = cleanNoise
-        self.plotIntermediate = plotIntermediate
-
-        # pre-processing pipeline
-        self.rawImage = self.import_image(self.filename)
-        self.backgroundImage = self.detect_edges(self.rawImage)
-        self.detect_noisy_image(self.backgroundImage)
-        self.zeroPixelImage = self.detect_white_pixels(self.rawImage)
-        self.cleanImage = self.remove_artificial_edges(self.zeroPixelImage)
-        self.branchlessSkeleton, self.binaryImage, self.skeletonImage = self.skeletonize_image(self.cleanImage)
-        self.labeledImage, self.labels = sp.ndimage.label(~self.branchlessSkeleton)
-        self.plot_labeled_image(self.labeledImage, self.labels)
-
-        if self.plotIntermediate == 1:
-            skimage.io.imsave(self.pathToFolder + '/binaryImage.png', skimage.img_as_uint(self.binaryImage))
-            skimage.io.imsave(self.pathToFolder + '/cleanedImage.png', skimage.img_as_uint(self.cleanImage))
-            skimage.io.imsave(self.pathToFolder + '/skeletonImage.png', skimage.img_as_uint(self.skeletonImage))
-            skimage.io.imsave(self.pathToFolder + '/branchlessSkeleton.png', skimage.img_as_uint(self.branchlessSkeleton))
-
-    ### FUNCTIONS ###
-    def import_image(self, filename):
-        """
-        import image from filename and convert to 8-bit 2D image
-        """
-        show_Message("...Load image and convert to grayscale")
-        fileType = filename.split('.')[-1]
-        if fileType in ['tif', 'TIF', 'tiff', 'TIFF']:
-            rawImage = skimage.io.imread(filename, plugin='tifffile')
-        else:
-            rawImage = skimage.io.imread(filename)
-        if len(rawImage.shape) > 2 and rawImage.shape[2] > 2:
-            rawImage = skimage.color.rgb2gray(rawImage)
-        if rawImage.dtype != 'uint8':
-            rawImage = skimage.util.img_as_ubyte(skimage.exposure.rescale_intensity(rawImage))
-        return(rawImage)
-
-    def detect_edges(self, rawImage):
-        """
-        use Sobel filter and probabilistic Hough lines to detect artificial edges from image stitching
-        """
-        backgroundImage = rawImage > 25
-        backgroundImage = skimage.morphology.remove_small_objects(backgroundImage, 500)
-        backgroundImage = skimage.morphology.remove_small_holes(backgroundImage, 500)
-        sobelImage = skimage.filters.sobel(backgroundImage)
-        houghLines = skimage.transform.probabilistic_hough_line(sobelImage, threshold=50, line_length=100, line_gap=0)
-        if len(houghLines) != 0:
-            self.cleanEdges = 1
-            show_Message("...Artificial edges were detected in the image and will be removed.")
-        return(backgroundImage)
-
-    def detect_noisy_image(self, backgroundImage):
-        """
-        calculate noise of image by calculating the ratio of background pixels and image resize
-        """
-        noiseGrade = np.sum(backgroundImage) / backgroundImage.size
-        if noiseGrade > 0.7:
-            self.cleanNoise = 1
-            show_Message("...The image is very noisy and will be cleaned.")
-
-    def detect_white_pixels(self, rawImage):
-        """
-        calculate the ratio of 0-pixels in the image to infer if intensity rescaling is neccessary
-        """
-        zeroPixelImage = rawImage == 0
-        zeroPixelImage = skimage.morphology.remove_small_objects(zeroPixelImage, 500)
-        zeroPixelRatio = np.sum(zeroPixelImage) / zeroPixelImage.size
-        if zeroPixelRatio > 0.6:
-            self.changeRescaling = 1
-            show_Message("...The image rescaling was changed.")
-        return(zeroPixelImage)
-
-    def remove_artificial_edges(self, zeroPixelImage):
-        """
-        remove artificial edges from the image
-        """
-        if self.cleanEdges == 1:
-            cleanImage = self.rawImage.copy()
-            zeroPixelLabelImage, zeroPixelLabels = sp.ndimage.label(zeroPixelImage)
-            zeroPixelBorders = keep_labels_on_border(zeroPixelLabelImage)
-            zeroPixelBordersLabelImage, _ = sp.ndimage.label(zeroPixelBorders)
-            zeroPixelBordersRP = skimage.measure.regionprops(zeroPixelBordersLabelImage)
-            edgeContours = self.detect_edge_contours(zeroPixelBordersRP, zeroPixelBordersLabelImage)
-            for idx in range(len(edgeContours)):
-                contourRescaled = self.rescale_contour_to_original(edgeContours[idx])
-                cleanImage = self.remove_pixels_in_periphery(contourRescaled, cleanImage)
-        else:
-            cleanImage = self.rawImage.copy()
-        return(cleanImage)
-
-    def detect_edge_contours(self, regionProps, labeledImage):
-        """
-        find the contour of all artificial edges
-        """
-        edgeContourList = []
-        for idx in range(len(regionProps)):
-            if regionProps[idx].euler_number == 1:
-                imageLabel = labeledImage == idx + 1
-                edgeContour = find_edge_contour(imageLabel)
-                edgeContourList.append(edgeContour)
-        return(edgeContourList)
-
-    def rescale_contour_to_original(self, contour):
-        """
-        rescale contours back to original image shape
-        """
-        contourRescaled = contour-2
-        for idx, (xPos,yPos) in reversed(list(enumerate(contourRescaled))):
-            if xPos <= 1 or xPos >= self.rawImage.shape[0]-1 or yPos <= 1 or yPos >= self.rawImage.shape[1]-1:
-                contourRescaled = np.delete(contourRescaled, idx, 0)
-        return(contourRescaled)
-
-    def remove_pixels_in_periphery(self, contourRescaled, cleanImage):
-        """
-        remove pixels in periphery of contour
-        """
-        contourPixels = {}
-        listOfCorrectedPixels = []
-        xLen, yLen = cleanImage.shape[0] - 1, cleanImage.shape[1] - 1
-        for idx, (xPos, yPos) in reversed(list(enumerate(contourRescaled))):
-            window = cleanImage[xPos-1:xPos+2, yPos-1:yPos+2]
-            orientContourPixel = contour_orientation(window)
-            for pxl in range(len(orientContourPixel)):
-                if pxl < 2:
-                    contourPixels[(xPos, yPos)] = [orientContourPixel[pxl]]
-                    listOfCorrectedPixels = measure_intensity_along_contour(cleanImage, xPos, yPos, orientContourPixel[pxl], listOfCorrectedPixels)
-        listOfCorrectedPixelsSorted = sorted(listOfCorrectedPixels)
-        correctEdges = self.calculate_consecutive_difference(listOfCorrectedPixelsSorted)
-
-        for start, end in correctEdges:
-            edgePixels = listOfCorrectedPixelsSorted[int(start):int(end)]
-            for xPos, yPos in edgePixels:
-                pixelOrientation = contourPixels[(xPos, yPos)]
-                for orient in pixelOrientation:
-                    xmin, xmax, ymin, ymax = self.define_pixel_periphery(xPos, yPos, orient, xLen, yLen)
-                    cleanImage[xmin:xmax, ymin:ymax] = 0
-                del contourPixels[xPos, yPos]
-
-        for xPos, yPos in contourPixels:
-            xmin, xmax = bounds(xPos-5, 0, xLen), bounds(xPos+6, 0, xLen)
-            ymin, ymax = bounds(yPos-5, 0, yLen), bounds(yPos+6, 0, yLen)
-            cleanImage[xmin:xmax, ymin:ymax] = 0
-
-        cleanImage[:10, :] = 0
-        cleanImage[-9:, :] = 0
-        cleanImage[:, :10] = 0
-        cleanImage[:, -9:] = 0
-        return(cleanImage)
-
-    def calculate_consecutive_difference(self, sequence):
-        """
-        calculate difference for all consecutive point coordinates in an array and return a range of at least 50 continous, consecutive points (artificial edge)
-        """
-        correctEdges = []
-        consecutiveDifference = np.diff(sequence, axis=0)
-        differenceDistances = np.sqrt((consecutiveDifference ** 2).sum(axis=1))
-        groupedDifferences = np.array(list([value, len(list(counts))] for value, counts in itertools.groupby(differenceDistances)))
-        consecutiveEdges = np.where(groupedDifferences[:,1] > 50)
-        for idx in consecutiveEdges[0]:
-            correctEdges.append([np.sum(groupedDifferences[:idx,1]),np.sum(groupedDifferences[:idx+1,1])])
-        return(correctEdges)
-
-    def define_pixel_periphery(self, x, y, orientation, xLen, yLen):
-        """
-        find the direction of the pixel periphery to be cleaned
-        """
-        if orientation == 'right':
-            xmin, xmax = bounds(x-1, 0, xLen), bounds(x+2, 0, xLen)
-            ymin, ymax = bounds(y-1, 0, yLen), bounds(y+21, 0, yLen)
-        if orientation == 'top':
-            xmin, xmax = bounds(x-20, 0, xLen), bounds(x+1, 0, xLen)
-            ymin, ymax = bounds(y-1, 0, yLen), bounds(y+2, 0, yLen)
-        if orientation == 'left':
-            xmin, xmax = bounds(x-1, 0, xLen), bounds(x+2, 0, xLen)
-            ymin, ymax = bounds(y-20, 0, yLen), bounds(y+1, 0, yLen)
-        if orientation == 'bottom':
-            xmin, xmax = bounds(x-1, 0, xLen), bounds(x+21, 0, xLen)
-            ymin, ymax = bounds(y-1, 0, yLen), bounds(y+2, 0, yLen)
-        return(xmin, xmax, ymin, ymax)
-
-    def skeletonize_image(self, cleanImage):
-        """
-        skeletonize cleaned image according to whether the images is noisy or not
-        """
-        show_Message("...Image is skeletonized.")
-        if self.cleanNoise == 0:
-            branchlessSkeleton, binaryImage, skeletonImage = self.create_skeletonized_image(cleanImage)
-        else:
-            branchlessSkeleton, binaryImage, skeletonImage = self.remove_noise_from_image(cleanImage)
-        return(branchlessSkeleton, binaryImage, skeletonImage)
-
-    def create_skeletonized_image(self, cleanImage):
-        """
-        create the rescaled, filtered, binarized and skeletonized image
-        """
-        if self.changeRescaling == 0:
-            pLower, pUpper = np.percentile(cleanImage, (2, 98))
-        else:
-            pLower, pUpper = np.percentile(cleanImage, (2, 90))
-        rescaledImage = skimage.exposure.rescale_intensity(cleanImage, (pLower, pUpper))
-        gaussianImage = skimage.filters.gaussian(rescaledImage, sigma=3)
-        tubeImage = tube_filter(gaussianImage, sigma=3)
-        binaryImage = self.binarize_image(tubeImage)
-        smallObjects = skimage.morphology.remove_small_objects(binaryImage, 500)
-        smallHoles = skimage.morphology.remove_small_holes(smallObjects, 200)
-        skeletonImage = skimage.morphology.skeletonize(smallHoles)
-        correctedSkeletonImage = correct_gaps_in_skeleton(skeletonImage)
-        skeletonImage = correctedSkeletonImage
-        branchlessSkeleton = detect_branches(correctedSkeletonImage, mode='remove')
-        return(branchlessSkeleton, binaryImage, skeletonImage)
-
-    def binarize_image(self, tubeImage):
-        """
-        binarize image with mean of Otsu threshold and intensity histogram
-        """
-        show_Message("...Image is binarized.")
-        counts, bins = np.histogram(tubeImage.flatten(), 256, range=(0, 256))
-        thresholdHist = np.where(counts == np.max(counts))[0][0]
-        thresholdOtsu = skimage.filters.threshold_otsu(tubeImage)
-        thresholdImage = np.mean([thresholdHist, thresholdOtsu])
-        binaryImage = tubeImage > thresholdImage
-        return(binaryImage)
-
-    def remove_noise_from_image(self, cleanImage):
-        """
-        remove noise from image and then skeletonize
-        """
-        denoisedImage = skimage.restoration.denoise_tv_chambolle(cleanImage)
-        tophatImage = skimage.morphology.white_tophat(denoisedImage, selem=disk(3))
-        adapthistImage = skimage.exposure.equalize_adapthist(tophatImage, clip_limit=0.1)
-        otsuImage = skimage.filters.threshold_otsu(adapthistImage)
-        binaryImage = adapthistImage > otsuImage
-        smallObjects = skimage.morphology.remove_small_objects(binaryImage, 200)
-        intermediateSkeletonImage = skimage.morphology.skeletonize(smallObjects)
-        continueNoiseCleaning = self.evaluate_skeleton(intermediateSkeletonImage)
-        if continueNoiseCleaning == True:
-            correctedSkeletonImage = correct_gaps_in_skeleton(intermediateSkeletonImage)
-            intermediateBranchlessSkeleton = detect_branches(correctedSkeletonImage, mode='remove')
-            smallHoles = skimage.morphology.remove_small_holes(intermediateBranchlessSkeleton, 100)
-            skeletonImage = skimage.morphology.skeletonize(smallHoles)
-            skeletonImage = correctedSkeletonImage
-            branchlessSkeleton = detect_branches(skeletonImage, mode='remove')
-        else:
-            branchlessSkeleton, binaryImage, skeletonImage = self.create_skeletonized_image(cleanImage)
-        return(branchlessSkeleton, binaryImage, skeletonImage)
-
-    def evaluate_skeleton(self, skeletonImage):
-        """
-        evaluate if denoised image renders usable skeleton
-        """
-        usableSkeleton = True
-        labeledSkeleton, labels = sp.ndimage.label(skeletonImage, np.ones((3,3)))
-        if labels > 5:
-            usableSkeleton = False
-        return(usableSkeleton)
-
-    def plot_labeled_image(self, labeledImage, labels):
-        """
-        plot the labeled image with labels
-        """
-        textPositions = []
-        textString = []
-        for idx in range(2, labels + 1):
-            label = labeledImage == idx
-            cmx, cmy = sp.ndimage.measurements.center_of_mass(label)
-            textPositions.append([cmx, cmy])
-            textString.append(str(idx-1))
-        labelThreshold = int(80*labels/100)
-
-        fig, axs = plt.subplots(1, 1, figsize=(10, 10))
-        plt.imshow(labeledImage, cmap='viridis')
-        axs.axes.get_yaxis().set_visible(False)
-        axs.axes.get_xaxis().set_visible(False)
-        for idx in range(len(textString)):
-            if int(textString[idx]) >= labelThreshold:
-                plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='black')
-            else:
-                plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='white')
-        fig.savefig(self.pathToFolder + '/LabeledPavementCells.png', bbox_inches='tight', dpi=300)
-
-class VisGraph:
-
-    def __init__(self, filename, preprocessedImage, plotIntermediate, resolution, outputFolder, plotLobeOutput, roiInput, roiFileList, fileList):
-        self.filename = filename
-        self.outputFolder = outputFolder
-        self.plotIntermediate = plotIntermediate
-        self.resolution = float(resolution)
-        self.plotLobeOutput = plotLobeOutput
-        self.roiInput = roiInput
-        self.roiFileList = roiFileList
-        self.fileList = fileList
-
-        if os.path.isfile(self.outputFolder + '/visibilityGraphs.gpickle'):
-            os.remove(self.outputFolder + '/visibilityGraphs.gpickle')
-        if os.path.isfile(self.outputFolder + '/cellContours.gpickle'):
-            os.remove(self.outputFolder + '/cellContours.gpickle')
-        if os.path.isfile(self.outputFolder + '/shapeResultsTable.csv'):
-            os.remove(self.outputFolder + '/shapeResultsTable.csv')
-        if os.path.isfile(self.outputFolder + '/LobeParameters.csv'):
-            os.remove(self.outputFolder + '/LobeParameters.csv')
-        if self.roiInput == False:
-            if self.plotLobeOutput == 1:
-                if not os.path.exists(self.outputFolder + '/ResultsLobePositions'):
-                    try:
-                        os.makedirs(self.outputFolder + '/ResultsLobePositions')
-                    except OSError:
-                        messagebox.showinfo("Warning", "Creation of the results directory for graphical lobe positions failed.")
-
-        if self.roiInput == False:
-            if preprocessedImage != None:
-                self.skeletonImage = preprocessedImage.skeletonImage
-                self.branchlessSkeleton = preprocessedImage.branchlessSkeleton
-                self.labeledImage = preprocessedImage.labeledImage
-                self.labels = preprocessedImage.labels
-            else:
-                try:
-                    self.skeletonImage = skimage.io.imread(self.outputFolder + '/skeletonImage.png') > 0
-                    self.branchlessSkeleton = skimage.io.imread(self.outputFolder + '/branchlessSkeleton.png') > 0
-                    self.labeledImage, self.labels = sp.ndimage.label(~self.branchlessSkeleton)
-                except FileNotFoundError:
-                    messagebox.showinfo("Warning", "No pre-processed files were found for the selected image.")
-
-            self.shapeResultsTable = pd.DataFrame(columns=['CellNumber', 'VisGraphNodes', 'VisGraphEdges', 'Lobes', 'Necks', 'Junctions', 'JunctionLobes', 'Completeness', 'Circularity', 'Area [µm2]', 'Perimeter [µm]'])
-            self.lobeParameters = pd.DataFrame(columns=['CellLabel', 'NodeLabelLobe', 'PositionLobeX', 'PositionLobeY', 'NodeLabelNeck1', 'NodeLabelNeck2', 'LobeLength [µm]', 'NeckWidth [µm]', 'ProtrusionDepth [px]', 'ProtrusionWidth [px]'])
-
-            self.junctions = self.detect_threeway_junctions(self.skeletonImage, self.branchlessSkeleton, self.labeledImage)
-            np.save(self.outputFolder + '/TriCellularJunctionPositions.npy', self.junctions)
-            self.visibilityGraphs, self.cellContours = self.visibility_graphs(self.labeledImage, self.labels, self.resolution)
-            self.add_data_to_table(self.visibilityGraphs, self.cellContours, self.labeledImage, self.labels, self.junctions, self.resolution)
-            show_Message("\nGraVis is done!")
-        else:
-            self.shapeResultsTable = pd.DataFrame(columns=['CellNumber', 'VisGraphNodes', 'VisGraphEdges', 'Lobes', 'Necks', 'Completeness', 'Perimeter [µm]'])
-            self.lobeParameters = pd.DataFrame(columns=['CellLabel', 'NodeLabelLobe', 'PositionLobeX', 'PositionLobeY', 'NodeLabelNeck1', 'NodeLabelNeck2', 'LobeLength [µm]', 'NeckWidth [µm]'])
-
-            if self.roiFileList == False:
-                self.keyName, self.cellContour = self.read_roi_file(self.filename)
-                show_Message("...Create visibility graph for " + self.keyName)
-                self.visibilityGraph = self.create_visibility_graph_roi(self.cellContour, self.resolution)
-                self.save_contour_and_graph_roi(self.visibilityGraph, self.cellContour, self.outputFolder)
-                self.add_data_to_table_roi(self.visibilityGraph, self.cellContour, self.keyName, self.resolution)
-                show_Message("\nGraVis is done!")
-            else:
-                for index, file in enumerate(self.fileList):
-                    self.keyName, self.cellContour = self.read_roi_file(file)
-                    show_Message("...Create visibility graph " + str(index + 1) + " of " + str(len(self.fileList)))
-                    self.visibilityGraph = self.create_visibility_graph_roi(self.cellContour, self.resolution)
-                    self.save_contour_and_graph_roi(self.visibilityGraph, self.cellContour, self.outputFolder)
-                    self.add_data_to_table_roi(self.visibilityGraph, self.cellContour, self.keyName, self.resolution)
-                show_Message("\nGraVis is done!")
-
-    def read_roi_file(self, filename):
-        """
-        read roi file and return corresponding x/y coordinates
-        """
-        fileType = filename.split('/')[-1].split('.')[-1]
-        if fileType == 'roi' or fileType == 'ROI':
-            keyName = filename.split('/')[-1].split('.')[0]
-            roiFile = read_roi.read_roi_file(filename)
-            xCoordinates = roiFile[keyName]['x']
-            yCoordinates = roiFile[keyName]['y']
-            cellContour = np.array(list(zip(xCoordinates, yCoordinates)))
-            return(keyName, cellContour)
-        else:
-            messagebox.showinfo("Warning", "The folder you chose, inludes ROI files and other file types. Please remove files which are not ROI files for the analysis.")
-
-    def save_contour_and_graph_roi(self, visGraph, cellContour, outputFolder):
-        """
-        save the visibility graph and cell contour extracted from ROI file
-        """
-        cellContoursPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
-        pickle.dump(cellContour, cellContoursPickle)
-        cellContoursPickle.close()
-        visGraphsPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
-        pickle.dump(visGraph, visGraphsPickle)
-        visGraphsPickle.close()
-
-    def detect_threeway_junctions(self, skeletonImage, branchlessSkeleton, labeledImage):
-        """
-        detect threeway junctions of cells in skeletonized image
-        """
-        show_Message("...Detect tri-cellular junctions.")
-        finalListJunctions = []
-        labeledTrackedImage = create_labeled_and_tracked_image(skeletonImage, labeledImage)
-        allJunctionsList = detect_crossings_and_endpoints(skeletonImage, mode='crossings', output='list')
-        lenX, lenY = branchlessSkeleton.shape
-        for xPos, yPos in allJunctionsList:
-            if branchlessSkeleton[xPos, yPos] == 1:
-                window, winBounds = create_window(labeledTrackedImage, xPos, yPos, 1, 2, 1, 2)
-                tracked = np.transpose(np.where(window == 2))
-                if len(tracked) == 0:
-                    finalListJunctions.append([xPos, yPos])
-                else:
-                    newWindow, _ = create_window(labeledTrackedImage, tracked[0][0]+winBounds[0], tracked[0][1]+winBounds[2], 1, 2, 1, 2)
-                    if np.sum(newWindow == 0) != 0 and np.sum(newWindow == 0) >= np.sum(newWindow >= 3):
-                        finalListJunctions.append([xPos, yPos])
-
-        if self.plotIntermediate == 1:
-            self.plot_cell_junctions(finalListJunctions, branchlessSkeleton)
-        return(finalListJunctions)
-
-    def plot_cell_junctions(self, finalListJunctions, branchlessSkeleton):
-        """
-        plot the threeway junctions on the branchless skeleton
-        """
-        graph = nx.Graph()
-        for idx, (x,y) in enumerate(finalListJunctions):
-            graph.add_node(idx, pos=(y, x))
-        posGraph = nx.get_node_attributes(graph, 'pos')
-
-        fig,axs = plt.subplots(1, 1, figsize=(10, 10))
-        plt.imshow(branchlessSkeleton, cmap='gray')
-        nodes=nx.draw_networkx_nodes(graph, posGraph, with_labels=False, node_color='red', node_size=30)
-        nodes.set_edgecolor('None')
-        axs.axes.get_yaxis().set_visible(False)
-        axs.axes.get_xaxis().set_visible(False)
-        fig.savefig(self.outputFolder + '/JunctionsOnSkeleton.png', bbox_inches='tight', dpi=300)
-
-    def visibility_graphs(self, labeledImage, labels, resolution):
-        """
-        create a visibility graph for all cells
-        """
-        show_Message("...Create visibility graphs:")
-        visGraphsAll = {}
-        cellContoursAll = {}
-        for label in range(2, labels+1):
-            show_Message("......Graph " + str(label-1) + ' of ' + str(labels-1))
-            visGraph, cellContour = self.create_visibility_graph(labeledImage, label, resolution)
-            visGraphsAll[label-1] = visGraph
-            cellContoursAll[label-1] = cellContour
-            cellContoursPickle = open(self.outputFolder + '/cellContours.gpickle', 'ab')
-            pickle.dump(cellContour, cellContoursPickle)
-            cellContoursPickle.close()
-        return(visGraphsAll, cellContoursAll)
-
-    def create_visibility_graph(self, labeledImage, label, resolution):
-        """
-        create visibilit graph from cell contour
-        """
-        visGraph = nx.Graph()
-        pixelDistance = calculate_pixel_distance(resolution)
-        contourImage, cellContourOrdered = self.extract_cell_contour(label, labeledImage)
-        if len(cellContourOrdered) != 0:
-            pixelsOnContour = interpolate_contour_pixels(cellContourOrdered, pixelDistance)
-            if len(pixelsOnContour) >= 4:
-                for key in pixelsOnContour:
-                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
-                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
-            else:
-                cellContourOrdered = []
-        return(visGraph, cellContourOrdered)
-
-    def create_visibility_graph_roi(self, cellContour, resolution):
-        """
-        create visibilit graph from cell contour
-        """
-        visGraph = nx.Graph()
-        pixelDistance = calculate_pixel_distance(resolution)
-        if pixelDistance != 0:
-            pixelsOnContour = interpolate_contour_pixels(cellContour, pixelDistance)
-            if len(pixelsOnContour) >= 4:
-                for key in pixelsOnContour:
-                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
-                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
-            else:
-                show_Message("The contour you provided did not render enough nodes for the resulting visibility graph. Please change the resolution or provide a contour with more coordinates.")
-        else:
-            show_Message("The calculated optimal pixel distance equals zero with the resolution you provided. Please change the resolution.")
-        return(visGraph)
-
-    def extract_cell_contour(self, label, labeledImage):
-        """
-        extract the contour of a specified cell
-        """
-        cellImage = labeledImage == label
-        contourImage = invert(cellImage)
-        cellContour = find_contour_of_object(cellImage)
-        if (0 not in cellContour) and (cellImage.shape[0] not in cellContour[:, 0]) and (cellImage.shape[1] not in cellContour[:, 1]):
-            cellContourOrdered = marching_squares(cellContour, cellImage)
-            for xPos, yPos in cellContourOrdered:
-                contourImage[xPos, yPos] = 1
-        else:
-            cellContourOrdered = []
-            for xPos, yPos in cellContour:
-                contourImage[xPos, yPos] = 1
-        return(contourImage, cellContourOrdered)
-
-    def add_edges_to_visGraph(self, pixelsOnContour, visGraph):
-        """
-        add edge to visGraph if the edge between two nodes lies inside the cell (concave)
-        """
-        cases = ['FFFF0F212', '0FFF0F212', '1FFF0F212', 'F0FF0F212', '00FF0F212', '10FF0F212', 'F1FF0F212']
-        Polygon = shapely.geometry.Polygon([[pixelsOnContour[key][1], pixelsOnContour[key][0]] for key in pixelsOnContour])
-        Boundary = shapely.geometry.LineString(list(Polygon.exterior.coords))
-        combs = itertools.combinations(range(len(pixelsOnContour)), 2)
-        for node1, node2 in list(combs):
-            line = shapely.geometry.LineString(((pixelsOnContour[node1][1], pixelsOnContour[node1][0]), (pixelsOnContour[node2][1], pixelsOnContour[node2][0])))
-            DE9IM = line.relate(Polygon)
-            if DE9IM in cases:
-                intersection = Boundary.intersection(line)
-                if DE9IM == '10FF0F212' and len(intersection) <= 3:
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-                if DE9IM == 'F1FF0F212' and intersection.geom_type == 'LineString':
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-                if DE9IM in cases[:5]:
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-        return(visGraph)
-
-    def add_data_to_table(self, visGraphsAll, cellContoursAll, labeledImage, labels, junctions, resolution):
-        """
-        summarize all results in a table
-        """
-        for label in range(1, labels):
-            cellContour = cellContoursAll[label]
-            visGraph = visGraphsAll[label]
-            cell = labeledImage == label + 1
-            if visGraph.number_of_nodes() != 0:
-                cellJunctions = self.find_number_of_cell_junctions(cellContour)
-                lobes, necks = self.count_lobes_and_necks(visGraph)
-                visGraph = self.add_lobe_and_neck_property(visGraph, necks, lobes)
-                visGraphsPickle = open(self.outputFolder + '/visibilityGraphs.gpickle', 'ab')
-                pickle.dump(visGraph, visGraphsPickle)
-                visGraphsPickle.close()
-                correlatedJunctions = self.correlate_junctions_and_lobes(visGraph, lobes, necks, cellJunctions)
-                self.calculate_lobe_and_neck_properties(label, visGraph, cellContour, cellJunctions, lobes,
-                necks, correlatedJunctions, resolution)
-                sigma = self.compute_graph_complexity(visGraph)
-                area = np.sum(cell) * (resolution ** 2)
-                perimeter = len(cellContour) * resolution
-                circularity = 4 * np.pi * area / perimeter ** 2
-                dataAppend = [label, visGraph.number_of_nodes(), visGraph.number_of_edges(), len(lobes), len(necks), len(cellJunctions), len(correlatedJunctions), sigma, circularity, area, perimeter]
-            else:
-                visGraphsPickle = open(self.outputFolder + '/visibilityGraphs.gpickle', 'ab')
-                pickle.dump(visGraph, visGraphsPickle)
-                visGraphsPickle.close()
-                dataAppend = [label, 0, 0, 0, 0, 0, 0, 0, 0, 0, perimeter]
-            self.shapeResultsTable.loc[0] = dataAppend
-            if not os.path.isfile(self.outputFolder + '/ShapeResultsTable.csv'):
-                self.shapeResultsTable.to_csv(self.outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
-            else:
-                self.shapeResultsTable.to_csv(self.outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-
-    def add_data_to_table_roi(self, visGraph, cellContour, label, resolution):
-        """
-        summarize all results in a table
-        """
-        if visGraph.number_of_nodes() != 0:
-            lobes, necks = self.count_lobes_and_necks(visGraph)
-            self.calculate_lobe_and_neck_properties_roi(label, visGraph, cellContour, lobes,
-            necks, resolution)
-            sigma = self.compute_graph_complexity(visGraph)
-            dataAppend = [label, visGraph.number_of_nodes(), visGraph.number_of_edges(), len(lobes), len(necks), sigma, len(cellContour) * resolution]
-        else:
-            dataAppend = [label, 0, 0, 0, 0, 0, len(cellContour) * resolution]
-        self.shapeResultsTable.loc[0] = dataAppend
-        if not os.path.isfile(self.outputFolder + '/ShapeResultsTable.csv'):
-            self.shapeResultsTable.to_csv(self.outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
-        else:
-            self.shapeResultsTable.to_csv(self.outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-
-    def add_lobe_and_neck_property(self, graph, neckIndices, lobeIndices):
-        """
-        add node property describing if a node was identified as lobe or neck
-        """
-        neckLobeProperty = {}
-        for nodeName in list(graph.nodes):
-            if nodeName in lobeIndices:
-                neckLobeProperty[nodeName] = "Lobe"
-            elif nodeName in neckIndices:
-                neckLobeProperty[nodeName] = "Neck"
-            else:
-                neckLobeProperty[nodeName] = "None"
-        nx.set_node_attributes(graph, neckLobeProperty, name="LobeNeckNone")
-        return(graph)
-
-    def find_number_of_cell_junctions(self, cellContour):
-        """
-        find all junctions on a cell contour, allowing for small derivations
-        """
-        cellJunctions = []
-        for index in range(len(self.junctions)):
-            foundPositions = find_index_of_coordinates(self.junctions[index], cellContour, [0,1,-1], 'coordinates')
-            if len(foundPositions) != 0:
-                cellJunctions.append(self.junctions[index])
-        return(cellJunctions)
-
-    def count_lobes_and_necks(self, visGraph):
-        """
-        count the number of lobes and necks according to closeness centrality of visibility graph nodes
-        """
-        closenessCentrality = nx.closeness_centrality(visGraph, distance='length')
-        closenessCentralityArray = np.asarray(list(closenessCentrality.values()))
-        lobes, necks = find_local_extrema(closenessCentralityArray)
-        return(lobes, necks)
-
-    def correlate_junctions_and_lobes(self, visGraph, lobes, necks, cellJunctions):
-        """
-        correlate detected lobes and necks with detected tri-cellular junctions
-        """
-        nodePositions = nx.get_node_attributes(visGraph, 'pos')
-        detectedJunctions = []
-        positions = np.asarray([nodePositions[idx] for idx in itertools.chain(lobes, necks)])
-        if len(positions) != 0:
-            for index in range(len(cellJunctions)):
-                foundPositions = find_index_of_coordinates(cellJunctions[index], positions, [0, 1, -1, 2, -2, 3, -3], 'coordinates')
-                if len(foundPositions) != 0:
-                    xShift, yShift = foundPositions[0][0], foundPositions[0][1]
-                    junction = (cellJunctions[index][0] + xShift, cellJunctions[index][1] + yShift)
-                    key = get_key_from_value(nodePositions, junction)
-                    detectedJunctions.append(key)
-        return(detectedJunctions)
-
-    def calculate_lobe_and_neck_properties(self, key, visGraph, cellContour, cellJunctions, lobes, necks, correlatedJunctions, resolution):
-        """
-        calculate the neck width and lobe length for a selected pavement cell and create a graphic output for lobe and neck positions
-        """
-        pos = nx.get_node_attributes(visGraph, 'pos')
-        protrusionDepthOfCell, protrusionWidthOfCell = self.calculate_protrusion_depth_and_width(key, visGraph, cellContour, cellJunctions)
-        for index in range(len(necks)):
-            if index == len(necks) - 1:
-                neck1, neck2 = necks[index], necks[0]
-                nodes = np.append(np.arange(neck1, visGraph.number_of_nodes(), 1), np.arange(0, neck2, 1))
-                lobe = self.find_lobe_between_necks(lobes, nodes)
-            else:
-                neck1, neck2 = necks[index], necks[index + 1]
-                nodes = np.arange(neck1, neck2 + 1, 1)
-                lobe = self.find_lobe_between_necks(lobes, nodes)
-            neckwidth = euclidean(pos[neck1], pos[neck2])
-            protrusionDepth = protrusionDepthOfCell[index]
-            protrusionWidth = protrusionWidthOfCell[index]
-            if len(lobe) == 0:
-                dataLobes = [key, 'no lobe found', None, None, neck1, neck2, None, neckwidth * resolution, protrusionDepth, protrusionWidth]
-            elif len(lobe) > 2:
-                for matchedLobe in lobe:
-                    lobelength = self.calculate_lobe_length(neck1, neck2, matchedLobe, pos)
-                    dataLobes = [key, matchedLobe, pos[matchedLobe][0], pos[matchedLobe][1], neck1, neck2, lobelength * resolution, neckwidth * resolution, protrusionDepth, protrusionWidth]
-            else:
-                lobelength = self.calculate_lobe_length(neck1, neck2, lobe[0], pos)
-                dataLobes = [key, lobe[0], pos[lobe[0]][0], pos[lobe[0]][1], neck1, neck2, lobelength * resolution, neckwidth * resolution, protrusionDepth, protrusionWidth]
-            self.lobeParameters.loc[0] = dataLobes
-            if not os.path.isfile(self.outputFolder + '/LobeParameters.csv'):
-                self.lobeParameters.to_csv(self.outputFolder + '/LobeParameters.csv', mode='a', index=False, sep=';', decimal=',')
-            else:
-                self.lobeParameters.to_csv(self.outputFolder + '/LobeParameters.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-        if self.plotLobeOutput == 1:
-            self.create_visual_output(key, visGraph, cellContour, cellJunctions, lobes, necks, pos)
-
-    def calculate_lobe_and_neck_properties_roi(self, key, visGraph, cellContour, lobes, necks, resolution):
-        """
-        calculate the neck width and lobe length for a selected pavement cell and create a graphic output for lobe and neck positions
-        """
-        pos = nx.get_node_attributes(visGraph, 'pos')
-        for index in range(len(necks)):
-            if index == len(necks) - 1:
-                neck1, neck2 = necks[index], necks[0]
-                nodes = np.append(np.arange(neck1, visGraph.number_of_nodes(), 1), np.arange(0, neck2, 1))
-                lobe = self.find_lobe_between_necks(lobes, nodes)
-            else:
-                neck1, neck2 = necks[index], necks[index + 1]
-                nodes = np.arange(neck1, neck2 + 1, 1)
-                lobe = self.find_lobe_between_necks(lobes, nodes)
-            neckwidth = euclidean(pos[neck1], pos[neck2])
-            if len(lobe) == 0:
-                dataLobes = [key, 'no lobe found', None, None, neck1, neck2, None, neckwidth * resolution]
-            elif len(lobe) > 2:
-                for matchedLobe in lobe:
-                    lobelength = self.calculate_lobe_length(neck1, neck2, matchedLobe, pos)
-                    dataLobes = [key, matchedLobe, pos[matchedLobe][0], pos[matchedLobe][1], neck1, neck2, lobelength * resolution, neckwidth * resolution]
-            else:
-                lobelength = self.calculate_lobe_length(neck1, neck2, lobe[0], pos)
-                dataLobes = [key, lobe[0], pos[lobe[0]][0], pos[lobe[0]][1], neck1, neck2, lobelength * resolution, neckwidth * resolution]
-            self.lobeParameters.loc[0] = dataLobes
-            if not os.path.isfile(self.outputFolder + '/LobeParameters.csv'):
-                self.lobeParameters.to_csv(self.outputFolder + '/LobeParameters.csv', mode='a', index=False, sep=';', decimal=',')
-            else:
-                self.lobeParameters.to_csv(self.outputFolder + '/LobeParameters.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-        if self.plotLobeOutput == 1:
-            self.create_visual_output_roi(key, visGraph, cellContour, lobes, necks, pos)
-
-    def calculate_protrusion_depth_and_width(self, key, visGraph, cellContour, cellJunctions):
-        """
-        calculate the protrusion depth and width of cells
-        """
-        extractionDictForTriWayJunction = {"cellLabel": key, "labeledImage": self.labeledImage}
-        protrusionCalculator = CellProtrusionPropertyCalculator(visGraph, cellJunctions, cellContour, extractionDictForTriWayJunction)
-        protrusionDepthOfCell = protrusionCalculator.GetProtrusionDepths()
-        protrusionWidthOfCell = protrusionCalculator.GetProtrusionWidthAtHalfHeight()
-        return(protrusionDepthOfCell, protrusionWidthOfCell)
-
-    def find_lobe_between_necks(self, lobes, nodes):
-        """
-        find the adjacent necks of a lobe
-        """
-        matchedLobe = []
-        for lobe in lobes:
-            if lobe in nodes:
-                matchedLobe.append(lobe)
-        return(matchedLobe)
-
-    def calculate_lobe_length(self, neck1, neck2, lobe1, pos):
-        """
-        calculate the length of a lobe based on its adjacent necks
-        """
-        pos1, pos2, posL = pos[neck1], pos[neck2], pos[lobe1]
-        if pos2[0] - pos1[0] == 0:
-            basePointX = pos1[0]
-            basePointY = posL[1]
-        elif pos2[1] - pos1[1] == 0:
-            basePointX = pos1[1]
-            basePointY = posL[0]
-        else:
-            slopeBase = (pos2[1] - pos1[1]) / (pos2[0] - pos1[0])
-            interceptBase = pos1[1] - slopeBase * pos1[0]
-            slopeLobe = -1 / slopeBase
-            interceptLobe = posL[1] - slopeLobe * posL[0]
-            basePointX = (interceptLobe - interceptBase) / (slopeBase - slopeLobe)
-            basePointY = slopeBase * basePointX + interceptBase
-        lobeLength = euclidean(posL, (basePointX, basePointY))
-        return(lobeLength)
-
-    def create_visual_output(self, key, visGraph, contour, junctions, lobes, necks, pos):
-        """
-        create a visual output for the positions of detected lobes, necks and tri-cellular junctions
-        """
-        xmin, xmax, ymin, ymax = np.min(contour[:, 0]), np.max(contour[:, 0]), np.min(contour[:, 1]), np.max(contour[:, 1])
-        xminB, yminB = bounds(xmin, 0, xmin - 10), bounds(ymin, 0, ymin - 10)
-        contourImage = np.zeros(((xmax + 10) - xminB, (ymax + 10) - yminB))
-        for x, y in contour:
-            contourImage[x - xminB, y - yminB] = 1
-
-        legend_elements = [matplotlib.patches.Circle(([0], [0]), radius=5, ec='gray', fc='None', lw=2, label='Junction'),
-                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#56b4e9', fc='None', lw=2, label='Lobe'),
-                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#e69f00', fc='None', lw=2, label='Neck')]
-
-        fig, ax = plt.subplots(1, 1)
-        plt.imshow(contourImage, cmap='gray_r', interpolation='None')
-        ax.tick_params(axis='both', which='both', top='off', right='off')
-        ax.set_xlabel('Pixel')
-        ax.set_ylabel('Pixel')
-        ax.set_title('Cell ' + str(key))
-        for junc in junctions:
-            circ = plt.Circle((junc[1] - yminB, junc[0] - xminB), radius=5, ec='gray', fc='None', lw=2)
-            ax.add_patch(circ)
-        for neck in necks:
-            posNeck = pos[neck]
-            circ = plt.Circle((posNeck[1] - yminB, posNeck[0] - xminB), radius=3, ec='#e69f00', fc='None', lw=2)
-            ax.add_patch(circ)
-            ax.text(posNeck[1] - yminB + 4, posNeck[0] - xminB + 3, neck, color='#af7900', fontsize=7)
-        for lobe in lobes:
-            posLobe = pos[lobe]
-            circ = plt.Circle((posLobe[1] - yminB, posLobe[0] - xminB), radius=3, ec='#56b4e9', fc='None', lw=2)
-            ax.add_patch(circ)
-            ax.text(posLobe[1] - yminB + 4, posLobe[0] - xminB + 3, lobe, color='#136492', fontsize=7)
-        ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.4), fancybox=False, shadow=False, ncol=3, fontsize=7, handler_map={matplotlib.patches.Circle: HandlerEllipse()})
-        if os.path.exists(self.outputFolder + '/ResultsLobePositions'):
-            fig.savefig(self.outputFolder + '/ResultsLobePositions/Cell' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
-        else:
-            fig.savefig(self.outputFolder + '/Cell' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
-
-    def create_visual_output_roi(self, key, visGraph, contour, lobes, necks, pos):
-        """
-        create a visual output for the positions of detected lobes, necks and tri-cellular junctions
-        """
-        xmin, xmax, ymin, ymax = np.min(contour[:, 0]), np.max(contour[:, 0]), np.min(contour[:, 1]), np.max(contour[:, 1])
-        xminB, yminB = bounds(xmin, 0, xmin - 10), bounds(ymin, 0, ymin - 10)
-        contourImage = np.zeros(((xmax + 10) - xminB, (ymax + 10) - yminB))
-        for x, y in contour:
-            contourImage[x - xminB, y - yminB] = 1
-
-        legend_elements = [matplotlib.patches.Circle(([0], [0]), radius=3, ec='#56b4e9', fc='None', lw=2, label='Lobe'),
-                       matplotlib.patches.Circle(([0], [0]), radius=3, ec='#e69f00', fc='None', lw=2, label='Neck')]
-
-        fig, ax = plt.subplots(1, 1)
-        plt.imshow(contourImage, cmap='gray_r', interpolation='None')
-        ax.tick_params(axis='both', which='both', top='off', right='off')
-        ax.set_xlabel('Pixel')
-        ax.set_ylabel('Pixel')
-        ax.set_title('Cell ' + str(key))
-        for neck in necks:
-            posNeck = pos[neck]
-            circ = plt.Circle((posNeck[1] - yminB, posNeck[0] - xminB), radius=3, ec='#e69f00', fc='None', lw=2)
-            ax.add_patch(circ)
-            ax.text(posNeck[1] - yminB + 4, posNeck[0] - xminB + 3, neck, color='#af7900', fontsize=7)
-        for lobe in lobes:
-            posLobe = pos[lobe]
-            circ = plt.Circle((posLobe[1] - yminB, posLobe[0] - xminB), radius=3, ec='#56b4e9', fc='None', lw=2)
-            ax.add_patch(circ)
-            ax.text(posLobe[1] - yminB + 4, posLobe[0] - xminB + 3, lobe, color='#136492', fontsize=7)
-        ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.4), fancybox=False, shadow=False, ncol=3, fontsize=7, handler_map={matplotlib.patches.Circle: HandlerEllipse()})
-        if os.path.exists(self.outputFolder + '/Results'):
-            fig.savefig(self.outputFolder + '/Results/Cell_' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
-        else:
-            fig.savefig(self.outputFolder + '/Cell_' + str(key) + '_detectedFeatures.png', bbox_inches='tight', dpi=300)
-
-    def compute_graph_complexity(self, visGraph):
-        """
-        compute the complexity of the graph using the relative density of the clique
-        """
-        edgesCompleteGraph = (visGraph.number_of_nodes() * (visGraph.number_of_nodes() - 1)) * 0.5
-        delta = visGraph.number_of_edges() / edgesCompleteGraph
-        return(delta)
-
-class CellProtrusionPropertyCalculator(object):
-
-    def __init__(self, visGraph, triWayJunctionPos, cellContour, extractionDictForTriWayJunction=False):
-        self.visGraph = visGraph # visibility graph (networkx graph) with 'pos' and 'LobeNeckNone' node attributes
-        self.triWayJunctionPos = np.asarray(triWayJunctionPos) # 2D array with each row being the coordinates of one tri-way junction in an ordered fashion
-        self.cellContour = cellContour
-        self.extractionDictForTriWayJunction = extractionDictForTriWayJunction
-        self.calcProtrusionDepthAndWidth()
-
-    def calcProtrusionDepthAndWidth(self):
-        self.orderedContour = self.extractOrderedContour()
-        self.cellOutlineRing = self.createLinearRingFromContour()
-        if self.extractionDictForTriWayJunction:
-            labeledImage = self.extractionDictForTriWayJunction["labeledImage"]
-            cellLabel = self.extractionDictForTriWayJunction["cellLabel"]
-            self.triWayJunctionPos = self.extractTriWayJunctions(cellLabel, self.visGraph, self.triWayJunctionPos, labeledImage)
-        self.lobePos, self.selectedLobeKeys = self.extractPositionOfFromVisibilityGraph(undulationType="Lobe")
-        triWayJunctionPosList = [(x, y) for x, y in self.triWayJunctionPos]
-        self.uniqueJunctions = len(list(set(triWayJunctionPosList)))
-        self.protrusionDepths = self.calcShortestDistanceOfPointsToPolygon(self.triWayJunctionPos, self.lobePos, self.uniqueJunctions)
-        self.protrusionWidthAtHalfHeight = self.calcWidthAtHalfHeightFor(self.triWayJunctionPos, self.protrusionDepths, self.uniqueJunctions)
-
-    def extractOrderedContour(self):
-        orderedContour = self.cellContour
-        if np.any(orderedContour[0, :] != orderedContour[-1, :]):
-            orderedContour = np.concatenate([orderedContour[:, :], orderedContour[0, :].reshape(1, 2)])
-        return(orderedContour)
-
-    def createLinearRingFromContour(self):
-        cellOutlineRing = self.createLinearRingFromCoordinates(self.orderedContour)
-        assert cellOutlineRing.is_valid, "The cell contour of cell label is not valid. Contour: {}".format(self.orderedContour)
-        return(cellOutlineRing)
-
-    def createLinearRingFromCoordinates(self, coordinates):
-        return(shapely.geometry.LinearRing(shapely.geometry.asLineString(coordinates)))
-
-    def extractTriWayJunctions(self, cellLabel, visGraph, allTriWayJunctions, labeledImage):
-        cellLabelInLabeledImage = cellLabel + 1
-        unorderedJunctions = self.extractJunctionOfCell(allTriWayJunctions, cellLabelInLabeledImage, labeledImage)
-        unorderedJunctions = self.clipTriWayJunctionToCellOutline(self.cellOutlineRing, unorderedJunctions)
-        orderedTriWayJunctions = self.orderJunctions(unorderedJunctions, self.orderedContour)
-        return(orderedTriWayJunctions)
-
-    def extractJunctionOfCell(self, triWayJunctions, cellLabel, labeledImage):
-        cellImage = np.zeros(labeledImage.shape)
-        cellImage[labeledImage == cellLabel] = 1
-        cellImage = skimage.morphology.dilation(cellImage, np.ones((8, 8)))
-        idx = np.where(cellImage[triWayJunctions[:, 0], triWayJunctions[:, 1]] == 1)[0]
-        return(triWayJunctions[idx, :].copy())
-
-    def clipTriWayJunctionToCellOutline(self, cellOutlineRing, junctionCoordinates):
-        for i in range(len(junctionCoordinates)):
-            currentTriWayJunction = shapely.geometry.Point(junctionCoordinates[i])
-            correctedTriWayJunction = cellOutlineRing.interpolate(cellOutlineRing.project(currentTriWayJunction))
-            if not self.isCorrectedTriWayJunctionOnOutline(np.asarray(list(cellOutlineRing.coords)), junctionCoordinates[i]):
-                junctionCoordinates[i] = self.correctToOutline(np.asarray(list(cellOutlineRing.coords)), list(correctedTriWayJunction.coords))
-            else:
-                junctionCoordinates[i] = list(correctedTriWayJunction.coords)[0]
-        return(junctionCoordinates)
-
-    def isCorrectedTriWayJunctionOnOutline(self, cellOutline, junction):
-        return(np.any((cellOutline[:, 0] == junction[0]) & (cellOutline[:, 1] == junction[1])))
-
-    def correctToOutline(self, cellOutline, junction):
-        xyDistances = cellOutline - junction
-        bestIdx = np.argmin(np.linalg.norm(xyDistances, axis=1))
-        return(cellOutline[bestIdx, :])
-
-    def orderJunctions(self, unorderedJunctions, orderedContour, threshold=5):
-        orderedJunctions = []
-        if unorderedJunctions.shape[0] < 3:
-            return unorderedJunctions
-        for xyCoor in orderedContour:
-            distances = np.linalg.norm(unorderedJunctions - xyCoor, axis=1)
-            idx = np.where(distances < threshold)[0]
-            if len(idx) == 1:
-                orderedJunctions.append(unorderedJunctions[idx, :].tolist()[0])
-                unorderedJunctions = np.delete(unorderedJunctions, idx, axis=0)
-                if len(unorderedJunctions) == 0:
-                    break
-        orderedJunctions = np.asarray(orderedJunctions)
-        return(orderedJunctions)
-
-    def extractPositionOfFromVisibilityGraph(self, undulationType="Lobe"):
-        selectedNodeKeys = []
-        coordinates = []
-        nodeUndulationAttribute = nx.get_node_attributes(self.visGraph, 'LobeNeckNone')
-        allCoordinates = nx.get_node_attributes(self.visGraph, 'pos')
-        for nodeKey, undulationProperty in nodeUndulationAttribute.items():
-            if undulationProperty == undulationType:
-                coordinates.append(allCoordinates[nodeKey])
-                selectedNodeKeys.append(nodeKey)
-        coordinates = np.asarray(coordinates)
-        return(coordinates, selectedNodeKeys)
-
-    def calcShortestDistanceOfPointsToPolygon(self, polygonVertices, points, uniqueJunctions):
-        if uniqueJunctions > 2:
-            cellPolygon = shapely.geometry.asPolygon(polygonVertices)
-            cellPolygonRing = self.createLinearRingFromCoordinates(polygonVertices)
-            nrOfUndulations = points.shape[0]
-            undulationDepths = np.zeros(nrOfUndulations)
-            for i in range(nrOfUndulations):
-                undulationPoint = shapely.geometry.Point(points[i, :])
-                isInsideCell = cellPolygon.contains(undulationPoint)
-                undulationDepths[i] = cellPolygonRing.distance(undulationPoint)
-                if isInsideCell:
-                    undulationDepths[i] *= -1
-        else:
-            undulationDepths = [np.NaN] * len(points)
-        return(undulationDepths)
-
-    def calcWidthAtHalfHeightFor(self, polygonVertices, depthOfCell, uniqueJunctions):
-        nodeCoordinates = nx.get_node_attributes(self.visGraph, 'pos')
-        if uniqueJunctions > 2:
-            cellPolygonRing = self.createLinearRingFromCoordinates(polygonVertices)
-            widths = np.zeros(len(self.selectedLobeKeys))
-            for i in range(len(self.selectedLobeKeys)):
-                currentLobeNodeKey = self.selectedLobeKeys[i]
-                undulationPoint = shapely.geometry.Point(nodeCoordinates[currentLobeNodeKey])
-                if depthOfCell[i] != 0:
-                    widths[i] = self.calcWidthAtHalfHeight(undulationPoint, cellPolygonRing)
-                else:
-                    widths[i] = np.NaN
-        else:
-            widths = [np.NaN] * len(self.selectedLobeKeys)
-        return(widths)
-
-    def calcWidthAtHalfHeight(self, undulationPoint, cellPolygonRing,
-                              lengthOfParallelSegment=400, recursiveCallIncreasingSegmentLength=False,
-                              recursiveCallNr=0):
-        auxiliaryLineAtHalfHeight = self.createParallelToPolygonLineAtHalfHeight(undulationPoint,
-                                            cellPolygonRing, lengthOfParallelSegment=lengthOfParallelSegment)
-        if auxiliaryLineAtHalfHeight != None:
-            intersects = self.cellOutlineRing.intersection(auxiliaryLineAtHalfHeight)
-            intersects = self.correctPotentialLineString(intersects, undulationPoint)
-            widthAtHalfHeight = np.NaN
-            if type(intersects) != type(shapely.geometry.Point()):
-                if len(intersects) > 2:
-                    lotOfUDToPolygon = shapely.geometry.LineString([undulationPoint, cellPolygonRing.interpolate(cellPolygonRing.project(undulationPoint))])
-                    intersects = self.reduceToImportantentIntersections(intersects, lotOfUDToPolygon)
-                    undulationWidthAtHalfHeightLine = shapely.geometry.LineString(intersects)
-                    widthAtHalfHeight = undulationWidthAtHalfHeightLine.length
-                if len(intersects) == 2:
-                    undulationWidthAtHalfHeightLine = shapely.geometry.LineString(intersects)
-                    widthAtHalfHeight = undulationWidthAtHalfHeightLine.length
-        else:
-            widthAtHalfHeight = np.NaN
-        return(widthAtHalfHeight)
-
-    def createParallelToPolygonLineAtHalfHeight(self, undulationPoint, cellPolygonRing,
-                                                lengthOfParallelSegment=200):
-        halfUDPoint = self.calcPointAtHalfUndulationDepth(undulationPoint, cellPolygonRing)
-        parallelSegmentVector = self.calcVectorOfClosestPolygonSegment(undulationPoint, cellPolygonRing)
-        if np.linalg.norm(parallelSegmentVector) != 0:
-            factorForVector = lengthOfParallelSegment / (2 * np.linalg.norm(parallelSegmentVector))
-            startPointOfParallelSegment = np.asarray(halfUDPoint.coords)[0] + factorForVector * parallelSegmentVector
-            endPointOfParallelSegment = np.asarray(halfUDPoint.coords)[0] - factorForVector * parallelSegmentVector
-            auxiliaryLineAtHalfHeight = shapely.geometry.LineString([startPointOfParallelSegment, endPointOfParallelSegment])
-            return(auxiliaryLineAtHalfHeight)
-        else:
-            return(None)
-
-    def calcPointAtHalfUndulationDepth(self, undulationPoint, cellPolygonRing):
-        pointOnRing = cellPolygonRing.interpolate(cellPolygonRing.project(undulationPoint))
-        undulationDepthLine = shapely.geometry.LineString([undulationPoint, pointOnRing])
-        distance = undulationDepthLine.length
-        halfUDPoint = undulationDepthLine.interpolate(distance / 2)
-        return(halfUDPoint)
-
-    def calcVectorOfClosestPolygonSegment(self, undulationPoint, cellPolygonRing):
-        closestPolygonSegment = self.findClosestLineSegment(cellPolygonRing, undulationPoint)
-        startOfSegement, endOfSegment = list(closestPolygonSegment.coords)
-        closestSegmentVector = np.asarray(endOfSegment) - np.asarray(startOfSegement)
-        return(closestSegmentVector)
-
-    def findClosestLineSegment(self, linearRing, point):
-        oldPoint = None
-        splitRingSegments = []
-        for newPoint in linearRing.coords:
-            if oldPoint:
-                splitRingSegments.append(shapely.geometry.LineString([newPoint, oldPoint]))
-            oldPoint = newPoint
-        argMin = None
-        minDistance = np.inf
-        for i in range(len(splitRingSegments)):
-            distance = splitRingSegments[i].distance(point)
-            if distance < minDistance:
-                minDistance = distance
-                argMin = i
-        return(splitRingSegments[argMin])
-
-    def correctPotentialLineString(self, potentialLineStrings, referencePoint):
-        if type(potentialLineStrings) != type(shapely.geometry.Point()):
-            if type(potentialLineStrings) == type(shapely.geometry.LineString()):
-                potentialLineStrings = list(potentialLineStrings.coords)
-            else:
-                potentialLineStrings = list(potentialLineStrings)
-                containsLine = False
-                for i in range(len(potentialLineStrings)):
-                    if type(potentialLineStrings[i]) == type(shapely.geometry.LineString()):
-                        minDistances = np.inf
-                        closestPointToReferencePoint = None
-                        for point in potentialLineStrings[i].coords:
-                            point = shapely.geometry.Point(point)
-                            d = referencePoint.distance(point)
-                            if d < minDistances:
-                                closestPointToReferencePoint = point
-                        potentialLineStrings[i] = closestPointToReferencePoint
-            potentialLineStrings = shapely.geometry.MultiPoint(potentialLineStrings)
-        return(potentialLineStrings)
-
-    def reduceToImportantentIntersections(self, intersects, lotOfUDToPolygon):
-        intersectionCoordinates = list(intersects)
-        direction = 0
-        interlinkedIntersects = shapely.geometry.LineString(intersectionCoordinates)
-        directionChecked = 0
-        while interlinkedIntersects.intersects(lotOfUDToPolygon) or directionChecked < 2:
-            if len(intersectionCoordinates) == 2:
-                break
-            removedIntersection = intersectionCoordinates.pop(direction)
-            interlinkedIntersects = shapely.geometry.LineString(intersectionCoordinates)
-            if not interlinkedIntersects.intersects(lotOfUDToPolygon):
-                intersectionCoordinates.insert(direction, removedIntersection)
-                direction = -1
-                directionChecked += 1
-        return(intersectionCoordinates)
-
-    def GetProtrusionDepths(self):
-        return(self.protrusionDepths)
-
-    def GetProtrusionWidthAtHalfHeight(self):
-        return(self.protrusionWidthAtHalfHeight)
-
-class VisGraphOther:
-
-    def __init__(self, selectedImage, resolution, outputFolder, inputType, fileList, roiInput):
-        self.selectedImage = selectedImage
-        self.outputFolder = outputFolder
-        self.resolution = float(resolution)
-        self.inputType = inputType
-        self.fileList = fileList
-        self.roiInput = roiInput
-        if self.roiInput == False:
-            self.shapeResultsTable = pd.DataFrame(columns=['File', 'LabeledImage', 'GraphNumber', '#Nodes', '#Edges', 'Completeness'])
-        else:
-            self.shapeResultsTable = pd.DataFrame(columns=['File', '#Nodes', '#Edges', 'Completeness'])
-        if os.path.isfile(self.outputFolder + '/visibilityGraphs.gpickle'):
-            os.remove(self.outputFolder + '/visibilityGraphs.gpickle')
-        if os.path.isfile(self.outputFolder + '/cellContours.gpickle'):
-            os.remove(self.outputFolder + '/cellContours.gpickle')
-        if os.path.isfile(self.outputFolder + '/shapeResultsTable.csv'):
-            os.remove(self.outputFolder + '/shapeResultsTable.csv')
-
-        if self.inputType == 'image':
-            if self.roiInput == False:
-                self.labeledImage, self.labels = self.label_binary_image(self.selectedImage)
-                show_Message("...Create visibility graphs.")
-                self.visibilityGraphsOther = self.visibility_graphs_other(self.labeledImage, self.labels, self.resolution, self.outputFolder)
-                for graph in self.visibilityGraphsOther.keys():
-                    self.add_data_to_table(self.visibilityGraphsOther[graph], self.selectedImage, graph, 'LabeledShapes.png', self.outputFolder)
-                self.plot_labeled_image(self.labeledImage, self.outputFolder, self.labels, 'image', 1)
-            else:
-                self.keyName, self.cellContour = self.read_roi_file(self.selectedImage)
-                show_Message("...Create visibility graph.")
-                self.visibilityGraphsOther = self.create_visibility_graph_roi(self.cellContour, self.resolution)
-                self.save_contour_and_graph_roi(self.visibilityGraphsOther, self.cellContour, self.outputFolder)
-                self.add_data_to_table_roi(self.visibilityGraphsOther, self.keyName, self.outputFolder)
-        else:
-            if self.roiInput == False:
-                graphIndex = 1
-                self.visibilityGraphsOther = {}
-                for fileIndex, file in enumerate(self.fileList):
-                    self.labeledImage, self.labels = self.label_binary_image(file)
-                    show_Message("...Create visibility graph " + str(fileIndex + 1) + " of " + str(len(self.fileList)))
-                    self.visibilityGraph = self.visibility_graphs_other(self.labeledImage, self.labels, self.resolution, self.outputFolder)
-                    labeledFile = self.plot_labeled_image(self.labeledImage, self.outputFolder, self.labels, 'folder', graphIndex)
-                    if len(self.visibilityGraph) == 1:
-                        self.visibilityGraphsOther[graphIndex] = list(self.visibilityGraph.values())[0]
-                        self.add_data_to_table(list(self.visibilityGraph.values())[0], file, graphIndex, labeledFile, self.outputFolder)
-                        graphIndex += 1
-                    else:
-                        for graph in self.visibilityGraph.keys():
-                            self.visibilityGraphsOther[graphIndex] = self.visibilityGraph[graph]
-                            self.add_data_to_table(self.visibilityGraph[graph], file, graphIndex, labeledFile, self.outputFolder)
-                            graphIndex += 1
-            else:
-                for fileIndex, file in enumerate(self.fileList):
-                    self.keyName, self.cellContour = self.read_roi_file(file)
-                    show_Message("...Create visibility graph " + str(fileIndex + 1) + " of " + str(len(self.fileList)))
-                    self.visibilityGraphsOther = self.create_visibility_graph_roi(self.cellContour, self.resolution)
-                    if len(self.visibilityGraphsOther.nodes()) > 0:
-                        self.save_contour_and_graph_roi(self.visibilityGraphsOther, self.cellContour, self.outputFolder)
-                        self.add_data_to_table_roi(self.visibilityGraphsOther, self.keyName, self.outputFolder)
-                    else:
-                        show_Message("\nWith the resolution you provided no visibility graph could be created for " + file)
-        show_Message("\nGraVis is done!")
-
-    def label_binary_image(self, selectedImage):
-        """
-        check if input is binary image and label all objects (white)
-        """
-        rawImage = skimage.io.imread(selectedImage)
-        if len(rawImage.shape) == 2:
-            if len(np.unique(rawImage)) == 2:
-                binaryImage = rawImage > 0
-            else:
-                show_Message("Warning, the input image is not binary.")
-                binaryImage = rawImage > np.mean(rawImage)
-        else:
-            show_Message("Warning, the input image is not binary.")
-            grayImage = skimage.color.rgb2gray(rawImage)
-            binaryImage = grayImage > 0.5
-        if (1 in binaryImage[0, :]) or (1 in binaryImage[-1, :]) or (1 in binaryImage[:, 0]) or (1 in binaryImage[:, -1]):
-            binaryImage = np.pad(binaryImage, pad_width=3, mode='constant', constant_values=0)
-        labeledImage, labels = sp.ndimage.label(binaryImage, np.ones((3,3)))
-        return(labeledImage, labels)
-
-    def read_roi_file(self, filename):
-        """
-        read roi file and return corresponding x/y coordinates
-        """
-        fileType = filename.split('/')[-1].split('.')[-1]
-        if fileType == 'roi' or fileType == 'ROI':
-            keyName = filename.split('/')[-1].split('.')[0]
-            roiFile = read_roi.read_roi_file(filename)
-            xCoordinates = roiFile[keyName]['x']
-            yCoordinates = roiFile[keyName]['y']
-            cellContour = np.array(list(zip(xCoordinates, yCoordinates)))
-            return(keyName, cellContour)
-        else:
-            messagebox.showinfo("Warning", "The folder you chose, inludes ROI files and other file types. Please remove files which are not ROI files for the analysis.")
-
-    def save_contour_and_graph_roi(self, visGraph, cellContour, outputFolder):
-        """
-        save the visibility graph and cell contour extracted from ROI file
-        """
-        if len(cellContour) != 0:
-            cellContoursPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
-            pickle.dump(cellContour, cellContoursPickle)
-            cellContoursPickle.close()
-        if len(visGraph.nodes()) != 0:
-            visGraphsPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
-            pickle.dump(visGraph, visGraphsPickle)
-            visGraphsPickle.close()
-
-    def visibility_graphs_other(self, labeledImage, labels, resolution, outputFolder):
-        """
-        create a visibility graph for all cells
-        """
-        visGraphsAll = {}
-        cellContoursAll = {}
-        for label in range(1, labels+1):
-            show_Message("......Graph " + str(label) + " of " + str(labels))
-            visGraph, cellContour = self.create_visibility_graph(labeledImage, label, resolution)
-            if visGraph != None:
-                visGraphsAll[label] = visGraph
-                visGraphsOtherPickle = open(outputFolder + '/visibilityGraphs.gpickle', 'ab')
-                pickle.dump(visGraph, visGraphsOtherPickle)
-                visGraphsOtherPickle.close()
-                cellContoursOtherPickle = open(outputFolder + '/cellContours.gpickle', 'ab')
-                pickle.dump(cellContour, cellContoursOtherPickle)
-                cellContoursOtherPickle.close()
-        return(visGraphsAll)
-
-    def create_visibility_graph(self, labeledImage, label, resolution):
-        """
-        create visibility graph from cell contour
-        """
-        visGraph = nx.Graph()
-        contourImage, cellContourOrdered = self.extract_cell_contour(label, labeledImage)
-        if len(cellContourOrdered) != 0:
-            pixelsOnContour = interpolate_contour_pixels(cellContourOrdered, resolution)
-            if len(pixelsOnContour) != 0 and len(pixelsOnContour) >= 4:
-                for key in pixelsOnContour:
-                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
-                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
-            else:
-                visGraph, cellContourOrdered = None, None
-        else:
-            visGraph, cellContourOrdered = None, None
-        return(visGraph, cellContourOrdered)
-
-    def create_visibility_graph_roi(self, cellContour, resolution):
-        """
-        create visibility graph from cell contour
-        """
-        visGraph = nx.Graph()
-        if len(cellContour) != 0:
-            pixelsOnContour = interpolate_contour_pixels(cellContour, resolution)
-            if len(pixelsOnContour) != 0 and len(pixelsOnContour) >= 4:
-                for key in pixelsOnContour:
-                    visGraph.add_node(key, pos=(pixelsOnContour[key][0], pixelsOnContour[key][1]))
-                visGraph = self.add_edges_to_visGraph(pixelsOnContour, visGraph)
-        return(visGraph)
-
-    def extract_cell_contour(self, label, labeledImage):
-        """
-        extract the contour of a specified cell
-        """
-        cellImage = labeledImage == label
-        contourImage = invert(cellImage)
-        if np.all([np.all(cellImage[..., 0:, 0] == 0), np.all(cellImage[..., 0, 0:] == 0), np.all(cellImage[..., 0:, -1] == 0), np.all(cellImage[..., -1, 0:] == 0),]):
-            cellContour = find_contour_of_object(cellImage)
-            cellContourOrdered = marching_squares(cellContour, cellImage)
-        else:
-            cellImageBuffer = np.pad(cellImage, pad_width=2, mode='constant', constant_values=0)
-            cellContour = find_contour_of_object(cellImageBuffer)
-            cellContourOrdered = marching_squares(cellContour, cellImageBuffer)
-        for xPos, yPos in cellContourOrdered:
-            contourImage[xPos, yPos] = 1
-        return(contourImage, cellContourOrdered)
-
-    def add_edges_to_visGraph(self, pixelsOnContour, visGraph):
-        """
-        add edge to visGraph if the edge between two nodes lies inside the cell (concave)
-        """
-        cases = ['FFFF0F212','0FFF0F212','1FFF0F212','F0FF0F212','00FF0F212','10FF0F212','F1FF0F212']
-        Polygon = shapely.geometry.Polygon([[pixelsOnContour[key][1], pixelsOnContour[key][0]] for key in pixelsOnContour])
-        Boundary = shapely.geometry.LineString(list(Polygon.exterior.coords))
-        combs = itertools.combinations(range(len(pixelsOnContour)), 2)
-        for node1, node2 in list(combs):
-            line = shapely.geometry.LineString(((pixelsOnContour[node1][1], pixelsOnContour[node1][0]), (pixelsOnContour[node2][1], pixelsOnContour[node2][0])))
-            DE9IM = line.relate(Polygon)
-            if DE9IM in cases:
-                intersection = Boundary.intersection(line)
-                if DE9IM == '10FF0F212' and len(intersection) <= 3:
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-                if DE9IM == 'F1FF0F212' and intersection.geom_type == 'LineString':
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-                if DE9IM in cases[:5]:
-                    visGraph.add_edge(node1, node2, length=euclidean(pixelsOnContour[node1], pixelsOnContour[node2]))
-        return(visGraph)
-
-    def add_data_to_table(self, visGraph, file, index, labeledFile, outputFolder):
-        """
-        summarize all results in a table
-        """
-        fileName = file.split('/')[-1]
-        sigma = self.compute_graph_complexity(visGraph)
-        dataAppend = [fileName, labeledFile, index, visGraph.number_of_nodes(), visGraph.number_of_edges(), sigma]
-        self.shapeResultsTable.loc[0] = dataAppend
-        if not os.path.isfile(outputFolder + '/ShapeResultsTable.csv'):
-            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
-        else:
-            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-
-    def add_data_to_table_roi(self, visGraph, filename, outputFolder):
-        """
-        summarize all results in a table
-        """
-        sigma = self.compute_graph_complexity(visGraph)
-        dataAppend = [filename, visGraph.number_of_nodes(), visGraph.number_of_edges(), sigma]
-        self.shapeResultsTable.loc[0] = dataAppend
-        if not os.path.isfile(outputFolder + '/ShapeResultsTable.csv'):
-            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, sep=';', decimal=',')
-        else:
-            self.shapeResultsTable.to_csv(outputFolder + '/ShapeResultsTable.csv', mode='a', index=False, header=False, sep=';', decimal=',')
-
-    def compute_graph_complexity(self, visGraph):
-        """
-        compute the complexity of the graph using the relative density of the clique
-        """
-        edgesCompleteGraph = (visGraph.number_of_nodes() * (visGraph.number_of_nodes() - 1)) * 0.5
-        delta = visGraph.number_of_edges() / edgesCompleteGraph
-        return(delta)
-
-    def plot_labeled_image(self, labeledImage, outputFolder, labels, fileType, index):
-        """
-        plot the labeled image with labels
-        """
-        textPositions = []
-        textString = []
-        for idx in range(1, labels + 1):
-            label = labeledImage == idx
-            cmx, cmy = sp.ndimage.measurements.center_of_mass(label)
-            textPositions.append([cmx, cmy])
-            graphNumber = idx + index - 1
-            textString.append(str(graphNumber))
-
-        fig, axs = plt.subplots(1, 1, figsize=(10, 10))
-        plt.imshow(labeledImage, cmap='viridis')
-        axs.axes.get_yaxis().set_visible(False)
-        axs.axes.get_xaxis().set_visible(False)
-        for idx in range(len(textString)):
-            plt.text(textPositions[idx][1], textPositions[idx][0], textString[idx], fontsize=8, color='white')
-        if fileType == 'image':
-            fig.savefig(outputFolder + '/LabeledShapes.png', bbox_inches='tight', dpi=300)
-        else:
-            fig.savefig(outputFolder + '/LabeledShapes_' + str(index) + '.png', bbox_inches='tight', dpi=300)
-            return('LabeledShapes_' + str(index) + '.png')
-
-class Comparison:
-
-    def __init__(self, outputFolder, pathToVisibilityGraphs, entries, plotPCA, plotDendrogram):
-        self.pathToVisibilityGraphs = list(pathToVisibilityGraphs.values())
-        if len(entries) != 0:
-            self.inputLabels = []
-            for key in entries.keys():
-                self.inputLabels.append(entries[key].get())
-        self.outputFolder = outputFolder
-
-        self.plotPCA = plotPCA
-        self.plotDendrogram = plotDendrogram
-        self.resultsTable = pd.DataFrame(columns=['File', 'Graph', 'Label', 'Color'])
-        self.colorList = ['#0077bb', '#ee3377', '#ee7733', '#009988', '#33bbee', '#cc3311', '#bbbbbb']
-
-        self.visibilityGraphsAll = []
-        if len(self.pathToVisibilityGraphs) == 1:
-            self.visibilityGraphs = {}
-            graphCounter = 1
-            with open(self.pathToVisibilityGraphs[0], 'rb') as pickleFile:
-                try:
-                    while True:
-                        obj = pickle.load(pickleFile)
-                        try:
-                            items = obj.items()
-                            self.visibilityGraphs = obj
-                        except (AttributeError, TypeError):
-                            self.visibilityGraphs[graphCounter] = obj
-                            graphCounter += 1
-                except EOFError:
-                    pass
-            self.inputLabels = np.arange(1, len(self.visibilityGraphs) + 1, 1)
-            for indexKey, key in enumerate(self.visibilityGraphs.keys()):
-                self.visibilityGraphsAll.append(self.visibilityGraphs[key])
-                dataAppend = [self.pathToVisibilityGraphs[0].split('/')[-1], indexKey+1, indexKey+1, 'gray']
-                self.resultsTable.loc[len(self.resultsTable)] = dataAppend
-        else:
-            for index, graphSet in enumerate(self.pathToVisibilityGraphs):
-                self.visibilityGraphs = {}
-                graphCounter = 1
-                with open(graphSet, 'rb') as pickleFile:
-                    try:
-                        while True:
-                            obj = pickle.load(pickleFile)
-                            try:
-                                items = obj.items()
-                                self.visibilityGraphs = obj
-                            except (AttributeError, TypeError):
-                                self.visibilityGraphs[graphCounter] = obj
-                                graphCounter += 1
-                    except EOFError:
-                        pass
-                for indexKey, key in enumerate(self.visibilityGraphs.keys()):
-                    self.visibilityGraphsAll.append(self.visibilityGraphs[key])
-                    dataAppend = [graphSet.split('/')[-1], indexKey+1, self.inputLabels[index], self.colorList[index]]
-                    self.resultsTable.loc[len(self.resultsTable)] = dataAppend
-
-        if len(self.visibilityGraphsAll) <= 200:
-            self.distanceMatrix = self.calculate_distance_matrix(self.visibilityGraphsAll)
-            np.save(self.outputFolder + "/distanceMatrix.npy", self.distanceMatrix)
-            self.resultsTable.to_csv(self.outputFolder + "/annotationsDistanceMatrix.csv", index=False, sep=';', decimal=',')
-            if self.plotPCA == True:
-                self.plot_PCA(self.distanceMatrix, self.resultsTable)
-            if self.plotDendrogram == True:
-                self.plot_Dendrogram(self.distanceMatrix, self.resultsTable)
-        else:
-            messagebox.showinfo("Warning", "The number of graphs you selected is too large.")
-
-    def calculate_distance_matrix(self, visibilityGraphs):
-        """
-        calculate the distance matrix of the input visibility graphs
-        """
-        show_Message("...Calculate distance matrix.")
-        self.distanceMatrix = np.zeros((len(visibilityGraphs), len(visibilityGraphs)))
-        for index in range(len(visibilityGraphs)):
-            graph1 = visibilityGraphs[index]
-            for pair in range(len(visibilityGraphs)):
-                graph2 = visibilityGraphs[pair]
-                distance = self.calculate_Laplacian(graph1, graph2)
-                self.distanceMatrix[index, pair] = distance
-        return(self.distanceMatrix)
-
-    def calculate_Laplacian(self, graph1, graph2):
-        """
-        calculate the distance between two graphs using the Kolmogorov-Smirnov statistic of the eigenvalue distributions of the Laplacian matrices
-        """
-        laplacianGraph1 = nx.laplacian_matrix(graph1).toarray()
-        laplacianGraph2 = nx.laplacian_matrix(graph2).toarray()
-        eigenvaluesGraph1 = np.linalg.eig(laplacianGraph1)[0]
-        normalizedEigenvaluesGraph1 = eigenvaluesGraph1 / np.max(eigenvaluesGraph1)
-        eigenvaluesGraph2 = np.linalg.eig(laplacianGraph2)[0]
-        normalizedEigenvaluesGraph2 = eigenvaluesGraph2 / np.max(eigenvaluesGraph2)
-        distance = sp.stats.ks_2samp(normalizedEigenvaluesGraph1, normalizedEigenvaluesGraph2)[0]
-        return(distance)
-
-    def plot_PCA(self, distanceMatrix, resultsTable):
-        """
-        plot a PCA from the provided distance matrix and labels
-        """
-        if resultsTable['Label'].dtype == 'float':
-            labels = [int(element) for element in resultsTable['Label']]
-        else:
-            labels = list(resultsTable['Label'])
-        colors = resultsTable['Color']
-        pca = sklearn.decomposition.PCA(n_components=2)
-        principalComponents = pca.fit_transform(distanceMatrix)
-
-        fig, ax = plt.subplots(1, 1, figsize=(10, 10))
-        ax.set_xlabel('PC1 (' + str(np.round(pca.explained_variance_ratio_[0] * 100, 1)) + '%)')
-        ax.set_ylabel('PC2 (' + str(np.round(pca.explained_variance_ratio_[1] * 100, 1)) + '%)')
-        if len(np.unique(colors)) == 1:
-            ax.scatter(principalComponents[:, 0], principalComponents[:, 1], c=colors, s=50, marker='o')
-            for index, text in enumerate(labels):
-                ax.annotate(text, (principalComponents[index][0]+0.03, principalComponents[index][1]))
-        else:
-            start, stop  = 0, 0
-            for index, color in enumerate(np.unique(colors)):
-                stop = len(resultsTable[resultsTable['Color'] == color]) + stop
-                selectedPC1, selectedPC2 = principalComponents[start:stop, 0], principalComponents[start:stop, 1]
-                ax.scatter(selectedPC1, selectedPC2, c=color, s=50, marker='o', label=labels[start])
-                start += len(resultsTable[resultsTable['Color'] == color])
-            ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), fancybox=True, shadow=True, ncol=5)
-        fig.savefig(self.outputFolder + '/PCA_DistanceMatrix.png', bbox_inches='tight', dpi=300)
-
-    def plot_Dendrogram(self, distanceMatrix, resultsTable):
-        """
-        plot the dendrogram of the calculated distance matrix using complete linkage hierarchical clustering
-        """
-        if resultsTable['Label'].dtype == 'float':
-            labels = [int(element) for element in resultsTable['Label']]
-        else:
-            labels = list(resultsTable['Label'])
-        upperTriangle = sp.spatial.distance.squareform(distanceMatrix)
-        linked = sp.cluster.hierarchy.linkage(upperTriangle, 'complete')
-
-        fig = plt.figure(figsize=(5, 3))
-        sp.cluster.hierarchy.dendrogram(linked, orientation='top', labels=labels, distance_sort='descending', show_leaf_counts=True)
-        plt.xticks(fontsize=7, rotation=45)
-        plt.yticks(fontsize=7)
-        fig.savefig(self.outputFolder + '/Dendrogram_DistanceMatrix.png', bbox_inches='tight', dpi=300)
-
-##### general functions #####
-def show_Message(msg):
-    logging.info(msg)
-
-def keep_labels_on_border(labeledImage):
-    """
-    modified version of skimage.segmentation.clear_border to keep only labels touching the image border
-    """
-    image = labeledImage
-    # create borders with buffer_size
-    borders = np.zeros_like(image, dtype=np.bool_)
-    ext = 1
-    slstart = slice(ext)
-    slend   = slice(-ext, None)
-    slices  = [slice(s) for s in image.shape]
-    for d in range(image.ndim):
-        slicedim = list(slices)
-        slicedim[d] = slstart
-        borders[tuple(slicedim)] = True
-        slicedim[d] = slend
-        borders[tuple(slicedim)] = True
-
-    labels = skimage.measure.label(image, background=0)
-    number = np.max(labeledImage) + 1
-    # determine all objects that are connected to borders
-    borders_indices = np.unique(labeledImage[borders])
-    indices = np.arange(number + 1)
-    # mask all label indices that are not connected to borders
-    label_mask = ~np.in1d(indices, borders_indices)
-    mask = label_mask[labeledImage.ravel()].reshape(labeledImage.shape)
-    image[mask] = 0
-    return(image)
-
-def find_edge_contour(image):
-    """
-    extract contour of artificial edges
-    """
-    # add buffer to image to detect contour also on borders
-    bufferedImage = skimage.util.pad(image, pad_width=2, mode='constant')
-    edgeContour = find_contour_of_object(bufferedImage)
-    return(edgeContour)
-
-def find_contour_of_object(cellObject):
-    """
-    find contour of an object
-    """
-    contour = []
-    coord = np.transpose(np.where(cellObject != 0))
-    lenX, lenY = cellObject.shape[0] - 1, cellObject.shape[1] - 1
-    for x,y in coord:
-        xmin,xmax = bounds(x-1, 0, lenX), bounds(x+1, 0, lenX)
-        ymin,ymax = bounds(y-1, 0, lenY), bounds(y+1, 0, lenY)
-        if xmax != x and xmin != x and ymax != y and ymin != y:
-            if cellObject[xmin, y] == 0 and [xmin, y] not in contour:
-                    contour.append([xmin, y])
-            if cellObject[x, ymin] == 0 and [x, ymin] not in contour:
-                    contour.append([x, ymin])
-            if cellObject[x, ymax] == 0 and [x, ymax] not in contour:
-                    contour.append([x, ymax])
-            if cellObject[xmax, y] == 0 and [xmax, y] not in contour:
-                    contour.append([xmax, y])
-        else:
-            if [x, y] not in contour:
-                contour.append([x, y])
-    return(np.asarray(contour))
-
-def bounds(x,xmin,xmax):
-    """
-    define bounds of image window
-    """
-    if (x <= xmin): #if x is smaller than xmin, set x to xmin
-        x = xmin
-    elif ( x >= xmax):   #if x is larger than xmax, set x to xmax
-        x = xmax
-    return(x)
-
-def contour_orientation(window):
-    """
-    define the orientatin of the image pixel window
-    """
-    orient = []
-    if np.sum(window[:, 0] > 0) == 3:
-        orient.append('left')
-    if np.sum(window[:, 2] > 0) == 3:
-        orient.append('right')
-    if np.sum(window[0, :] > 0) == 3:
-        orient.append('top')
-    if np.sum(window[2, :] > 0) == 3:
-        orient.append('bottom')
-    return(orient)
-
-def measure_intensity_along_contour(image, x, y, orientation, listOfCorrectedPixels):
-    """
-    measure intensity along contour to detect intensity gradients
-    """
-    lx, ly = image.shape[0] - 1, image.shape[1] - 1
-    if 'top' in orientation:
-        xmin, xmax = bounds(x-10, 0, lx), bounds(x+1, 0, lx)
-        ymin, ymax = bounds(y-1, 0, ly), bounds(y+2, 0, ly)
-        new_window = image[xmin:xmax, ymin:ymax].astype('int')
-        window_means = np.mean(new_window, axis=1)[::-1]
-
-    if 'right' in orientation:
-        xmin, xmax = bounds(x-1, x, lx), bounds(x+2, 0, lx)
-        ymin, ymax = bounds(y, 0, ly), bounds(y+11, 0, ly)
-        new_window = image[xmin:xmax, ymin:ymax].astype('int')
-        window_means = np.mean(new_window, axis=0)
-
-    if 'bottom' in orientation:
-        xmin, xmax = bounds(x, 0, lx), bounds(x+11, 0, lx)
-        ymin, ymax = bounds(y-1, 0, ly), bounds(y+2, 0, ly)
-        new_window = image[xmin:xmax, ymin:ymax].astype('int')
-        window_means = np.mean(new_window, axis=1)
-
-    if 'left' in orientation:
-        xmin, xmax = bounds(x-1, 0, lx), bounds(x+2, 0, lx)
-        ymin, ymax = bounds(y-10, 0, ly), bounds(y+1, 0, ly)
-        new_window = image[xmin:xmax, ymin:ymax].astype('int')
-        window_means = np.mean(new_window, axis=0)[::-1]
-
-    if len(window_means) > 5:
-        window_percentage = window_means[1:] * 100 / window_means[0]
-        if window_percentage[2] > 25 and [x, y] not in listOfCorrectedPixels:
-            listOfCorrectedPixels.append([x, y])
-    return(listOfCorrectedPixels)
-
-def tube_filter(image, sigma):
-    """
-    enhance tube-like structures
-    """
-    if Version(skimage.__version__) < Version('0.14'):
-        imH=skimage.feature.hessian_matrix(image, sigma=sigma, mode='reflect')
-        imM=skimage.feature.hessian_matrix_eigvals(imH[0], imH[1], imH[2])
-    else:
-        imH=skimage.feature.hessian_matrix(image, sigma=sigma, mode='reflect', order='xy')
-        imM=skimage.feature.hessian_matrix_eigvals(imH)
-    imR = -1.0 * imM[1]
-    imT = 255.0 * (imR - imR.min()) / (imR.max() - imR.min())
-    imT = imT.astype('int')
-    return(imT)
-
-def correct_gaps_in_skeleton(skeletonImage):
-    """
-    find gaps in the skeleton and close them if the gap is small and both ends have the same direction/angle
-    """
-    skeletonImage = skeletonImage * 1
-    correctedSkeletonImage = skeletonImage.copy()
-    endpoints = detect_crossings_and_endpoints(skeletonImage, mode='endpoints', output='list')
-    if len(endpoints) != 0:
-        distanceBins = sort_coordinate_distances(endpoints)
-        correctingEndpoints = np.transpose(np.where(distanceBins==1))
-        imageEndpointsCrossings = detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
-
-        for xPos, yPos in correctingEndpoints:
-            angles, rows, columns = evaluate_angle(xPos, yPos, endpoints, imageEndpointsCrossings)
-            if len(angles) != 0 and (np.max(angles) - np.min(angles) < 20):
-                correctedSkeletonImage[rows, columns] = 2
-                #print("Correction added: ", str(xPos), str(yPos))
-    return(correctedSkeletonImage)
-
-def evaluate_angle(x, y, endpoints, image):
-    """
-    evaluate whether the angles of both endpoints are similar
-    """
-    allAngles = []
-    xPos1, yPos1 = endpoints[x]
-    xPos2, yPos2 = endpoints[y]
-    rows, columns = skimage.draw.line(xPos1, yPos1, xPos2, yPos2)
-    if np.sum(image[rows[1:-1], columns[1:-1]]) == 0:
-        angleEndpoint1 = measure_angle_of_endpoints(xPos1, yPos1, image)
-        angleEndpoint2 = measure_angle_of_endpoints(xPos2, yPos2, image)
-        if xPos2 < xPos1:
-            angleBetweenEndpoints = angle180([yPos2 - yPos1, xPos2 - xPos1])
-        else:
-            angleBetweenEndpoints = angle180([yPos1 - yPos2, xPos1 - xPos2])
-        allAngles = [angleEndpoint1, angleEndpoint2, angleBetweenEndpoints]
-    return(allAngles, rows, columns)
-
-def create_window(image, x, y, xUp, xDown, yLeft, yRight):
-    """
-    create a window from the specified coordinates in the image
-    """
-    lx, ly = image.shape[0] - 1, image.shape[1] - 1
-    xmin, xmax = bounds(x - xUp, 0, lx), bounds(x + xDown, 0, lx)
-    ymin, ymax = bounds(y - yLeft, 0, ly), bounds(y + yRight, 0, ly)
-    window = image[xmin:xmax, ymin:ymax].copy()
-    return(window, [xmin, xmax, ymin, ymax])
-
-def sort_coordinate_distances(points):
-    """
-    sort the distances of different points into bins
-    """
-    distance = sp.spatial.distance_matrix(points, points)
-    bins = [0, 1, 10, 20, 50, 100, 500, 1000, 9999]
-    distance_bins = np.zeros((len(points), len(points))).astype('int')
-    for i, (b1, b2) in enumerate(zip(bins[:-1], bins[1:])):
-        ida = (distance >= b1) * (distance < b2)
-        distance_bins[ida] = i
-    distance_bins = np.tril(distance_bins)
-    return(distance_bins)
-
-def detect_crossings_and_endpoints(skeletonImage, mode='both', output='image'):
-    """
-    detect crossings and endpoints of the skeleton
-    """
-    skeletonImage = skeletonImage * 1
-    detected_nodes = skeletonImage.copy()
-    node_list = []
-    coord = np.transpose(np.where(skeletonImage == 1))
-    for x, y in coord:
-        window, winBounds = create_window(skeletonImage, x, y, 1, 2, 1, 2)
-        window[x - winBounds[0], y - winBounds[2]] = 0
-        labeledWindow, L = sp.ndimage.label(window)
-        if mode == 'both' or mode == 'endpoints':
-            if L == 1 or L == 0:
-                detected_nodes[x, y] = 3
-                node_list.append([x, y])
-        if mode == 'both' or mode == 'crossings':
-            if L == 3 or L == 4:
-                detected_nodes[x, y] = 2
-                node_list.append([x, y])
-            if L == 2:
-                windowDetected, _ = create_window(detected_nodes, x, y, 1, 2, 1, 2)
-                windowDetected[x - winBounds[0], y - winBounds[2]] = 0
-                labeledWindowConnectivity, Lconnectivity = sp.ndimage.label(windowDetected, np.ones((3, 3)))
-                if 2 not in windowDetected and Lconnectivity == 1:
-                    detected_nodes[x, y] = 2
-                    node_list.append([x, y])
-    if output == 'image':
-        return(detected_nodes)
-    else:
-        return(np.asarray(node_list))
-
-def angle180(dxy):
-    """
-    calculate the angle between two points in 180 degree range
-    """
-    dx, dy = dxy
-    rad2deg = 180.0 / np.pi
-    angle = np.mod(np.arctan2(-dx, -dy) * rad2deg + 360.0, 360.0)
-    if angle >= 270:
-        angle = 360 - angle
-    return(angle)
-
-def measure_angle_of_endpoints(x, y, image):
-    """
-    measure the angle between two endpoint of the skeleton
-    """
-    window, winBounds = create_window(image, x, y, 5, 6, 5, 6)
-    cleanedWindow = (window > 0) * 1
-    labeledWindow, labelsWindow = sp.ndimage.label(cleanedWindow, np.ones((3, 3)))
-    labelSkeleton = labeledWindow[x - winBounds[0], y - winBounds[2]]
-    coordLabel = np.transpose(np.where(labeledWindow == labelSkeleton))
-    newWindow = window.copy() * 0
-    for s, t in coordLabel:
-        newWindow[s, t] = window[s, t]
-
-    if 2 in newWindow:
-        coord = np.transpose(np.where(newWindow == 2))
-        dista = []
-        for s, t in coord:
-            dista.append(euclidean([s, t], [x - winBounds[0], y - winBounds[2]]))
-        w = np.argmin(dista)
-        if x < coord[w][0] + winBounds[0]:
-            angle = angle180([y - (coord[w][1] + winBounds[2]), x - (coord[w][0] + winBounds[0])])
-        else:
-            angle = angle180([(coord[w][1] + winBounds[2]) - y, (coord[w][0] + winBounds[0]) - x])
-    else:
-        coord = np.transpose(np.where(window == 1))
-        dista = []
-        for s, t in coord:
-            dista.append(euclidean([s, t], [x - winBounds[0], y - winBounds[2]]))
-        if len(dista) != 0:
-            w = np.argmax(dista)
-            if x < coord[w][0] + winBounds[0]:
-                angle = angle180([y - (coord[w][1] + winBounds[2]), x - (coord[w][0] + winBounds[0])])
-            else:
-                angle = angle180([(coord[w][1] + winBounds[2]) - y, (coord[w][0] + winBounds[0]) - x])
-        else:
-            angle = 0
-    return(angle)
-
-def euclidean(x, y):
-    """
-    calculate the Euclidean distance between two points
-    """
-    dist = math.sqrt(((int(x[0]) - int(y[0])) ** 2) + ((int(x[1]) - int(y[1])) ** 2))
-    return(dist)
-
-def detect_branches(skeletonImage, mode='remove'):
-    """
-    remove skeleton branches by tracking from endpoints back to crossings
-    """
-    detected_nodes = detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
-    branch_filament = (detected_nodes == 3).sum()
-    while branch_filament > 0:
-        branchless = track_or_remove_branches(detected_nodes, mode=mode)
-        detected_nodes = detect_crossings_and_endpoints(branchless, mode='both', output='image')
-        branch_filament = (detected_nodes == 3).sum()
-    if mode == 'remove':
-        return(detected_nodes > 0)
-    else:
-        return(detected_nodes)
-
-def track_or_remove_branches(detected_nodes, mode):
-    """
-    depending on the mode either remove or track detected branches
-    """
-    branch_filament = (detected_nodes==3).sum()
-    while branch_filament > 0:
-        coord = np.transpose(np.where(detected_nodes==3))
-        for x, y in coord:
-            window, winBounds = create_window(detected_nodes, x, y, 1, 2, 1, 2)
-            label_counts = np.sum(np.unique(window) > 0)
-            label_sum = np.sum(window)
-            label_number = np.sum(window > 0)
-            if mode == 'remove':
-                if label_counts == 2:
-                    detected_nodes[winBounds[0]:winBounds[1], winBounds[2]:winBounds[3]] = np.where(window == 1, 3, window)
-                detected_nodes[x, y] = 0
-            else:
-                if (label_counts <= 3 and label_sum < 9) or (label_sum == 9 and label_number == 4):
-                    detected_nodes[winBounds[0]:winBounds[1], winBounds[2]:winBounds[3]] = np.where(window == 1, 3, window)
-                detected_nodes[x, y] = 4
-        branch_filament = (detected_nodes == 3).sum()
-    if mode == 'remove':
-        return(detected_nodes > 0)
-    else:
-        return(detected_nodes)
-
-def create_labeled_and_tracked_image(skeletonImage, labeledImage):
-    """
-    create a labeled image, where background=0, skeleton=1, tracked branches=2 and cell labels>=3
-    """
-    labeledTrackedImage = labeledImage.copy() + 3
-    trackedImage = detect_branches(skeletonImage, mode='track')
-    trackedPixels = np.transpose(np.where(trackedImage ==4))
-    skeletonPixels = np.transpose(np.where(labeledTrackedImage == 3))
-    backgroundPixels = np.transpose(np.where(labeledTrackedImage == 4))
-
-    labeledTrackedImage[backgroundPixels[:,0], backgroundPixels[:,1]] = 0
-    labeledTrackedImage[skeletonPixels[:,0], skeletonPixels[:,1]] = 1
-    labeledTrackedImage[trackedPixels[:,0], trackedPixels[:,1]] = 2
-    return(labeledTrackedImage)
-
-def marching_squares(contour, cellImage):
-    """
-    sort contour coordinates using marchin squares algorithm
-    """
-    contourCopy = contour.copy()
-    orderedContour = np.empty(shape = [0, 2])
-    xRight,yRight = find_rightmost_point(contour)
-    contourImage = cellImage.copy() * 2
-    contourImage[contour[:, 0], contour[:, 1]] = 1
-    timeout = 120
-    startTime = time.time()
-    while len(contourCopy) > 0:
-        timeDelta = time.time() - startTime
-        if timeDelta >= timeout:
-            show_Message('......Encountered timeout error while sorting the contour coordinates.')
-            break
-        window = contourImage[xRight:xRight+2, yRight:yRight+2]
-        nextWindow, nextContourPixel = orientation(window)
-        if len(nextContourPixel) > 0:
-            for pixel in range(len(nextContourPixel)):
-                xPos, yPos = xRight + nextContourPixel[pixel][0], yRight + nextContourPixel[pixel][1]
-                arrayPosition = np.where((orderedContour == [xPos, yPos]).all(axis=1))[0]
-                if len(arrayPosition) == 0:
-                    index = find_index_of_coordinates([xPos, yPos], contourCopy, [0], 'index')
-                    if len(index) != 0:
-                        orderedContour = np.append(orderedContour, [[xPos, yPos]], axis=0)
-                        contourCopy = np.delete(contourCopy, index[0], 0)
-                        'orderedContour'
-                else:
-                    for xPos, yPos in contourCopy:
-                        index = find_index_of_coordinates([xPos, yPos], contour, [0], 'index')
-                        contour = np.delete(contour, index[0], 0)
-                    contourCopy = []
-        if nextWindow == 'left':
-            yRight = yRight - 1
-        elif nextWindow == 'right':
-            yRight = yRight + 1
-        elif nextWindow == 'up':
-            xRight = xRight- 1
-        elif nextWindow == 'down':
-            xRight = xRight + 1
-    if len(orderedContour) != len(contour):
-        clockwise = []
-    else:
-        clockwise = np.append([orderedContour[0]], orderedContour[-1:0:-1], axis=0)
-        clockwise = clockwise.astype('int')
-    return(clockwise)
-
-def find_rightmost_point(contour):
-    """
-    return the rightmost point of a list of coordinates
-    """
-    index = np.where(contour[:, 1] == np.max(contour[:, 1]))[0]
-    return(contour[index[0]][0], contour[index[0]][1])
-
-def orientation(window):
-    """
-    define the direction of the shift for the next window according to the marching square algorithm
-    """
-    orient=''
-    nextContourPixel = []
-    if np.sum(window > 0) == 0:
-        orient = 'right'
-    elif np.sum(window > 0) == 1:
-        if window[0, 0] != 0:
-            orient = 'up'
-        elif window[0, 1] != 0:
-            orient = 'right'
-        elif window[1, 0] != 0:
-            orient = 'left'
-        elif window[1, 1] != 0:
-            orient = 'down'
-    elif np.sum(window > 0) == 2:
-        if window[0, 1] != 0 and window[1, 1] != 0:
-            orient = 'down'
-            nextContourPixel = [[1, 1]]
-        elif window[0, 0] != 0 and window[0, 1] != 0:
-            orient = 'right'
-            nextContourPixel = [[0, 1]]
-        elif window[0, 0] != 0 and window[1, 0] != 0:
-            orient = 'up'
-            nextContourPixel = [[0, 0]]
-        elif window[1, 0] != 0 and window[1, 1] != 0:
-            orient = 'left'
-            nextContourPixel = [[1, 0]]
-        elif window[0, 0] != 0 and window[1, 1] != 0:
-            orient = 'up'
-            nextContourPixel = [[0, 0]]
-        elif window[0, 1] != 0 and window[1, 0] != 0:
-            orient = 'left'
-            nextContourPixel = [[1, 0]]
-    elif np.sum(window > 0) == 3:
-        if window[0, 0] != 0 and window[0, 1] != 0 and window[1, 1] != 0:
-            orient = 'down'
-            if window[0, 1] == 1:
-                nextContourPixel = [[0, 1], [1, 1]]
-            else:
-                nextContourPixel = [[1, 1]]
-        elif window[0, 0] != 0 and window[1, 0] != 0 and window[1, 1] != 0:
-            orient = 'up'
-            if window[1, 0] == 1:
-                nextContourPixel = [[1, 0], [0, 0]]
-            else:
-                nextContourPixel = [[0, 0]]
-        elif window[0, 1] != 0 and window[1, 0] != 0 and window[1, 1] != 0:
-            orient = 'left'
-            if window[1, 1] == 1:
-                nextContourPixel = [[1, 1], [1, 0]]
-            else:
-                nextContourPixel = [[1, 0]]
-        elif window[0, 0] != 0 and window[0, 1] != 0 and window[1, 0] != 0:
-            orient = 'right'
-            if window[0, 0] == 1:
-                nextContourPixel = [[0, 0], [0, 1]]
-            else:
-                nextContourPixel = [[0, 1]]
-    else:
-        print('Error: too many pixels in window.')
-    return(orient, nextContourPixel)
-
-def find_index_of_coordinates(point, array, radius, output):
-    """
-    find position of point coordinates around radius in an array
-    """
-    foundPositions = []
-    combinations = list(itertools.product(radius, repeat=2))
-    for xRadius, yRadius in combinations:
-        w = np.where((point[0]+xRadius == array[:, 0]) & (point[1]+yRadius == array[:, 1]))[0]
-        if len(w) > 0:
-            if output == 'index':
-                foundPositions.append(w[0])
-            else:
-                foundPositions.append([xRadius, yRadius])
-    return(foundPositions)
-
-def calculate_pixel_distance(resolution):
-    """
-    calculate the optimal pixel distance between nodes along the contour from the image resolution
-    """
-    pixelDistance = int(np.round(1 / (resolution * 0.65)))
-    return(pixelDistance)
-
-def interpolate_contour_pixels(cellContour, pixelDistance):
-    """
-    determine all cell contour pixels which will be assigned as nodes according to the optimal pixel distance
-    """
-    pixelsOnContour = {}
-    contourLength = len(cellContour)
-    contourIndices = np.round(np.linspace(0, contourLength - pixelDistance, (contourLength - pixelDistance) / pixelDistance)).astype('int')
-    pixels = np.asarray(cellContour[contourIndices])
-    for idx in range(len(pixels)):
-        pixelsOnContour[idx] = (pixels[idx][0], pixels[idx][1])
-    return(pixelsOnContour)
-
-def invert(image):
-    """
-    invert image
-    """
-    if image.dtype == 'bool':
-        return ~image
-    else:
-        return dtype.dtype_limits(image, clip_negative=False)[1] - image
-
-def find_local_extrema(array):
-    """
-    find local minima and maxima in array
-    """
-    reverseArray = array[::-1]
-    array = np.append(array, array[:1])
-    reverseArray = np.append(reverseArray, reverseArray[:1])
-    signsArray = calculate_consecutive_difference(array)
-    signsReverseArray = calculate_consecutive_difference(reverseArray)[::-1]
-    neckIndices = []
-    lobeIndices = []
-    for idx, sign in enumerate(signsArray):
-        if sign == '-' and signsReverseArray[idx] == sign:
-            lobeIndices.append(idx)
-        elif sign == '+' and signsReverseArray[idx] == sign:
-            neckIndices.append(idx)
-    return(lobeIndices, neckIndices)
-
-def calculate_consecutive_difference(sequence):
-    """
-    calculate the difference of consecutive elements in an array
-    """
-    difference = [elem1 - elem2 for elem1, elem2 in zip(sequence[:-1], sequence[1:])]
-    signedDifference = np.sign(difference)
-    signedSequence = convert_to_sign(signedDifference)
-    return(signedSequence)
-
-def convert_to_sign(sequence):
-    """
-    convert signed numbers into + and - signs
-    """
-    signs = []
-    for idx in range(len(sequence)):
-        if sequence[idx] > 0:
-            signs.extend('+')
-        elif sequence[idx] < 0:
-            signs.extend('-')
-        else:
-            signs.extend('0')
-    return(''.join(signs))
-
-def get_key_from_value(dictionary, value):
-    """
-    get the dictionary key of a specified value
-    """
-    for key, val in dictionary.items():
-        if val == value:
-            return(key)
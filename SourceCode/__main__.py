@@ -1,8 +1,14 @@
 import sys
-from tkinter import Tk
-from GraVis.ShapeGUI import ShapeGui
 
 def main():
+    if len(sys.argv) > 1:
+        from GraVis.ShapeBatch import run_batch
+        sys.exit(run_batch(sys.argv[1:]))
+    from tkinter import Tk
+    from GraVis.ShapeGUI import ShapeGui
     master = Tk()
     my_gui = ShapeGui(master)
     master.mainloop()
+
+if __name__ == '__main__':
+    main()
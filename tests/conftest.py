@@ -0,0 +1,80 @@
+import os
+import sys
+import types
+import numpy as np
+import pytest
+
+# the source folder is imported as the GraVis package, like with python -m GraVis
+sourceFolder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'SourceCode')
+if 'GraVis' not in sys.modules:
+    package = types.ModuleType('GraVis')
+    package.__path__ = [sourceFolder]
+    sys.modules['GraVis'] = package
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+
+def random_cell_mask(rng, size=40):
+    """
+    create a random binary cell of discs with one pixel wide bars and slits, which give collinear runs, spikes and touching contour parts
+    """
+    mask = np.zeros((size, size), dtype=bool)
+    xGrid, yGrid = np.mgrid[:size, :size]
+    for disc in range(rng.integers(1, 4)):
+        xCenter, yCenter = rng.integers(10, size - 10, 2)
+        mask |= (xGrid - xCenter) ** 2 + (yGrid - yCenter) ** 2 < rng.integers(3, 8) ** 2
+    for bar in range(rng.integers(0, 5)):
+        xStart, yStart = rng.integers(5, size - 5, 2)
+        length = rng.integers(3, 12)
+        # bars are added to the cell and slits are cut out of it
+        isBar = rng.random() < 0.5
+        if rng.random() < 0.5:
+            mask[xStart, yStart:min(yStart + length, size - 3)] = isBar
+        else:
+            mask[xStart:min(xStart + length, size - 3), yStart] = isBar
+    return(mask)
+
+def contour_nodes(contour, pixelDistance):
+    """
+    take every pixelDistance-th pixel of a sorted contour as node
+    """
+    pixels = np.asarray(contour)[::pixelDistance]
+    return({node: (pixels[node][0], pixels[node][1]) for node in range(len(pixels))})
+
+@pytest.fixture(scope='session')
+def pixel_polygons():
+    """
+    contour nodes of random cells sorted like in the visibility graph extraction
+    """
+    ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+    sp = pytest.importorskip('scipy')
+    rng = np.random.default_rng(2024)
+    polygons = []
+    while len(polygons) < 40:
+        labeledMask, labels = sp.ndimage.label(random_cell_mask(rng))
+        if labels == 0:
+            continue
+        cellImage = np.pad(labeledMask == np.argmax(np.bincount(labeledMask.ravel())[1:]) + 1, 2)
+        contour = ShapeAnalysis.marching_squares(ShapeAnalysis.find_contour_of_object(cellImage), cellImage)
+        if len(contour) == 0:
+            continue
+        pixelsOnContour = contour_nodes(contour, int(rng.choice([1, 2, 3, 5])))
+        if 4 <= len(pixelsOnContour) <= 150:
+            polygons.append(pixelsOnContour)
+    return(polygons)
+
+@pytest.fixture(scope='session')
+def special_polygons():
+    """
+    hand-made polygons with collinear boundary runs, spikes and vertices touching other parts of the boundary
+    """
+    polygons = {
+        'square with collinear runs': [(0, 0), (0, 1), (0, 2), (0, 3), (1, 3), (2, 3), (3, 3), (3, 2), (3, 1), (3, 0), (2, 0), (1, 0)],
+        'spike': [(0, 0), (0, 6), (3, 6), (3, 9), (3, 7), (3, 6), (6, 6), (6, 0)],
+        'spike without repeated node': [(0, 0), (0, 4), (4, 4), (4, 8), (4, 6), (6, 4), (6, 0)],
+        'vertex touching an edge': [(0, 0), (0, 8), (8, 8), (8, 0), (5, 0), (4, 8), (3, 0)],
+        'touching vertices': [(0, 0), (0, 4), (2, 2), (4, 4), (4, 0), (2, 2)],
+        'notch': [(0, 0), (0, 8), (8, 8), (8, 0), (4, 0), (4, 4), (2, 4), (2, 0)],
+        'comb': [(0, 0), (0, 9), (2, 9), (2, 3), (3, 3), (3, 9), (5, 9), (5, 3), (6, 3), (6, 9), (8, 9), (8, 0)],
+    }
+    return({name: dict(enumerate(nodes)) for name, nodes in polygons.items()})
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from test_skeleton_nodes import old_detect_crossings_and_endpoints, random_skeletons
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+
+def old_track_or_remove_branches(detected_nodes, mode):
+    """
+    remove or track the branches by scanning the whole image for endpoints like before the worklist
+    """
+    while (detected_nodes == 3).sum() > 0:
+        for x, y in np.transpose(np.where(detected_nodes == 3)):
+            window, winBounds = ShapeAnalysis.create_window(detected_nodes, x, y, 1, 2, 1, 2)
+            label_counts = np.sum(np.unique(window) > 0)
+            label_sum = np.sum(window)
+            label_number = np.sum(window > 0)
+            if mode == 'remove':
+                if label_counts == 2:
+                    detected_nodes[winBounds[0]:winBounds[1], winBounds[2]:winBounds[3]] = np.where(window == 1, 3, window)
+                detected_nodes[x, y] = 0
+            else:
+                if (label_counts <= 3 and label_sum < 9) or (label_sum == 9 and label_number == 4):
+                    detected_nodes[winBounds[0]:winBounds[1], winBounds[2]:winBounds[3]] = np.where(window == 1, 3, window)
+                detected_nodes[x, y] = 4
+    if mode == 'remove':
+        return(detected_nodes > 0)
+    return(detected_nodes)
+
+def old_detect_branches(skeletonImage, mode='remove'):
+    """
+    classify the whole skeleton again after every pass like before the worklist
+    """
+    detected_nodes = old_detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
+    while (detected_nodes == 3).sum() > 0:
+        branchless = old_track_or_remove_branches(detected_nodes, mode=mode)
+        detected_nodes = old_detect_crossings_and_endpoints(branchless, mode='both', output='image')
+    if mode == 'remove':
+        return(detected_nodes > 0)
+    return(detected_nodes)
+
+@pytest.mark.parametrize('mode', ['remove', 'track'])
+def test_detect_branches_matches_old_code(mode):
+    for skeletonImage in random_skeletons():
+        assert np.array_equal(ShapeAnalysis.detect_branches(skeletonImage, mode), old_detect_branches(skeletonImage, mode))
+
+def test_detect_branches_with_detected_nodes():
+    for skeletonImage in random_skeletons():
+        detectedNodes = ShapeAnalysis.detect_crossings_and_endpoints(skeletonImage, mode='both', output='image')
+        assert np.array_equal(ShapeAnalysis.detect_branches(skeletonImage, 'remove', detectedNodes), old_detect_branches(skeletonImage, 'remove'))
+
+def test_reclassify_pixels_matches_classifying_the_whole_skeleton():
+    rng = np.random.default_rng(16)
+    for skeletonImage in random_skeletons():
+        for trial in range(3):
+            detected_nodes = old_detect_crossings_and_endpoints(skeletonImage > 0)
+            skeletonPixels = np.argwhere(detected_nodes > 0)
+            removedPixels = skeletonPixels[rng.random(len(skeletonPixels)) < 0.1].tolist()
+            priorEndpoints = detected_nodes == 3
+            for xPos, yPos in removedPixels:
+                detected_nodes[xPos, yPos] = 0
+            endpoints = ShapeAnalysis.reclassify_pixels(detected_nodes, removedPixels)
+            expected = old_detect_crossings_and_endpoints(detected_nodes > 0)
+            assert np.array_equal(detected_nodes, expected)
+            # all new endpoints are returned to follow their branches
+            assert all(expected[xPos, yPos] == 3 for xPos, yPos in endpoints)
+            assert {(xPos, yPos) for xPos, yPos in np.argwhere((expected == 3) & ~priorEndpoints).tolist()} <= {(xPos, yPos) for xPos, yPos in endpoints}
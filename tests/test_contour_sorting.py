@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from conftest import random_cell_mask
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+sp = pytest.importorskip('scipy')
+
+def old_marching_squares(contour, cellImage):
+    """
+    sort contour coordinates like before the lookup table, a step limit replaces the timeout
+    """
+    contourCopy = contour.copy()
+    orderedContour = np.empty(shape=[0, 2])
+    xRight, yRight = ShapeAnalysis.find_rightmost_point(contour)
+    contourImage = cellImage.copy() * 2
+    contourImage[contour[:, 0], contour[:, 1]] = 1
+    steps = 0
+    while len(contourCopy) > 0:
+        steps += 1
+        if steps > 4 * contourImage.size:
+            break
+        window = contourImage[xRight:xRight+2, yRight:yRight+2]
+        nextWindow, nextContourPixel = ShapeAnalysis.orientation(window)
+        for xShift, yShift in nextContourPixel:
+            xPos, yPos = xRight + xShift, yRight + yShift
+            if len(np.where((orderedContour == [xPos, yPos]).all(axis=1))[0]) == 0:
+                index = np.where((contourCopy[:, 0] == xPos) & (contourCopy[:, 1] == yPos))[0]
+                if len(index) != 0:
+                    orderedContour = np.append(orderedContour, [[xPos, yPos]], axis=0)
+                    contourCopy = np.delete(contourCopy, index[0], 0)
+            else:
+                for xPos, yPos in contourCopy:
+                    index = np.where((contour[:, 0] == xPos) & (contour[:, 1] == yPos))[0]
+                    contour = np.delete(contour, index[0], 0)
+                contourCopy = []
+        if nextWindow == 'left':
+            yRight = yRight - 1
+        elif nextWindow == 'right':
+            yRight = yRight + 1
+        elif nextWindow == 'up':
+            xRight = xRight - 1
+        elif nextWindow == 'down':
+            xRight = xRight + 1
+    if len(orderedContour) != len(contour):
+        return([])
+    clockwise = np.append([orderedContour[0]], orderedContour[-1:0:-1], axis=0)
+    return(clockwise.astype('int'))
+
+def test_orientation_table_matches_orientation():
+    for code in range(81):
+        window = np.array([[code % 3, code // 3 % 3], [code // 9 % 3, code // 27]])
+        if np.count_nonzero(window) == 4:
+            assert ShapeAnalysis.orientationTable[code] == ('', [])
+        else:
+            assert ShapeAnalysis.orientationTable[code] == ShapeAnalysis.orientation(window)
+
+def test_marching_squares_matches_old_code():
+    rng = np.random.default_rng(11)
+    cellImages = []
+    for cell in range(30):
+        labeledMask, labels = sp.ndimage.label(random_cell_mask(rng))
+        if labels > 0:
+            cellImages.append(np.pad(labeledMask == np.argmax(np.bincount(labeledMask.ravel())[1:]) + 1, 2))
+    # noisy cells have holes and pixels connected only diagonally
+    for cell in range(30):
+        labeledMask, labels = sp.ndimage.label(rng.random((12, 12)) < 0.7, np.ones((3, 3)))
+        if labels > 0:
+            cellImages.append(np.pad(labeledMask == 1, 2))
+    for cellImage in cellImages:
+        contour = ShapeAnalysis.find_contour_of_object(cellImage)
+        if len(contour) == 0:
+            continue
+        expected = np.asarray(old_marching_squares(contour, cellImage)).reshape(-1, 2)
+        assert np.array_equal(np.asarray(ShapeAnalysis.marching_squares(contour, cellImage)).reshape(-1, 2), expected)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from conftest import random_cell_mask
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+sp = pytest.importorskip('scipy')
+skimage = pytest.importorskip('skimage')
+
+def old_detect_crossings_and_endpoints(skeletonImage, mode='both', output='image'):
+    """
+    classify every skeleton pixel by labeling its window like before the neighbourhood table
+    """
+    skeletonImage = skeletonImage * 1
+    detected_nodes = skeletonImage.copy()
+    node_list = []
+    for x, y in np.transpose(np.where(skeletonImage == 1)):
+        window, winBounds = ShapeAnalysis.create_window(skeletonImage, x, y, 1, 2, 1, 2)
+        window[x - winBounds[0], y - winBounds[2]] = 0
+        labeledWindow, L = sp.ndimage.label(window)
+        if mode == 'both' or mode == 'endpoints':
+            if L == 1 or L == 0:
+                detected_nodes[x, y] = 3
+                node_list.append([x, y])
+        if mode == 'both' or mode == 'crossings':
+            if L == 3 or L == 4:
+                detected_nodes[x, y] = 2
+                node_list.append([x, y])
+            if L == 2:
+                windowDetected, _ = ShapeAnalysis.create_window(detected_nodes, x, y, 1, 2, 1, 2)
+                windowDetected[x - winBounds[0], y - winBounds[2]] = 0
+                labeledWindowConnectivity, Lconnectivity = sp.ndimage.label(windowDetected, np.ones((3, 3)))
+                if 2 not in windowDetected and Lconnectivity == 1:
+                    detected_nodes[x, y] = 2
+                    node_list.append([x, y])
+    if output == 'image':
+        return(detected_nodes)
+    return(np.asarray(node_list))
+
+def random_skeletons():
+    """
+    skeletons of random cells with corrected pixels (2) and sparse random pixels
+    """
+    rng = np.random.default_rng(15)
+    skeletons = []
+    for image in range(10):
+        skeletonImage = skimage.morphology.skeletonize(~random_cell_mask(rng, size=30)) * 1
+        skeletonImage[(skeletonImage == 1) & (rng.random(skeletonImage.shape) < 0.1)] = 2
+        skeletons.append(skeletonImage)
+    for image in range(10):
+        skeletons.append((rng.random((20, 20)) < rng.uniform(0.2, 0.5)) * 1)
+    # the old code cannot classify pixels in the last row and column
+    for skeletonImage in skeletons:
+        skeletonImage[-1, :] = 0
+        skeletonImage[:, -1] = 0
+    return(skeletons)
+
+def test_neighbourhood_table_counts_the_components_of_every_window():
+    for code in range(256):
+        window = np.zeros((3, 3), dtype=int)
+        for bit, (xShift, yShift) in enumerate(ShapeAnalysis.neighbourOffsets):
+            window[1 + xShift, 1 + yShift] = (code >> bit) & 1
+        assert ShapeAnalysis.neighbourhoodTable[code].tolist() == [sp.ndimage.label(window)[1], sp.ndimage.label(window, np.ones((3, 3)))[1]]
+
+@pytest.mark.parametrize('mode', ['both', 'endpoints', 'crossings'])
+def test_detect_crossings_and_endpoints_matches_old_code(mode):
+    for skeletonImage in random_skeletons():
+        assert np.array_equal(ShapeAnalysis.detect_crossings_and_endpoints(skeletonImage, mode, 'image'), old_detect_crossings_and_endpoints(skeletonImage, mode, 'image'))
+        assert np.array_equal(ShapeAnalysis.detect_crossings_and_endpoints(skeletonImage, mode, 'list').reshape(-1, 2), old_detect_crossings_and_endpoints(skeletonImage, mode, 'list').reshape(-1, 2))
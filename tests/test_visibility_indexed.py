@@ -0,0 +1,39 @@
+import itertools
+import numpy as np
+import pytest
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+shapely = pytest.importorskip('shapely')
+
+def test_indexed_matches_shapely_on_pixel_polygons(pixel_polygons):
+    counters = {}
+    for pixelsOnContour in pixel_polygons:
+        assert sorted(ShapeAnalysis.find_visible_pairs_indexed(pixelsOnContour, counters)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour))
+    # every line is decided exactly once and most of them without the exact test
+    numberOfLines = sum(len(pixelsOnContour) * (len(pixelsOnContour) - 1) // 2 for pixelsOnContour in pixel_polygons)
+    assert sum(counters.values()) == numberOfLines
+    assert counters['exactTests'] < numberOfLines / 2
+
+def test_indexed_matches_shapely_on_special_polygons(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        assert sorted(ShapeAnalysis.find_visible_pairs_indexed(pixelsOnContour)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour)), name
+
+def test_indexed_falls_back_for_non_integer_and_repeated_coordinates(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        shiftedNodes = {node: (xPos + 0.5, yPos * 0.5) for node, (xPos, yPos) in pixelsOnContour.items()}
+        assert sorted(ShapeAnalysis.find_visible_pairs_indexed(shiftedNodes)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(shiftedNodes)), name
+    for name in ['spike', 'touching vertices']:
+        repeatedNodes = special_polygons[name]
+        assert len(set(repeatedNodes.values())) < len(repeatedNodes)
+        assert sorted(ShapeAnalysis.find_visible_pairs_indexed(repeatedNodes)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(repeatedNodes)), name
+
+@pytest.mark.parametrize('cellSize', [1, 3, None])
+def test_boundary_index_matches_the_exact_test(pixel_polygons, cellSize):
+    for pixelsOnContour in pixel_polygons[:10]:
+        Polygon = shapely.geometry.Polygon([[pixelsOnContour[key][1], pixelsOnContour[key][0]] for key in pixelsOnContour])
+        Boundary = shapely.geometry.LineString(list(Polygon.exterior.coords))
+        boundaryIndex = ShapeAnalysis.BoundaryIndex(Polygon, Boundary, cellSize)
+        points = np.asarray([pixelsOnContour[key] for key in pixelsOnContour], dtype=float)[:, ::-1]
+        nodes1, nodes2 = np.asarray(list(itertools.combinations(range(len(points)), 2))).T
+        expected = [ShapeAnalysis.is_visible_line(shapely.geometry.LineString([points[node1], points[node2]]), Polygon, Boundary) for node1, node2 in zip(nodes1, nodes2)]
+        assert boundaryIndex.visible_lines(points[nodes1], points[nodes2]).tolist() == expected
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+
+def visible_neighbours(visiblePairs, numberOfNodes):
+    """
+    collect the visible nodes of every node from a list of node pairs
+    """
+    neighbours = [[] for node in range(numberOfNodes)]
+    for node1, node2 in visiblePairs:
+        neighbours[node1].append(node2)
+        neighbours[node2].append(node1)
+    return([sorted(nodes) for nodes in neighbours])
+
+def test_sweep_matches_shapely_on_pixel_polygons(pixel_polygons):
+    for pixelsOnContour in pixel_polygons:
+        assert sorted(ShapeAnalysis.find_visible_pairs_sweep(pixelsOnContour)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour))
+
+def test_sweep_matches_shapely_on_special_polygons(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        assert sorted(ShapeAnalysis.find_visible_pairs_sweep(pixelsOnContour)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour)), name
+
+def test_sweep_falls_back_for_non_integer_and_repeated_coordinates(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        shiftedNodes = {node: (xPos + 0.5, yPos * 0.5) for node, (xPos, yPos) in pixelsOnContour.items()}
+        assert sorted(ShapeAnalysis.find_visible_pairs_sweep(shiftedNodes)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(shiftedNodes)), name
+    repeatedNodes = special_polygons['touching vertices']
+    assert len(set(repeatedNodes.values())) < len(repeatedNodes)
+    assert sorted(ShapeAnalysis.find_visible_pairs_sweep(repeatedNodes)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(repeatedNodes))
+
+def test_sweep_visible_nodes_of_every_source(pixel_polygons):
+    for pixelsOnContour in pixel_polygons[:10]:
+        nodes = np.asarray([pixelsOnContour[key] for key in pixelsOnContour], dtype=np.int64)
+        numberOfNodes = len(nodes)
+        # the interior of the polygon has to be on the left side of the walk
+        orientationSign = np.sign(np.sum(nodes[:, 0] * np.roll(nodes[:, 1], -1) - np.roll(nodes[:, 0], -1) * nodes[:, 1]))
+        step = 1 if orientationSign > 0 else -1
+        successors = [(node + step) % numberOfNodes for node in range(numberOfNodes)]
+        predecessors = [(node - step) % numberOfNodes for node in range(numberOfNodes)]
+        expectedNeighbours = visible_neighbours(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour), numberOfNodes)
+        for source in range(numberOfNodes):
+            assert sorted(ShapeAnalysis.sweep_visible_nodes(nodes, source, successors, predecessors)) == expectedNeighbours[source]
@@ -0,0 +1,20 @@
+import pytest
+
+ShapeAnalysis = pytest.importorskip('GraVis.ShapeAnalysis')
+
+def test_vectorized_matches_shapely_on_pixel_polygons(pixel_polygons):
+    for pixelsOnContour in pixel_polygons:
+        assert sorted(ShapeAnalysis.find_visible_pairs_vectorized(pixelsOnContour)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour))
+
+def test_vectorized_matches_shapely_on_special_polygons(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        assert sorted(ShapeAnalysis.find_visible_pairs_vectorized(pixelsOnContour)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(pixelsOnContour)), name
+
+def test_vectorized_blocks_give_the_same_pairs(pixel_polygons):
+    for pixelsOnContour in pixel_polygons[:10]:
+        assert ShapeAnalysis.find_visible_pairs_vectorized(pixelsOnContour, blockSize=64) == ShapeAnalysis.find_visible_pairs_vectorized(pixelsOnContour)
+
+def test_vectorized_falls_back_to_shapely_for_non_integer_coordinates(special_polygons):
+    for name, pixelsOnContour in special_polygons.items():
+        shiftedNodes = {node: (xPos + 0.5, yPos * 0.5) for node, (xPos, yPos) in pixelsOnContour.items()}
+        assert sorted(ShapeAnalysis.find_visible_pairs_vectorized(shiftedNodes)) == sorted(ShapeAnalysis.find_visible_pairs_shapely(shiftedNodes)), name